@@ -36,9 +36,7 @@ const BookingCard = ({
 
 	const router = useRouter();
 
-	const areaReviews = item.area_details?.reviews ?? [];
-	const roomReviews = item.room_details?.reviews ?? [];
-	const hasFeedback = [...areaReviews, ...roomReviews].some((r: any) => r?.booking === item.id);
+	const hasFeedback = Boolean(item.has_review);
 
 	// Determine if feedback button should be shown
 	const canShowFeedbackButton = showFeedbackButton &&
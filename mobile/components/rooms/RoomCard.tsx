@@ -141,7 +141,7 @@ const RoomCard = ({ item }: RoomCardProps) => {
 			<View className="h-48 bg-neutral-100 relative">
 				{item.images && item.images.length > 0 ? (
 					<Image
-						source={{ uri: getCloudinaryUrl(item.images[0]?.room_image) }}
+						source={{ uri: getCloudinaryUrl(item.images[0]?.variants?.card ?? item.images[0]?.room_image) }}
 						className="w-full h-full"
 						resizeMode="cover"
 						defaultSource={require('@/assets/images/logo.png')}
@@ -3,6 +3,7 @@ import axios, {
     type AxiosInstance,
     type AxiosRequestConfig,
     type AxiosResponse,
+    type InternalAxiosRequestConfig,
 } from 'axios';
 import * as SecureStore from 'expo-secure-store';
 
@@ -20,9 +21,13 @@ export interface RequestConfig {
     data?: any;
 }
 
+// Most recent GET bodies kept for ETag revalidation
+const MAX_CACHED_RESPONSES = 50;
+
 export class ApiClient {
     private axiosInstance: AxiosInstance;
     private baseUrl: string;
+    private etagCache = new Map<string, { etag: string; data: any }>();
 
     constructor(config: AxiosRequestConfig = {}) {
         this.baseUrl = `${process.env.EXPO_PUBLIC_DJANGO_URL}`;
@@ -67,6 +72,13 @@ export class ApiClient {
                         console.error(`❌ Error retrieving access token: ${error}`);
                     }
                 }
+
+                // Revalidate cached GETs; the server answers 304 when nothing changed
+                const cached = config.method === 'get' ? this.etagCache.get(this.cacheKey(config)) : undefined;
+                if (cached) {
+                    config.headers['If-None-Match'] = cached.etag;
+                    config.validateStatus = (status) => (status >= 200 && status < 300) || status === 304;
+                }
                 
                 return config;
             },
@@ -77,7 +89,24 @@ export class ApiClient {
         );
 
         this.axiosInstance.interceptors.response.use(
-            (response: AxiosResponse) => response.data,
+            (response: AxiosResponse) => {
+                if (response.config.method !== 'get') {
+                    return response.data;
+                }
+                const key = this.cacheKey(response.config);
+                if (response.status === 304) {
+                    return this.etagCache.get(key)?.data;
+                }
+                const etag = response.headers?.etag;
+                if (etag) {
+                    this.etagCache.delete(key);
+                    this.etagCache.set(key, { etag, data: response.data });
+                    if (this.etagCache.size > MAX_CACHED_RESPONSES) {
+                        this.etagCache.delete(this.etagCache.keys().next().value as string);
+                    }
+                }
+                return response.data;
+            },
             async (error: AxiosError) => {
                 const originalRequest = error.config as AxiosRequestConfig & { _retry?: boolean };
 
@@ -139,6 +168,14 @@ export class ApiClient {
         );
     }
 
+    private cacheKey(config: InternalAxiosRequestConfig): string {
+        return this.axiosInstance.getUri({ url: config.url, params: config.params });
+    }
+
+    clearCache(): void {
+        this.etagCache.clear();
+    }
+
     async get<T = any>(url: string, config?: RequestConfig): Promise<T> {
         return this.axiosInstance.get<T>(url, { ...config }) as Promise<T>;
     }
@@ -9,6 +9,7 @@ class UserAuthService {
 	}
 
 	async logout() {
+		httpClient.clearCache();
 		return await httpClient.post(ApiRoutes.LOGOUT);
 	}
 
@@ -1,8 +1,10 @@
 import { Reviews } from "./Reviews.types";
+import { ImageVariants } from "./Room.types";
 
 export interface AreaImage {
     id: number;
     area_image: string;
+    variants?: ImageVariants;
 }
 
 export interface Area {
@@ -32,6 +32,7 @@ export interface UserBooking {
     discounted_price: number | null;
     paymongo_source_id: string | null;
     paymongo_payment_id: string | null;
+    has_review: boolean;
 }
 
 export interface UserBookingResponse {
@@ -1,9 +1,17 @@
 import { Amenities } from "./Amenity.types";
 import { Reviews } from "./Reviews.types";
 
+// Resized f_auto,q_auto copies of an image, smallest first
+export interface ImageVariants {
+    thumb?: string;
+    card?: string;
+    full?: string;
+}
+
 export interface RoomImage {
     id: number;
     room_image: string;
+    variants?: ImageVariants;
 }
 
 export interface Room {
@@ -0,0 +1,141 @@
+"""
+Benchmark the daily revenue/bookings series read from the DailyMetrics rollup against the grouped
+TruncDay query they fall back to while the rollup is stale, and the original per-row loops.
+Run with: python manage.py benchmark_daily_series --transactions 50000
+
+All seeded rows are created inside a transaction that is rolled back at the end,
+so the command is safe to run against a development database.
+"""
+
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from admin_dashboard.service.daily_metrics import rebuild_daily_metrics
+from admin_dashboard.service.month_stats import MonthStats
+from booking.models import Bookings, Transactions
+from property.models import Rooms
+from user_roles.models import CustomUsers
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compare the rollup-backed daily series with the grouped query and the per-row loops on a seeded month'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--transactions', type=int, default=50000)
+        parser.add_argument('--month', type=int, default=3)
+        parser.add_argument('--year', type=int, default=2025)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        try:
+            with transaction.atomic():
+                self._seed(options)
+                self._run(options)
+                raise _Rollback()
+        except _Rollback:
+            self.stdout.write('Seeded data rolled back.')
+
+    def _seed(self, options):
+        user = CustomUsers.objects.create(username='bench_user', email='bench@example.com', role='guest')
+        room = Rooms.objects.create(room_name='Bench Room', room_price=1000)
+        month_stats = MonthStats(options['month'], options['year'])
+        start = timezone.make_aware(month_stats.start_date)
+        seconds = month_stats.days_in_month * 86400 - 1
+
+        batch = []
+        for _ in range(options['transactions']):
+            batch.append(Transactions(
+                user=user,
+                transaction_type='booking',
+                amount=random.randint(500, 20000),
+                transaction_date=start + timedelta(seconds=random.randint(0, seconds)),
+                status='completed',
+            ))
+            if len(batch) >= 5000:
+                Transactions.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Transactions.objects.bulk_create(batch)
+
+        check_in = month_stats.start_date.date()
+        bookings = Bookings.objects.bulk_create([
+            Bookings(user=user, room=room, check_in_date=check_in, check_out_date=check_in + timedelta(days=1))
+            for _ in range(options['transactions'] // 5)
+        ])
+        # created_at is auto_now_add, so spread the rows over the month afterwards
+        for booking in bookings:
+            booking.created_at = start + timedelta(seconds=random.randint(0, seconds))
+        Bookings.objects.bulk_update(bookings, ['created_at'], batch_size=5000)
+
+        # bulk_create skipped the signals that keep the rollup current
+        started = time.perf_counter()
+        rebuild_daily_metrics(month_stats.start_date.date(), month_stats.end_date.date())
+        self.stdout.write(f"Rollup rebuilt in:      {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    def _loop_revenue(self, month_stats):
+        series = [0] * month_stats.days_in_month
+        for tx in Transactions.objects.filter(
+            transaction_date__gte=month_stats.start_date,
+            transaction_date__lte=month_stats.end_date,
+            status='completed'
+        ):
+            series[timezone.localtime(tx.transaction_date).day - 1] += float(tx.amount)
+        return series
+
+    def _loop_bookings(self, month_stats):
+        series = [0] * month_stats.days_in_month
+        for booking in Bookings.objects.filter(
+            created_at__gte=month_stats.start_date,
+            created_at__lte=month_stats.end_date
+        ):
+            series[timezone.localtime(booking.created_at).day - 1] += 1
+        return series
+
+    def _time(self, fn, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            result = fn()
+        return result, (time.perf_counter() - started) / repeat * 1000
+
+    def _run(self, options):
+        month_stats = MonthStats(options['month'], options['year'])
+        repeat = options['repeat']
+        cases = [
+            (
+                'daily_revenue',
+                self._loop_revenue,
+                lambda: [float(total) for total in month_stats.daily(month_stats.transactions, 'transaction_date', Sum('amount'))],
+                lambda: MonthStats(month_stats.month, month_stats.year).daily_revenue(),
+            ),
+            (
+                'daily_bookings',
+                self._loop_bookings,
+                lambda: month_stats.daily(Bookings.objects.all(), 'created_at'),
+                lambda: MonthStats(month_stats.month, month_stats.year).daily_bookings(),
+            ),
+        ]
+
+        self.stdout.write(f"Transactions seeded:    {options['transactions']}")
+        self.stdout.write(f"Bookings seeded:        {options['transactions'] // 5}")
+        for name, loop, grouped, rollup in cases:
+            expected, loop_ms = self._time(lambda: loop(month_stats), repeat)
+            by_query, grouped_ms = self._time(grouped, repeat)
+            actual, rollup_ms = self._time(rollup, repeat)
+            self.stdout.write(f"{name:<23} loop {loop_ms:8.1f} ms   grouped {grouped_ms:6.1f} ms   "
+                              f"rollup {rollup_ms:6.1f} ms   ({grouped_ms / max(rollup_ms, 0.001):.1f}x over grouped)")
+            if all(abs(e - g) < 0.01 and abs(e - a) < 0.01 for e, g, a in zip(expected, by_query, actual)):
+                self.stdout.write(self.style.SUCCESS(f"{name}: series match"))
+            else:
+                self.stdout.write(self.style.ERROR(f"{name}: series differ"))
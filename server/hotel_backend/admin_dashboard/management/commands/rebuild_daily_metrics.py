@@ -0,0 +1,55 @@
+"""
+Backfill or repair the DailyMetrics rollup from the bookings and transactions tables.
+Run with: python manage.py rebuild_daily_metrics [--start 2025-01-01 --end 2025-03-31]
+
+Signals keep the rollup current for every save, delete and BookingsQuerySet.update(); run this
+after writes that skip them (bulk_create(), raw SQL), when upkeep failed (see --status and the
+dashboard's metrics_stale) or to rebuild it from scratch.
+"""
+
+import time
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from admin_dashboard.service.daily_metrics import rebuild_daily_metrics, stale_range
+
+
+def _date(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise CommandError(f"Invalid date {value!r}. Use YYYY-MM-DD")
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily metrics rollup, for the whole history or a date range'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', type=_date)
+        parser.add_argument('--end', type=_date)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--status', action='store_true', help='Only report dates left stale by failed upkeep')
+
+    def handle(self, *args, **options):
+        if options['status']:
+            stale = stale_range()
+            if stale:
+                self.stdout.write(self.style.WARNING(
+                    f"Stale from {stale['start']} to {stale['end']} after {stale['failures']} failed update(s) since {stale['since']}"
+                ))
+            else:
+                self.stdout.write(self.style.SUCCESS('Daily metrics are up to date'))
+            return
+
+        start, end = options['start'], options['end']
+        if (start is None) != (end is None):
+            raise CommandError('Pass both --start and --end, or neither to rebuild everything')
+        if start and end < start:
+            raise CommandError('--end must not be before --start')
+
+        started = time.perf_counter()
+        rows = rebuild_daily_metrics(start, end, batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - started
+        scope = f"{start} to {end}" if start else 'all dates'
+        self.stdout.write(self.style.SUCCESS(f"Daily metrics rebuilt for {scope}: {rows} rows in {elapsed:.1f}s"))
@@ -0,0 +1,116 @@
+# Generated by Django 5.2.2 on 2026-10-16 23:57
+
+from collections import Counter
+from datetime import timedelta
+
+import django.db.models.deletion
+import django.db.models.functions.comparison
+from django.db import migrations, models
+from django.utils import timezone
+
+
+# Frozen copy of admin_dashboard.service.daily_metrics.rebuild_daily_metrics as of this migration,
+# so later changes to the service cannot change what the migration writes
+OCCUPYING_STATUSES = ['reserved', 'confirmed', 'checked_in']
+CHECKED_IN_STATUSES = ['checked_in', 'checked_out']
+BATCH_SIZE = 5000
+
+
+def _local_date(value):
+    if value is None:
+        return None
+    return timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+
+
+def _property_key(is_venue_booking, room_id, area_id):
+    return (None, area_id) if is_venue_booking else (room_id, None)
+
+
+def _booking_contributions(booking):
+    room_id, area_id = _property_key(booking.is_venue_booking, booking.room_id, booking.area_id)
+    amounts = Counter()
+
+    def add(day, metric):
+        if day is not None:
+            amounts[(day, room_id, area_id, metric)] += 1
+
+    add(_local_date(booking.created_at), 'bookings_created')
+    if booking.status in CHECKED_IN_STATUSES:
+        add(booking.check_in_date, 'checkins')
+    if booking.status == 'checked_out':
+        add(booking.check_out_date, 'checkouts')
+    if booking.status == 'cancelled':
+        add(_local_date(booking.cancellation_date), 'cancellations')
+    if booking.status == 'missed_reservation':
+        add(_local_date(booking.updated_at), 'no_shows')
+    if booking.status == 'rejected':
+        add(_local_date(booking.updated_at), 'rejections')
+
+    # Room stays hold the nights before check-out, at least one
+    if booking.status in OCCUPYING_STATUSES and room_id and booking.check_in_date and booking.check_out_date:
+        night = booking.check_in_date
+        end = max(booking.check_out_date, booking.check_in_date + timedelta(days=1))
+        while night < end:
+            add(night, 'occupied_room_nights')
+            night += timedelta(days=1)
+    return amounts
+
+
+def backfill_daily_metrics(apps, schema_editor):
+    Bookings = apps.get_model('booking', 'Bookings')
+    Transactions = apps.get_model('booking', 'Transactions')
+    DailyMetrics = apps.get_model('admin_dashboard', 'DailyMetrics')
+
+    amounts = Counter()
+    for booking in Bookings.objects.iterator(chunk_size=BATCH_SIZE):
+        amounts.update(_booking_contributions(booking))
+    for transaction_date, amount, is_venue, room_id, area_id in Transactions.objects.filter(status='completed').values_list(
+        'transaction_date', 'amount', 'booking__is_venue_booking', 'booking__room_id', 'booking__area_id'
+    ).iterator(chunk_size=BATCH_SIZE):
+        if transaction_date is not None and amount:
+            amounts[(_local_date(transaction_date), *_property_key(is_venue, room_id, area_id), 'revenue')] += amount
+
+    values = {}
+    for (day, room_id, area_id, metric), amount in amounts.items():
+        values.setdefault((day, room_id, area_id), {})[metric] = amount
+    DailyMetrics.objects.bulk_create(
+        [
+            DailyMetrics(date=day, room_id=room_id, area_id=area_id, **figures)
+            for (day, room_id, area_id), figures in values.items()
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_dashboard', '0001_initial'),
+        ('booking', '0006_checkin_checkout_indexes'),
+        ('property', '0002_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('bookings_created', models.IntegerField(default=0)),
+                ('checkins', models.IntegerField(default=0)),
+                ('checkouts', models.IntegerField(default=0)),
+                ('cancellations', models.IntegerField(default=0)),
+                ('no_shows', models.IntegerField(default=0)),
+                ('rejections', models.IntegerField(default=0)),
+                ('occupied_room_nights', models.IntegerField(default=0)),
+                ('area', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='property.areas')),
+                ('room', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='property.rooms')),
+            ],
+            options={
+                'db_table': 'daily_metrics',
+                'constraints': [models.UniqueConstraint(models.F('date'), django.db.models.functions.comparison.Coalesce('room', models.Value(0)), django.db.models.functions.comparison.Coalesce('area', models.Value(0)), name='daily_metrics_key_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_daily_metrics, migrations.RunPython.noop),
+    ]
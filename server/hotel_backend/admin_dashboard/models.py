@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
 from property.models import Rooms, Areas
 
 # Create your models here.
@@ -13,3 +15,33 @@ class ArchivedUser(models.Model):
     
     class Meta:
         db_table = 'archived_users'
+
+class DailyMetrics(models.Model):
+    """
+    Per-day analytics rollup, one row per local date and room (or area, for venue bookings);
+    rows with neither hold figures not tied to a property. Kept up to date from booking and
+    transaction writes and rebuilt by `rebuild_daily_metrics` (see service/daily_metrics.py).
+    """
+    date = models.DateField()
+    # No database constraint: the history outlives a deleted room or area, and deleting one
+    # never has to wait on (or conflict with) the rollup rows written as its bookings go
+    room = models.ForeignKey(Rooms, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name='+')
+    area = models.ForeignKey(Areas, on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True, related_name='+')
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    bookings_created = models.IntegerField(default=0)
+    checkins = models.IntegerField(default=0)
+    checkouts = models.IntegerField(default=0)
+    cancellations = models.IntegerField(default=0)
+    no_shows = models.IntegerField(default=0)
+    rejections = models.IntegerField(default=0)
+    occupied_room_nights = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'daily_metrics'
+        constraints = [
+            # Also the index behind date-range reads, date being its leading column
+            models.UniqueConstraint(
+                F('date'), Coalesce('room', Value(0)), Coalesce('area', Value(0)),
+                name='daily_metrics_key_uniq',
+            ),
+        ]
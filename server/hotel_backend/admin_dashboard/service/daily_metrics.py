@@ -0,0 +1,314 @@
+"""
+Upkeep and reads of the DailyMetrics rollup.
+
+Every booking and completed transaction adds fixed amounts to fixed (date, room, area) rows: a
+booking counts as created on the local day of created_at, as a check-in on its check-in date once
+checked in, as a held room-night on each night of an active stay, and so on (see
+booking_contributions). A write takes away the row's previous contributions and adds its new ones,
+so it only touches the few rollup rows it changes, through F() updates that add up under
+concurrent writes. Bulk updates do the same for every row they change, from the bookings_updated
+signal BookingsQuerySet.update() sends. rebuild_daily_metrics() recomputes the rows from the raw
+tables with the same contributions: the backfill, and the repair after bulk_create or raw SQL
+writes that skip both.
+
+A write whose upkeep fails still goes through. The dates it would have moved are recorded as
+stale in the shared cache (see stale_range()) until a rebuild covers them, so reads can tell the
+rollup is behind and the dashboard can say so.
+"""
+
+import logging
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from admin_dashboard.models import DailyMetrics
+from booking.models import Bookings, Transactions
+from booking.service.availability import _stay_end
+
+logger = logging.getLogger(__name__)
+
+METRICS = (
+    'revenue',
+    'bookings_created',
+    'checkins',
+    'checkouts',
+    'cancellations',
+    'no_shows',
+    'rejections',
+    'occupied_room_nights',
+)
+
+OCCUPYING_STATUSES = ['reserved', 'confirmed', 'checked_in']
+CHECKED_IN_STATUSES = ['checked_in', 'checked_out']
+
+# Everything booking_contributions reads, plus the ledger fields Bookings.from_db snapshots
+BOOKING_FIELDS = Bookings.SNAPSHOT_FIELDS
+
+STALE_CACHE_KEY = 'daily_metrics:stale'
+
+
+def local_date(value):
+    if value is None:
+        return None
+    return timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+
+
+def property_key(is_venue_booking, room_id, area_id):
+    """(room_id, area_id) a booking's figures are filed under: its room, or its area for venue bookings."""
+    return (None, area_id) if is_venue_booking else (room_id, None)
+
+
+def booking_contributions(booking):
+    """Counter of {(date, room_id, area_id, metric): amount} that a booking adds to the rollup."""
+    room_id, area_id = property_key(booking.is_venue_booking, booking.room_id, booking.area_id)
+    amounts = Counter()
+
+    def add(day, metric):
+        if day is not None:
+            amounts[(day, room_id, area_id, metric)] += 1
+
+    add(local_date(booking.created_at), 'bookings_created')
+    if booking.status in CHECKED_IN_STATUSES:
+        add(booking.check_in_date, 'checkins')
+    if booking.status == 'checked_out':
+        add(booking.check_out_date, 'checkouts')
+    if booking.status == 'cancelled':
+        add(local_date(booking.cancellation_date), 'cancellations')
+    if booking.status == 'missed_reservation':
+        add(local_date(booking.updated_at), 'no_shows')
+    if booking.status == 'rejected':
+        add(local_date(booking.updated_at), 'rejections')
+
+    # The nights the RoomNight ledger holds for the stay
+    if booking.status in OCCUPYING_STATUSES and room_id and booking.check_in_date and booking.check_out_date:
+        night = booking.check_in_date
+        end = _stay_end(booking.check_in_date, booking.check_out_date)
+        while night < end:
+            add(night, 'occupied_room_nights')
+            night += timedelta(days=1)
+    return amounts
+
+
+def revenue_contribution(transaction_date, amount, key):
+    """Counter entry of a completed transaction, filed under its booking's property key."""
+    if transaction_date is None or not amount:
+        return Counter()
+    return Counter({(local_date(transaction_date), *key, 'revenue'): amount})
+
+
+def transaction_key(tx):
+    """Property key of a transaction's booking, (None, None) when it has none."""
+    if not tx.booking_id:
+        return (None, None)
+    row = Bookings.objects.filter(pk=tx.booking_id).values_list('is_venue_booking', 'room_id', 'area_id').first()
+    return property_key(*row) if row else (None, None)
+
+
+def _transaction_contributions(tx, key=None):
+    if tx.status != 'completed':
+        return Counter()
+    return revenue_contribution(tx.transaction_date, tx.amount, key or transaction_key(tx))
+
+
+def apply_changes(before, after):
+    """Move the rollup from the `before` contributions to the `after` ones."""
+    changes = Counter(after)
+    changes.subtract(before)
+    rows = {}
+    for (day, room_id, area_id, metric), amount in changes.items():
+        if amount:
+            rows.setdefault((day, room_id, area_id), {})[metric] = amount
+    if not rows:
+        return
+
+    with transaction.atomic():
+        for (day, room_id, area_id), amounts in rows.items():
+            matching = DailyMetrics.objects.filter(date=day, room_id=room_id, area_id=area_id)
+            increments = {metric: F(metric) + amount for metric, amount in amounts.items()}
+            if matching.update(**increments):
+                continue
+            try:
+                with transaction.atomic():
+                    DailyMetrics.objects.create(date=day, room_id=room_id, area_id=area_id, **amounts)
+            except IntegrityError:
+                # Another write created the row first
+                matching.update(**increments)
+
+
+def _mark_stale(days, label):
+    """Widen the stale range to cover `days` and count the failure."""
+    stale = cache.get(STALE_CACHE_KEY) or {
+        'since': timezone.now().isoformat(), 'failures': 0, 'start': None, 'end': None,
+    }
+    stale['failures'] += 1
+    stale['start'] = min(day for day in (stale['start'], min(days).isoformat()) if day)
+    stale['end'] = max(day for day in (stale['end'], max(days).isoformat()) if day)
+    cache.set(STALE_CACHE_KEY, stale, timeout=None)
+    logger.error(
+        "Daily metrics stale from %s to %s after %s failed update(s), the last for %s; "
+        "run rebuild_daily_metrics --start %s --end %s",
+        stale['start'], stale['end'], stale['failures'], label, stale['start'], stale['end'],
+    )
+
+
+def _apply_safely(before, after, label):
+    # The rollup can always be repaired, so a failed update never fails the booking write
+    try:
+        apply_changes(before, after)
+    except Exception:
+        logger.exception("Daily metrics not updated for %s", label)
+        days = {day for day, *_ in (*before, *after)}
+        if days:
+            try:
+                _mark_stale(days, label)
+            except Exception:
+                logger.exception("Could not record stale daily metrics for %s", label)
+
+
+def stale_range(start=None, end=None):
+    """
+    The recorded stale range ({'since', 'failures', 'start', 'end'}, dates as ISO strings) when it
+    overlaps start..end (inclusive; any dates when omitted), else None.
+    """
+    stale = cache.get(STALE_CACHE_KEY)
+    if not stale:
+        return None
+    if start is not None and (stale['end'] < start.isoformat() or stale['start'] > end.isoformat()):
+        return None
+    return stale
+
+
+def _clear_stale(start, end):
+    stale = cache.get(STALE_CACHE_KEY)
+    if stale and (start is None or (start.isoformat() <= stale['start'] and stale['end'] <= end.isoformat())):
+        cache.delete(STALE_CACHE_KEY)
+
+
+def on_booking_saved(booking, previous=None):
+    """Called after a booking save with the row as it was before (None when created)."""
+    before = booking_contributions(previous) if previous is not None else Counter()
+    after = booking_contributions(booking)
+
+    # Revenue is filed under the booking's property, so it moves when that does
+    if previous is not None:
+        old_key = property_key(previous.is_venue_booking, previous.room_id, previous.area_id)
+        new_key = property_key(booking.is_venue_booking, booking.room_id, booking.area_id)
+        if old_key != new_key:
+            for transaction_date, amount in booking.transactions.filter(status='completed').values_list('transaction_date', 'amount'):
+                before.update(revenue_contribution(transaction_date, amount, old_key))
+                after.update(revenue_contribution(transaction_date, amount, new_key))
+
+    _apply_safely(before, after, f"booking {booking.pk}")
+
+
+def on_bookings_updated(before, after):
+    """Called on bookings_updated with the rows as they were before a bulk update and as they are after it."""
+    old, new = Counter(), Counter()
+    old_keys = {}
+    for booking in before:
+        old.update(booking_contributions(booking))
+        old_keys[booking.pk] = property_key(booking.is_venue_booking, booking.room_id, booking.area_id)
+
+    moved = {}
+    for booking in after:
+        new.update(booking_contributions(booking))
+        key = property_key(booking.is_venue_booking, booking.room_id, booking.area_id)
+        if old_keys.get(booking.pk, key) != key:
+            moved[booking.pk] = (old_keys[booking.pk], key)
+
+    if moved:
+        for booking_id, transaction_date, amount in Transactions.objects.filter(
+            booking_id__in=list(moved), status='completed'
+        ).values_list('booking_id', 'transaction_date', 'amount'):
+            old_key, new_key = moved[booking_id]
+            old.update(revenue_contribution(transaction_date, amount, old_key))
+            new.update(revenue_contribution(transaction_date, amount, new_key))
+
+    _apply_safely(old, new, f"bulk update of {len(before)} bookings")
+
+
+def on_booking_deleted(booking):
+    _apply_safely(booking_contributions(booking), Counter(), f"booking {booking.pk}")
+
+
+def on_transaction_saved(tx, previous=None):
+    before = _transaction_contributions(previous) if previous is not None else Counter()
+    _apply_safely(before, _transaction_contributions(tx), f"transaction {tx.pk}")
+
+
+def on_transaction_deleted(tx, key=None):
+    """`key` is the property key read before the delete, as a cascade may remove the booking first."""
+    _apply_safely(_transaction_contributions(tx, key), Counter(), f"transaction {tx.pk}")
+
+
+def rebuild_daily_metrics(start=None, end=None, batch_size=5000):
+    """
+    Recompute rollup rows from the bookings and transactions tables: the whole history, or only
+    the dates from `start` to `end` (inclusive). Clears the stale range when it covers it.
+    Returns the number of rows written.
+    """
+    bookings = Bookings.objects.only(*BOOKING_FIELDS)
+    transactions = Transactions.objects.filter(status='completed')
+    rows = DailyMetrics.objects.all()
+    if start is not None:
+        since = timezone.make_aware(datetime.combine(start, time.min))
+        until = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min))
+
+        def moment_in_range(field):
+            return Q(**{f"{field}__gte": since, f"{field}__lt": until})
+
+        bookings = bookings.filter(
+            moment_in_range('created_at') | moment_in_range('updated_at') | moment_in_range('cancellation_date')
+            | Q(check_in_date__lte=end, check_out_date__gte=start)
+            | Q(check_in_date__range=(start, end))
+        )
+        transactions = transactions.filter(moment_in_range('transaction_date'))
+        rows = rows.filter(date__range=(start, end))
+
+    amounts = Counter()
+    for booking in bookings.iterator(chunk_size=batch_size):
+        amounts.update(booking_contributions(booking))
+    for transaction_date, amount, is_venue, room_id, area_id in transactions.values_list(
+        'transaction_date', 'amount', 'booking__is_venue_booking', 'booking__room_id', 'booking__area_id'
+    ).iterator(chunk_size=batch_size):
+        amounts.update(revenue_contribution(transaction_date, amount, property_key(is_venue, room_id, area_id)))
+
+    values = {}
+    for (day, room_id, area_id, metric), amount in amounts.items():
+        if start is None or start <= day <= end:
+            values.setdefault((day, room_id, area_id), {})[metric] = amount
+
+    with transaction.atomic():
+        rows.delete()
+        DailyMetrics.objects.bulk_create(
+            [
+                DailyMetrics(date=day, room_id=room_id, area_id=area_id, **figures)
+                for (day, room_id, area_id), figures in values.items()
+            ],
+            batch_size=batch_size,
+        )
+    _clear_stale(start, end)
+    return len(values)
+
+
+def daily_series(start, end):
+    """
+    Per-day totals from start to end (inclusive) in one query: a list per metric, plus
+    `occupied_rooms`, the number of distinct rooms held each night.
+    """
+    days = (end - start).days + 1
+    series = {name: [0] * days for name in (*METRICS, 'occupied_rooms')}
+    rows = DailyMetrics.objects.filter(date__range=(start, end)).values('date').annotate(
+        occupied_rooms=Count('id', filter=Q(room__isnull=False, occupied_room_nights__gt=0)),
+        **{f"total_{name}": Sum(name) for name in METRICS},
+    )
+    for row in rows:
+        index = (row['date'] - start).days
+        series['occupied_rooms'][index] = row['occupied_rooms']
+        for name in METRICS:
+            series[name][index] = row[f"total_{name}"] or 0
+    return series
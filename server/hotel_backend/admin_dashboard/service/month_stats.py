@@ -0,0 +1,272 @@
+"""
+Month-level figures shared by the dashboard, the status chart and the monthly report.
+
+Every booking count for a month comes out of one conditional aggregate over Bookings, every
+revenue split out of one conditional aggregate over Transactions, and the room figures out of
+one aggregate over Rooms. Daily series and per-room/per-area charts read the DailyMetrics rollup
+(see daily_metrics.py), one query for all of a month's series and one for the charts, with names
+matched in Python. While failed upkeep has left dates of the month stale, they are computed from
+the raw tables instead, with one GROUP BY per series. Each group is computed on first use, so a
+view only pays for what it reads.
+"""
+
+from datetime import datetime, timedelta
+from functools import cached_property
+
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDay
+from django.utils import timezone
+
+from admin_dashboard.models import DailyMetrics
+from booking.models import Bookings, RoomNight, Transactions
+from property.models import Areas, Rooms
+
+from .daily_metrics import CHECKED_IN_STATUSES, daily_series, stale_range
+
+# Statuses reported by the status chart and the monthly report
+REPORTED_STATUSES = ['pending', 'reserved', 'checked_in', 'checked_out', 'cancelled', 'no_show', 'rejected']
+
+# Per-property charts: the model listed and its name field
+PROPERTY_KINDS = {
+    'room': (Rooms, 'room_name'),
+    'area': (Areas, 'area_name'),
+}
+
+
+def month_range(month, year):
+    """First moment and last second of the month, as the analytics views have always used them."""
+    start_date = datetime(year, month, 1)
+    if month == 12:
+        end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
+    else:
+        end_date = datetime(year, month + 1, 1) - timedelta(days=1)
+    return start_date, end_date.replace(hour=23, minute=59, second=59)
+
+
+class MonthStats:
+    def __init__(self, month, year):
+        self.month = month
+        self.year = year
+        self.start_date, self.end_date = month_range(month, year)
+        self._property_names = {}
+
+    @property
+    def date_range(self):
+        return self.start_date.date(), self.end_date.date()
+
+    @property
+    def days_in_month(self):
+        return self.end_date.day
+
+    @property
+    def created_in_month(self):
+        return Q(created_at__range=(self.start_date, self.end_date))
+
+    @property
+    def transactions(self):
+        """Completed transactions dated in the month."""
+        return Transactions.objects.filter(
+            transaction_date__range=(self.start_date, self.end_date),
+            status='completed',
+        )
+
+    @cached_property
+    def bookings(self):
+        """All booking counts in one conditional aggregate."""
+        created = self.created_in_month
+        counts = {
+            'total': Count('id', filter=created),
+            'active': Count('id', filter=created & Q(status__in=Bookings.ACTIVE_STATUSES)),
+            'unpaid': Count('id', filter=created & Q(payment_status='unpaid')),
+            # Guests currently in a room among this month's bookings
+            'occupied_rooms': Count('id', filter=created & Q(status='checked_in', is_venue_booking=False)),
+            # Guests checked in whose stay starts this month
+            'checked_in_this_month': Count('id', filter=Q(
+                status='checked_in',
+                check_in_date__range=(self.start_date.date(), self.end_date.date()),
+            )),
+            'upcoming_reservations': Count('id', filter=Q(
+                is_venue_booking=True,
+                status__in=['confirmed', 'reserved'],
+                check_in_date__gte=self.start_date.date(),
+            )),
+        }
+        for status in REPORTED_STATUSES:
+            counts[status] = Count('id', filter=created & Q(status=status))
+
+        # Only rows that can match any of the counts above are scanned
+        return Bookings.objects.filter(
+            created | Q(check_in_date__gte=self.start_date.date())
+        ).aggregate(**counts)
+
+    @cached_property
+    def revenue(self):
+        """Completed revenue for the month: total, rooms and venues, in one query."""
+        totals = self.transactions.aggregate(
+            total=Sum('amount'),
+            room=Sum('amount', filter=Q(booking__is_venue_booking=False)),
+            venue=Sum('amount', filter=Q(booking__is_venue_booking=True)),
+        )
+        return {key: value or 0 for key, value in totals.items()}
+
+    @cached_property
+    def rooms(self):
+        """Room inventory in one aggregate; `free` excludes rooms with a checked-in night this month."""
+        return Rooms.objects.aggregate(
+            total=Count('id'),
+            available=Count('id', filter=Q(status='available')),
+            free=Count('id', filter=Q(status='available') & ~Q(id__in=self.checked_in_nights.values('room_id'))),
+            maintenance=Count('id', filter=Q(status='maintenance')),
+        )
+
+    @property
+    def checked_in_nights(self):
+        return RoomNight.objects.filter(
+            status='checked_in',
+            night__range=(self.start_date.date(), self.end_date.date()),
+        )
+
+    @cached_property
+    def occupied_room_bookings(self):
+        """Bookings holding a checked-in room night this month."""
+        return self.checked_in_nights.values('booking_id').distinct().count()
+
+    def property_names(self, kind):
+        """(id, name) of every room ('room') or area ('area'), in the order the charts list them."""
+        if kind not in self._property_names:
+            model, name_field = PROPERTY_KINDS[kind]
+            self._property_names[kind] = list(model.objects.values_list('id', name_field))
+        return self._property_names[kind]
+
+    def _per_property(self, rows):
+        # rows are (is_venue_booking, room_id, area_id, value); a room only counts its room
+        # bookings and an area its venue bookings, as the charts always have
+        totals = {'room': {}, 'area': {}}
+        for is_venue, room_id, area_id, value in rows:
+            kind, key = ('area', area_id) if is_venue else ('room', room_id)
+            if key is not None:
+                totals[kind][key] = totals[kind].get(key, 0) + (value or 0)
+        return totals
+
+    @cached_property
+    def revenue_by_property(self):
+        """Completed revenue per room and per area, from one GROUP BY."""
+        keys = ('booking__is_venue_booking', 'booking__room_id', 'booking__area_id')
+        return self._per_property(
+            self.transactions.values(*keys).annotate(value=Sum('amount')).values_list(*keys, 'value')
+        )
+
+    @cached_property
+    def bookings_by_property(self):
+        """Bookings created this month per room and per area, from one GROUP BY."""
+        keys = ('is_venue_booking', 'room_id', 'area_id')
+        bookings = Bookings.objects.filter(self.created_in_month)
+        return self._per_property(bookings.values(*keys).annotate(value=Count('id')).values_list(*keys, 'value'))
+
+    @cached_property
+    def property_totals(self):
+        """
+        Revenue and bookings created this month per room and per area, from the rollup in one
+        query, or from a GROUP BY over each raw table while the month has stale rollup dates.
+        """
+        totals = {'room': {}, 'area': {}}
+        if self.metrics_stale:
+            for kind, per_kind in totals.items():
+                for pk, value in self.revenue_by_property[kind].items():
+                    per_kind.setdefault(pk, {})['total_revenue'] = value
+                for pk, value in self.bookings_by_property[kind].items():
+                    per_kind.setdefault(pk, {})['total_bookings'] = value
+            return totals
+
+        rows = DailyMetrics.objects.filter(date__range=self.date_range).values('room_id', 'area_id').annotate(
+            total_revenue=Sum('revenue'),
+            total_bookings=Sum('bookings_created'),
+        )
+        for row in rows:
+            # Rows carry a room or an area, or neither for figures not tied to a property
+            if row['room_id']:
+                totals['room'][row['room_id']] = row
+            elif row['area_id']:
+                totals['area'][row['area_id']] = row
+        return totals
+
+    def property_chart(self, kind, revenue=True, bookings=True):
+        """Names and aligned revenue/booking series for every room ('room') or area ('area')."""
+        names = self.property_names(kind)
+        totals = self.property_totals[kind]
+        chart = {'names': [name for _, name in names]}
+        if revenue:
+            chart['revenue'] = [float(totals.get(pk, {}).get('total_revenue') or 0) for pk, _ in names]
+        if bookings:
+            chart['bookings'] = [totals.get(pk, {}).get('total_bookings') or 0 for pk, _ in names]
+        return chart
+
+    def daily(self, queryset, field, value=Count('id')):
+        """
+        Per-day series for the month: `value` aggregated over `queryset` grouped by the local
+        (TIME_ZONE) day of `field`, in one GROUP BY query returning at most one row per day.
+        """
+        series = [0] * self.days_in_month
+        rows = queryset.filter(**{f"{field}__range": (self.start_date, self.end_date)}).annotate(
+            day=TruncDay(field, tzinfo=timezone.get_default_timezone())
+        ).values('day').annotate(value=value).values_list('day', 'value')
+        for day, total in rows:
+            series[day.day - 1] = total or 0
+        return series
+
+    def daily_by_date(self, queryset, field, value=Count('id')):
+        """Per-day series for a DateField, grouped on the column itself so its index serves the range."""
+        series = [0] * self.days_in_month
+        rows = queryset.filter(
+            **{f"{field}__range": self.date_range}
+        ).values(field).annotate(value=value).values_list(field, 'value')
+        for day, total in rows:
+            series[day.day - 1] = total or 0
+        return series
+
+    @cached_property
+    def metrics_stale(self):
+        """The stale range of the rollup when failed upkeep left dates of this month behind, else None."""
+        return stale_range(*self.date_range)
+
+    @cached_property
+    def daily_metrics(self):
+        """Every per-day series of the month, from the DailyMetrics rollup in one query."""
+        return daily_series(*self.date_range)
+
+    def daily_revenue(self):
+        if self.metrics_stale:
+            series = self.daily(self.transactions, 'transaction_date', Sum('amount'))
+        else:
+            series = self.daily_metrics['revenue']
+        return [float(total) if total else 0 for total in series]
+
+    def daily_bookings(self):
+        if self.metrics_stale:
+            return self.daily(Bookings.objects.all(), 'created_at')
+        return self.daily_metrics['bookings_created']
+
+    def daily_checkins(self):
+        if self.metrics_stale:
+            return self.daily_by_date(Bookings.objects.filter(status__in=CHECKED_IN_STATUSES), 'check_in_date')
+        return self.daily_metrics['checkins']
+
+    def daily_checkouts(self):
+        if self.metrics_stale:
+            return self.daily_by_date(Bookings.objects.filter(status='checked_out'), 'check_out_date')
+        return self.daily_metrics['checkouts']
+
+    def daily_cancellations(self):
+        if self.metrics_stale:
+            return self.daily(Bookings.objects.filter(status='cancelled'), 'cancellation_date')
+        return self.daily_metrics['cancellations']
+
+    def daily_no_shows(self):
+        if self.metrics_stale:
+            return self.daily(Bookings.objects.filter(status='missed_reservation'), 'updated_at')
+        return self.daily_metrics['no_shows']
+
+    def daily_rejections(self):
+        if self.metrics_stale:
+            return self.daily(Bookings.objects.filter(status='rejected'), 'updated_at')
+        return self.daily_metrics['rejections']
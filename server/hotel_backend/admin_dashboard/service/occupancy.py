@@ -0,0 +1,69 @@
+"""
+Daily room occupancy over any date range.
+
+Read from the DailyMetrics rollup, where each room has a row for every night it is held (see
+daily_metrics.py): the rooms held on a night are the room rows of that date with occupied
+room-nights, so any range, a week or a quarter, is one query over at most one row per room and day.
+
+While failed upkeep has left dates of the range stale, the bookings overlapping the range are read
+once and swept instead: each stay adds +1 on its first night and -1 after its last one in a
+rooms x days difference array, and a cumulative sum along each room turns that into the nights
+the room is held.
+"""
+
+from datetime import timedelta
+
+import numpy as np
+
+from booking.models import Bookings
+from booking.service.availability import _stay_end
+
+from .daily_metrics import OCCUPYING_STATUSES, daily_series, stale_range
+
+MAX_RANGE_DAYS = 366
+
+
+def swept_occupied_rooms(start, end):
+    """occupied_rooms() computed from the bookings table with one query and a difference-array sweep."""
+    days = (end - start).days + 1
+    stays = Bookings.objects.filter(
+        is_venue_booking=False,
+        room__isnull=False,
+        status__in=OCCUPYING_STATUSES,
+    ).overlapping(start, end + timedelta(days=1)).values_list('room_id', 'check_in_date', 'check_out_date')
+
+    room_ids, first, last = [], [], []
+    for room_id, check_in, check_out in stays:
+        room_ids.append(room_id)
+        first.append((check_in - start).days)
+        last.append((_stay_end(check_in, check_out) - start).days)
+    if not room_ids:
+        return [0] * days
+
+    _, rows = np.unique(room_ids, return_inverse=True)
+    first = np.clip(first, 0, days)
+    last = np.clip(last, 0, days)
+
+    delta = np.zeros((rows.max() + 1, days + 1), dtype=np.int32)
+    np.add.at(delta, (rows, first), 1)
+    np.add.at(delta, (rows, last), -1)
+    # A room counts once per night however many of its stays overlap there
+    held = np.cumsum(delta[:, :days], axis=1) > 0
+    return held.sum(axis=0).tolist()
+
+
+def occupied_rooms(start, end):
+    """Number of distinct rooms held on each night from start to end (inclusive)."""
+    if stale_range(start, end):
+        return swept_occupied_rooms(start, end)
+    return daily_series(start, end)['occupied_rooms']
+
+
+def occupancy_rates(start, end, total_rooms):
+    """Percentage of rooms held on each night from start to end, rounded to two places."""
+    if not total_rooms:
+        return [0] * ((end - start).days + 1)
+    return [
+        round(rooms / total_rooms * 100, 2) if rooms else 0
+        for rooms in occupied_rooms(start, end)
+    ]
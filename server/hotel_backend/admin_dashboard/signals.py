@@ -8,10 +8,12 @@ from firebase_admin import db as firebase_db
 from user_roles.service.firebase import firebase_service
 import logging
 from datetime import datetime
-from django.db.models.signals import pre_save, post_save
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
-from booking.models import Bookings
+from .service import daily_metrics
+from booking.models import Bookings, Transactions
+from booking.signals import bookings_updated
 from user_roles.models import Notification as UserNotification, CustomUsers
 from user_roles.service.firebase import firebase_service
 from firebase_admin import db as firebase_db
@@ -25,13 +27,17 @@ def bookings_pre_save(sender, instance: Bookings, **kwargs):
     """Store previous status on the instance so post_save can detect changes."""
     if not instance.pk:
         instance._previous_status = None
+        instance._previous_row = None
         return
 
     try:
         previous = sender.objects.filter(pk=instance.pk).first()
         instance._previous_status = previous.status if previous else None
+        # The daily metrics rollup takes the old row's figures back out after the save
+        instance._previous_row = previous
     except Exception:
         instance._previous_status = None
+        instance._previous_row = None
 
 
 def _build_additional_data(booking: Bookings) -> dict:
@@ -201,3 +207,47 @@ def booking_post_save(sender, instance: Bookings, created: bool, **kwargs):
 
     except Exception:
         return
+
+
+@receiver(post_save, sender=Bookings)
+def update_daily_metrics_on_booking_save(sender, instance: Bookings, created: bool, **kwargs):
+    """Move the booking's figures in the daily metrics rollup from its old row to its new one."""
+    previous = getattr(instance, '_previous_row', None)
+    if not created and previous is None:
+        logger.warning("Booking %s saved without its previous row; daily metrics not updated", instance.pk)
+        return
+    daily_metrics.on_booking_saved(instance, previous)
+    instance._previous_row = None
+
+
+@receiver(post_delete, sender=Bookings)
+def update_daily_metrics_on_booking_delete(sender, instance: Bookings, **kwargs):
+    daily_metrics.on_booking_deleted(instance)
+
+
+@receiver(bookings_updated, sender=Bookings)
+def update_daily_metrics_on_bulk_update(sender, before, after, **kwargs):
+    """Move the figures of bulk-updated bookings in the daily metrics rollup."""
+    daily_metrics.on_bookings_updated(before, after)
+
+
+@receiver(pre_save, sender=Transactions)
+def transactions_pre_save(sender, instance: Transactions, **kwargs):
+    instance._previous_row = sender.objects.filter(pk=instance.pk).first() if instance.pk else None
+
+
+@receiver(post_save, sender=Transactions)
+def update_daily_metrics_on_transaction_save(sender, instance: Transactions, **kwargs):
+    daily_metrics.on_transaction_saved(instance, getattr(instance, '_previous_row', None))
+    instance._previous_row = None
+
+
+@receiver(pre_delete, sender=Transactions)
+def transactions_pre_delete(sender, instance: Transactions, **kwargs):
+    # Deleting a booking cascades here, and its row may be gone by post_delete
+    instance._property_key = daily_metrics.transaction_key(instance)
+
+
+@receiver(post_delete, sender=Transactions)
+def update_daily_metrics_on_transaction_delete(sender, instance: Transactions, **kwargs):
+    daily_metrics.on_transaction_deleted(instance, getattr(instance, '_property_key', None))
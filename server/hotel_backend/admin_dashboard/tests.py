@@ -1,3 +1,309 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from importlib import import_module
+from unittest import mock
+
+from django.apps import apps as django_apps
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.db.models import Sum
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from admin_dashboard.models import DailyMetrics
+from admin_dashboard.service.daily_metrics import METRICS, STALE_CACHE_KEY, rebuild_daily_metrics, stale_range
+from admin_dashboard.service import occupancy
+from admin_dashboard.service.month_stats import MonthStats
+from booking.models import Bookings, RoomNight, Transactions
+from hotel_backend.testing import EndpointBudgetMixin
+
+
+class AdminEndpointBudgetTests(EndpointBudgetMixin, TestCase):
+    """Query/latency budgets for /master/** GET routes, analytics included."""
+
+    def _month(self):
+        return f"month={self.month_start.month}&year={self.month_start.year}"
+
+    def test_dashboard_stats(self):
+        self.assertWithinBudget(f"/master/stats?{self._month()}", 4)
+
+    def test_booking_status_counts(self):
+        response = self.assertWithinBudget(f"/master/booking_status_counts?{self._month()}", 1)
+        created = Bookings.objects.filter(created_at__date__gte=self.month_start)
+        self.assertEqual(response.json()['checked_out'], created.filter(status='checked_out').count())
+        self.assertEqual(response.json()['pending'], created.filter(status='pending').count())
+
+    def test_daily_revenue(self):
+        self.assertWithinBudget(f"/master/daily_revenue?{self._month()}", 1)
+
+    def test_daily_revenue_uses_local_days(self):
+        # 17:00 UTC on the last of March is already 1 April in Manila
+        Transactions.objects.create(
+            user=self.guest, transaction_type='booking', amount=700, status='completed',
+            transaction_date=datetime(2025, 3, 31, 17, 0, tzinfo=dt_timezone.utc),
+        )
+        response = self.assertWithinBudget('/master/daily_revenue?month=4&year=2025', 1)
+        self.assertEqual(response.json()['data'][0], 700.0)
+        self.assertEqual(sum(response.json()['data']), 700.0)
+
+    def test_daily_bookings(self):
+        self.assertWithinBudget(f"/master/daily_bookings?{self._month()}", 1)
+
+    def test_daily_occupancy(self):
+        self.assertWithinBudget(f"/master/daily_occupancy?{self._month()}", 2)
+
+    def test_daily_occupancy_range(self):
+        start = self.month_start - timedelta(days=30)
+        end = self.month_start + timedelta(days=59)
+        response = self.assertWithinBudget(f"/master/daily_occupancy?start={start}&end={end}", 2)
+        data = response.json()['data']
+        self.assertEqual(len(data), 90)
+
+        # Same figures as the room-night ledger
+        for offset in (30, 31, 35, 45):
+            night = start + timedelta(days=offset)
+            rooms = RoomNight.objects.filter(
+                night=night, status__in=['reserved', 'confirmed', 'checked_in']
+            ).values('room_id').distinct().count()
+            self.assertEqual(data[offset], round(rooms / self.ROOMS * 100, 2))
+
+    def test_daily_checkins_checkouts(self):
+        response = self.assertWithinBudget(f"/master/daily_checkins_checkouts?{self._month()}", 1)
+        day = self.month_start + timedelta(days=2)
+        self.assertEqual(
+            response.json()['checkins'][2],
+            Bookings.objects.filter(check_in_date=day, status__in=['checked_in', 'checked_out']).count(),
+        )
+        self.assertEqual(
+            sum(response.json()['checkouts']),
+            Bookings.objects.filter(
+                check_out_date__year=self.month_start.year, check_out_date__month=self.month_start.month,
+                status='checked_out',
+            ).count(),
+        )
+
+    def test_daily_cancellations(self):
+        self.assertWithinBudget(f"/master/daily_cancellations?{self._month()}", 1)
+
+    def test_daily_no_shows_rejected(self):
+        self.assertWithinBudget(f"/master/daily_no_shows_rejected?{self._month()}", 1)
+
+    def test_room_revenue(self):
+        response = self.assertWithinBudget(f"/master/room_revenue?{self._month()}", 2)
+        self.assertEqual(len(response.json()['room_names']), self.ROOMS)
+        self.assertEqual(
+            response.json()['revenue_data'][0],
+            float(Transactions.objects.filter(
+                booking__room=self.room, booking__is_venue_booking=False, status='completed',
+                transaction_date__date__gte=self.month_start,
+            ).aggregate(total=Sum('amount'))['total'] or 0),
+        )
+
+    def test_room_bookings(self):
+        self.assertWithinBudget(f"/master/room_bookings?{self._month()}", 2)
+
+    def test_area_revenue(self):
+        self.assertWithinBudget(f"/master/area_revenue?{self._month()}", 2)
+
+    def test_area_bookings(self):
+        response = self.assertWithinBudget(f"/master/area_bookings?{self._month()}", 2)
+        self.assertEqual(
+            response.json()['booking_counts'][0],
+            Bookings.objects.filter(
+                area=self.area, is_venue_booking=True, created_at__date__gte=self.month_start,
+            ).count(),
+        )
+
+    def test_property_charts(self):
+        response = self.assertWithinBudget(f"/master/property_charts?{self._month()}", 3)
+        rooms = self.assertWithinBudget(f"/master/room_bookings?{self._month()}", 2)
+        self.assertEqual(response.json()['rooms']['bookings'], rooms.json()['booking_counts'])
+        self.assertEqual(len(response.json()['areas']['names']), self.AREAS)
+
+    def test_monthly_report(self):
+        # 3 for the month figures, 3 for the room and area sections whatever their size
+        self.assertWithinBudget(f"/master/generate_monthly_report?{self._month()}", 6)
+
+    def test_rooms(self):
+        self.assertWithinBudget('/master/rooms', 5)
+
+    def test_rooms_sparse(self):
+        response = self.assertWithinBudget('/master/rooms?fields=id,room_name,price_per_night&expand=amenities', 3)
+        self.assertEqual(set(response.json()['data'][0]), {'id', 'room_name', 'price_per_night', 'amenities'})
+
+    def test_show_room(self):
+        self.assertWithinBudget(f"/master/show_room/{self.room.id}", 4)
+
+    def test_areas(self):
+        self.assertWithinBudget('/master/areas', 4)
+
+    def test_show_area(self):
+        self.assertWithinBudget(f"/master/show_area/{self.area.id}", 3)
+
+    def test_amenities(self):
+        self.assertWithinBudget('/master/amenities', 2)
+
+    def test_show_amenity(self):
+        amenity = self.room.amenities.first()
+        self.assertWithinBudget(f"/master/show_amenity/{amenity.id}", 1)
+
+    def test_users(self):
+        self.assertWithinBudget('/master/users', 2)
+
+    def test_show_user(self):
+        self.assertWithinBudget(f"/master/show_user/{self.guest.id}", 1)
+
+    def test_archived_users(self):
+        self.assertWithinBudget('/master/archived_users', 1)
+
+    def test_bookings(self):
+        self.assertWithinBudget('/master/bookings?status=all&page_size=30', 6)
+
+    def test_booking_detail(self):
+        self.assertWithinBudget(f"/master/booking/{self.booking.id}", 5)
+
+
+class DailyMetricsTests(EndpointBudgetMixin, TestCase):
+    """The rollup kept by signals matches one rebuilt from the raw tables."""
+
+    def _rollup(self):
+        rows = {}
+        for row in DailyMetrics.objects.values('date', 'room_id', 'area_id', *METRICS):
+            key = (row.pop('date'), row.pop('room_id'), row.pop('area_id'))
+            figures = {name: value for name, value in row.items() if value}
+            if figures:
+                rows[key] = figures
+        return rows
+
+    def assertRollupMatchesRebuild(self):
+        kept = self._rollup()
+        rebuild_daily_metrics()
+        self.assertEqual(kept, self._rollup())
+
+    def test_setup_writes(self):
+        self.assertTrue(DailyMetrics.objects.exists())
+        self.assertRollupMatchesRebuild()
+
+    def test_status_and_date_changes(self):
+        booking = Bookings.objects.filter(room__isnull=False, status='reserved').first()
+        booking.status = 'checked_in'
+        booking.save()
+        booking.check_out_date += timedelta(days=3)
+        booking.save()
+        booking.status = 'cancelled'
+        booking.cancellation_date = datetime(2025, 3, 31, 17, 0, tzinfo=dt_timezone.utc)
+        booking.save()
+        self.assertRollupMatchesRebuild()
+
+    def test_room_change_moves_revenue(self):
+        booking = Bookings.objects.filter(room=self.room, transactions__status='completed').first()
+        booking.room = self.rooms[1]
+        booking.save()
+        self.assertRollupMatchesRebuild()
+
+    def test_transaction_writes(self):
+        tx = Transactions.objects.filter(booking=self.booking).first()
+        tx.amount = 2750
+        tx.save()
+        tx.status = 'pending'
+        tx.save()
+        Transactions.objects.create(
+            user=self.guest, transaction_type='booking', amount=700, status='completed',
+            transaction_date=datetime(2025, 3, 31, 17, 0, tzinfo=dt_timezone.utc),
+        )
+        self.assertRollupMatchesRebuild()
+
+    def test_booking_delete_cascades(self):
+        self.booking.delete()
+        self.assertRollupMatchesRebuild()
+
+    def test_bulk_updates(self):
+        reserved = Bookings.objects.filter(room__isnull=False, status='reserved')
+        count = reserved.count()
+        self.assertTrue(count)
+
+        checkins = DailyMetrics.objects.aggregate(total=Sum('checkins'))['total']
+        reserved.update(status='checked_in')
+        self.assertEqual(DailyMetrics.objects.aggregate(total=Sum('checkins'))['total'], checkins + count)
+
+        self.assertTrue(Bookings.objects.filter(room=self.room, status='checked_in').update(
+            status='cancelled', cancellation_date=timezone.now(),
+        ))
+        self.assertTrue(Bookings.objects.filter(room=self.room, transactions__status='completed').update(room=self.rooms[1]))
+
+        # bulk_update sends Case() expressions, so the rows are read back
+        pending = list(Bookings.objects.filter(status='pending', room__isnull=False))
+        for booking in pending:
+            booking.status = 'rejected'
+        Bookings.objects.bulk_update(pending, ['status'])
+        self.assertRollupMatchesRebuild()
+
+    def test_bulk_update_reads_bookings_once(self):
+        booking = Bookings.objects.filter(status='cancelled').first()
+        with CaptureQueriesContext(connection) as captured:
+            Bookings.objects.filter(id=booking.id).update(cancellation_date=timezone.now())
+        selects = [query['sql'] for query in captured if query['sql'].startswith('SELECT') and '"bookings"' in query['sql']]
+        self.assertEqual(len(selects), 1, selects)
+        self.assertRollupMatchesRebuild()
+
+    def test_failed_upkeep_is_reported(self):
+        cache.clear()
+        booking = Bookings.objects.filter(room__isnull=False, status='reserved').first()
+        booking.status = 'checked_in'
+        with self.assertLogs('admin_dashboard.service.daily_metrics', 'ERROR'), mock.patch(
+            'admin_dashboard.service.daily_metrics.apply_changes', side_effect=DatabaseError('rollup unavailable')
+        ):
+            booking.save()
+
+        stale = stale_range(booking.check_in_date, booking.check_in_date)
+        self.assertEqual(stale['failures'], 1)
+        self.assertIsNone(stale_range(booking.check_in_date - timedelta(days=400), booking.check_in_date - timedelta(days=399)))
+
+        month = f"month={booking.check_in_date.month}&year={booking.check_in_date.year}"
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get(f"/master/stats?{month}").json()['metrics_stale'], stale)
+
+        rebuild_daily_metrics()
+        self.assertIsNone(stale_range())
+
+    def test_stale_month_reads_raw_tables(self):
+        series = [
+            'daily_revenue', 'daily_bookings', 'daily_checkins', 'daily_checkouts',
+            'daily_cancellations', 'daily_no_shows', 'daily_rejections',
+        ]
+        month, year = self.month_start.month, self.month_start.year
+        Bookings.objects.filter(status='cancelled').update(cancellation_date=timezone.now())
+        stats = MonthStats(month, year)
+        expected = {name: getattr(stats, name)() for name in series}
+        expected['occupied_rooms'] = occupancy.occupied_rooms(*stats.date_range)
+        charts = {kind: stats.property_chart(kind) for kind in ('room', 'area')}
+        self.assertTrue(all(any(chart['revenue']) and any(chart['bookings']) for chart in charts.values()), charts)
+        self.assertTrue(all(any(values) for values in expected.values()), expected)
+
+        cache.set(STALE_CACHE_KEY, {
+            'since': timezone.now().isoformat(), 'failures': 1,
+            'start': self.month_start.isoformat(), 'end': self.month_start.isoformat(),
+        })
+        DailyMetrics.objects.all().delete()
+        stats = MonthStats(month, year)
+        self.assertTrue(stats.metrics_stale)
+        actual = {name: getattr(stats, name)() for name in series}
+        actual['occupied_rooms'] = occupancy.occupied_rooms(*stats.date_range)
+        self.assertEqual(actual, expected)
+        self.assertEqual({kind: stats.property_chart(kind) for kind in ('room', 'area')}, charts)
+        cache.delete(STALE_CACHE_KEY)
+
+    def test_migration_backfill_matches_rebuild(self):
+        rebuild_daily_metrics()
+        expected = self._rollup()
+
+        DailyMetrics.objects.all().delete()
+        import_module('admin_dashboard.migrations.0002_daily_metrics').backfill_daily_metrics(django_apps, None)
+        self.assertEqual(self._rollup(), expected)
 
-# Create your tests here.
+    def test_range_rebuild(self):
+        kept = self._rollup()
+        today = timezone.localdate()
+        self.assertTrue(DailyMetrics.objects.filter(date=today).update(bookings_created=0, revenue=0))
+        rebuild_daily_metrics(today - timedelta(days=3), today + timedelta(days=3))
+        self.assertEqual(kept, self._rollup())
@@ -8,13 +8,16 @@ from property.models import Areas, Rooms, Amenities, RoomImages, AreaImages
 from property.serializers import AreaSerializer, RoomSerializer, AmenitySerializer
 from booking.models import Bookings, Transactions
 from booking.serializers import BookingSerializer
+from booking.service import pagination as pagination_service
+from .service.month_stats import MonthStats, REPORTED_STATUSES
+from .service import occupancy as occupancy_service
 from user_roles.models import CustomUsers, Notification
 from user_roles.serializers import CustomUserSerializer
 from user_roles.views import create_booking_notification
 from user_roles.service.firebase import firebase_service, sanitize_for_json
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
-from django.db.models import Q, Sum
-from datetime import datetime, date, timedelta
+from django.db import IntegrityError, transaction
+from datetime import datetime
 from .email.booking import send_booking_confirmation_email, send_booking_rejection_email, send_checkout_e_receipt
 from .tasks import (
     send_booking_confirmation_email_task,
@@ -23,7 +26,6 @@ from .tasks import (
 )
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
-from django.db.models import Sum, Count, Avg
 import traceback
 import io
 import logging
@@ -81,100 +83,28 @@ def dashboard_stats(request):
         month = int(request.query_params.get('month', timezone.now().month))
         year = int(request.query_params.get('year', timezone.now().year))
         
-        start_date = timezone.datetime(year, month, 1)
-        if month == 12:
-            end_date = timezone.datetime(year + 1, 1, 1) - timezone.timedelta(days=1)
-        else:
-            end_date = timezone.datetime(year, month + 1, 1) - timezone.timedelta(days=1)
-        
-        end_date = end_date.replace(hour=23, minute=59, second=59)
-        
-        total_rooms = Rooms.objects.count()
-        
-        checked_in_room_ids = Bookings.objects.filter(
-            Q(status='checked_in') & 
-            Q(is_venue_booking=False) & 
-            Q(check_in_date__lte=end_date.date()) &
-            Q(check_out_date__gte=start_date.date())
-        ).values_list('room_id', flat=True).distinct()
-        
-        available_rooms = Rooms.objects.filter(
-            status='available'
-        ).exclude(
-            id__in=checked_in_room_ids
-        ).count()
-        
-        occupied_rooms = Bookings.objects.filter(
-            Q(status='checked_in') & 
-            Q(is_venue_booking=False) & 
-            Q(check_in_date__lte=end_date.date()) &
-            Q(check_out_date__gte=start_date.date())
-        ).count()
-        
-        maintenance_rooms = Rooms.objects.filter(status='maintenance').count()
-        
-        active_bookings = Bookings.objects.filter(
-            Q(status__in=['confirmed', 'reserved', 'checked_in']) &
-            Q(created_at__range=(start_date, end_date))
-        ).count()
-        
-        pending_bookings = Bookings.objects.filter(
-            Q(status='pending') &
-            Q(created_at__range=(start_date, end_date))
-        ).count()
-        
-        unpaid_bookings = Bookings.objects.filter(
-            Q(payment_status='unpaid') &
-            Q(created_at__range=(start_date, end_date))
-        ).count()
-        
-        checked_in_count = Bookings.objects.filter(
-            Q(status='checked_in') &
-            Q(check_in_date__range=(start_date.date(), end_date.date()))
-        ).count()
-        
-        total_bookings = Bookings.objects.filter(
-            created_at__range=(start_date, end_date)
-        ).count()
-        
-        upcoming_reservations = Bookings.objects.filter(
-            Q(is_venue_booking=True) &
-            Q(status__in=['confirmed', 'reserved']) &
-            Q(check_in_date__gte=start_date.date())
-        ).count()
-        
-        transactions_this_month = Transactions.objects.filter(
-            transaction_date__range=(start_date, end_date),
-            status='completed'
-        )
-        
-        revenue = transactions_this_month.aggregate(Sum('amount'))['amount__sum'] or 0
-        
-        room_revenue = transactions_this_month.filter(
-            Q(booking__isnull=False) & 
-            Q(booking__is_venue_booking=False)
-        ).aggregate(Sum('amount'))['amount__sum'] or 0
-        
-        venue_revenue = transactions_this_month.filter(
-            Q(booking__isnull=False) & 
-            (Q(booking__is_venue_booking=True))
-        ).aggregate(Sum('amount'))['amount__sum'] or 0
+        stats = MonthStats(month, year)
+        bookings = stats.bookings
+        rooms = stats.rooms
+        revenue = stats.revenue['total']
+        room_revenue = stats.revenue['room']
+        venue_revenue = stats.revenue['venue']
         
         formatted_revenue = f"₱{revenue:,.2f}"
         formatted_room_revenue = f"₱{room_revenue:,.2f}"
         formatted_venue_revenue = f"₱{venue_revenue:,.2f}"
         
         response_data = {
-            'total_rooms': total_rooms,
-            'available_rooms': available_rooms,
-            'occupied_rooms': occupied_rooms,
-            'maintenance_rooms': maintenance_rooms,
-            'active_bookings': active_bookings,
-            'pending_bookings': pending_bookings,
-            'unpaid_bookings': unpaid_bookings,
-            'checked_in_count': checked_in_count,
-            'total_bookings': total_bookings,
-            'upcoming_reservations': upcoming_reservations,
+            'total_rooms': rooms['total'],
+            'available_rooms': rooms['free'],
+            'occupied_rooms': stats.occupied_room_bookings,
+            'maintenance_rooms': rooms['maintenance'],
+            'active_bookings': bookings['active'],
+            'pending_bookings': bookings['pending'],
+            'unpaid_bookings': bookings['unpaid'],
+            'checked_in_count': bookings['checked_in_this_month'],
+            'total_bookings': bookings['total'],
+            'upcoming_reservations': bookings['upcoming_reservations'],
             'revenue': revenue,
             'room_revenue': room_revenue,
             'venue_revenue': venue_revenue,
@@ -182,7 +112,8 @@ def dashboard_stats(request):
             'formatted_room_revenue': formatted_room_revenue,
             'formatted_venue_revenue': formatted_venue_revenue,
             'month': month,
-            'year': year
+            'year': year,
+            'metrics_stale': stats.metrics_stale,
         }
         return Response(response_data, status=status.HTTP_200_OK)
     except Exception as e:
@@ -194,7 +125,8 @@ def dashboard_stats(request):
 @api_view(['GET'])
 def fetch_rooms(request):
     try:
-        rooms = Rooms.objects.all().order_by('id')
+        fields = RoomSerializer.select_fields(request.query_params)
+        rooms = RoomSerializer.setup_eager_loading(Rooms.objects.all().order_by('id'), fields=fields)
         
         page = request.query_params.get('page', 1)
         page_size = request.query_params.get('page_size', 10)
@@ -207,7 +139,7 @@ def fetch_rooms(request):
         except EmptyPage:
             paginated_rooms = paginator.page(paginator.num_pages)
         
-        serializer = RoomSerializer(paginated_rooms, many=True)
+        serializer = RoomSerializer(paginated_rooms, many=True, fields=fields)
         
         return Response({
             "data": serializer.data,
@@ -279,7 +211,7 @@ def add_new_room(request):
 @api_view(['GET'])
 def show_room_details(request, room_id):
     try:
-        room = Rooms.objects.get(id=room_id)
+        room = RoomSerializer.setup_eager_loading(Rooms.objects.all()).get(id=room_id)
         serializer = RoomSerializer(room)
         return Response({
             "data": serializer.data
@@ -414,7 +346,8 @@ def delete_room(request, room_id):
 @api_view(['GET'])
 def fetch_areas(request):
     try:
-        areas = Areas.objects.all().order_by('id')
+        fields = AreaSerializer.select_fields(request.query_params)
+        areas = AreaSerializer.setup_eager_loading(Areas.objects.all().order_by('id'), fields=fields)
         
         page = request.query_params.get('page', 1)
         page_size = request.query_params.get('page_size', 10)
@@ -427,7 +360,7 @@ def fetch_areas(request):
         except EmptyPage:
             paginated_areas = paginator.page(paginator.num_pages)
         
-        serializer = AreaSerializer(paginated_areas, many=True)
+        serializer = AreaSerializer(paginated_areas, many=True, fields=fields)
         
         return Response({
             "data": serializer.data,
@@ -488,7 +421,7 @@ def add_new_area(request):
 @api_view(['GET'])
 def show_area_details(request, area_id):
     try:
-        area = Areas.objects.get(id=area_id)
+        area = AreaSerializer.setup_eager_loading(Areas.objects.all()).get(id=area_id)
         serializer = AreaSerializer(area)
         return Response({
             "data": serializer.data
@@ -756,7 +689,8 @@ def admin_bookings(request):
         
         status_filter = request.query_params.get('status')
         
-        bookings = Bookings.objects.all().order_by('created_at')
+        fields = BookingSerializer.select_fields(request.query_params)
+        bookings = BookingSerializer.setup_eager_loading(Bookings.objects.all(), fields=fields).order_by('created_at')
         
         if status_filter and status_filter != "all":
             bookings = bookings.filter(status=status_filter)
@@ -765,6 +699,17 @@ def admin_bookings(request):
         
         page = request.query_params.get('page', 1)
         page_size = request.query_params.get('page_size', 10)
+        
+        if pagination_service.is_cursor_request(request.query_params):
+            page_rows, pagination = pagination_service.cursor_page(
+                bookings, request.query_params, page_size, descending=False
+            )
+            serializer = BookingSerializer(page_rows, many=True, fields=fields)
+            return Response({
+                "data": serializer.data,
+                "pagination": pagination
+            }, status=status.HTTP_200_OK)
+        
         paginator = Paginator(bookings, page_size)
         
         try:
@@ -774,7 +719,7 @@ def admin_bookings(request):
         except EmptyPage:
             paginated_bookings = paginator.page(paginator.num_pages)
 
-        serializer = BookingSerializer(paginated_bookings, many=True)
+        serializer = BookingSerializer(paginated_bookings, many=True, fields=fields)
         
         return Response({
             "data": serializer.data,
@@ -791,7 +736,9 @@ def admin_bookings(request):
 @api_view(['GET'])
 def booking_detail(request, booking_id):
     try:
-        booking = Bookings.objects.get(id=booking_id)
+        booking = BookingSerializer.setup_eager_loading(
+            Bookings.objects.all(), full_property=True
+        ).get(id=booking_id)
         booking_serializer = BookingSerializer(booking)
         data = booking_serializer.data
         
@@ -829,6 +776,15 @@ def update_booking_status(request, booking_id):
         except (ValueError, TypeError):
             return Response({"error": "Invalid down payment amount"}, status=status.HTTP_400_BAD_REQUEST)
         
+    if status_value in Bookings.ACTIVE_STATUSES and booking.status not in Bookings.ACTIVE_STATUSES and booking.room_id:
+        room_taken = Bookings.objects.filter(
+            room_id=booking.room_id,
+            status__in=Bookings.ACTIVE_STATUSES,
+        ).exclude(id=booking.id).overlapping(booking.check_in_date, booking.check_out_date).exists()
+        if room_taken:
+            return Response({"error": "Another active booking already holds this room for these dates"},
+                            status=status.HTTP_409_CONFLICT)
+
     set_available = request.data.get('set_available')
     prevent_maintenance = set_available is False
     
@@ -881,7 +837,13 @@ def update_booking_status(request, booking_id):
         property_name = "your reservation"
     
     booking.property_name = property_name
-    booking.save()
+    try:
+        with transaction.atomic():
+            booking.save()
+    except IntegrityError:
+        # bookings_room_no_overlap / bookings_area_no_overlap rejected a concurrent double-booking
+        return Response({"error": "Another active booking already holds this property for these dates"},
+                        status=status.HTTP_409_CONFLICT)
     serializer = BookingSerializer(booking)
     
     if old_status != status_value:
@@ -1000,34 +962,10 @@ def booking_status_counts(request):
         month = int(request.query_params.get('month'))
         year = int(request.query_params.get('year'))
         
-        start_date = datetime(year, month, 1)
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = datetime(year, month + 1, 1) - timedelta(days=1)
-        end_date = end_date.replace(hour=23, minute=59, second=59)
-        
-        filters = {
-            'created_at__gte': start_date,
-            'created_at__lte': end_date,
-        }
+        bookings = MonthStats(month, year).bookings
         
-        pending_count = Bookings.objects.filter(status='pending', **filters).count()
-        reserved_count = Bookings.objects.filter(status='reserved', **filters).count()
-        checked_in_count = Bookings.objects.filter(status='checked_in', **filters).count()
-        checked_out_count = Bookings.objects.filter(status='checked_out', **filters).count()
-        cancelled_count = Bookings.objects.filter(status='cancelled', **filters).count()
-        no_show_count = Bookings.objects.filter(status='no_show', **filters).count() 
-        rejected_count = Bookings.objects.filter(status='rejected', **filters).count()
-        
-        return Response({
-            "pending": pending_count,
-            "reserved": reserved_count,
-            "checked_in": checked_in_count,
-            "checked_out": checked_out_count,
-            "cancelled": cancelled_count,
-            "no_show": no_show_count,
-            "rejected": rejected_count
+        return Response({
+            status_name: bookings[status_name] for status_name in REPORTED_STATUSES
         }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1040,6 +978,17 @@ def fetch_all_users(request):
         
         page = request.query_params.get('page', 1)
         page_size = request.query_params.get('page_size', 10)
+        
+        if pagination_service.is_cursor_request(request.query_params):
+            page_rows, pagination = pagination_service.cursor_page(
+                users, request.query_params, page_size, field='date_joined'
+            )
+            serializer = CustomUserSerializer(page_rows, many=True)
+            return Response({
+                "users": serializer.data,
+                "pagination": pagination
+            }, status=status.HTTP_200_OK)
+        
         paginator = Paginator(users, page_size)
         
         try:
@@ -1305,32 +1254,13 @@ def daily_revenue(request):
         month = int(request.query_params.get('month', timezone.now().month))
         year = int(request.query_params.get('year', timezone.now().year))
         
-        start_date = datetime(year, month, 1)
-        
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = datetime(year, month + 1, 1) - timedelta(days=1)
-        
-        end_date = end_date.replace(hour=23, minute=59, second=59)        
-        days_in_month = (end_date.day)
-        daily_revenue = [0] * days_in_month
-        
-        transactions = Transactions.objects.filter(
-            transaction_date__gte=start_date,
-            transaction_date__lte=end_date,
-            status='completed'
-        )
-        
-        for transaction in transactions:
-            day_idx = transaction.transaction_date.day - 1
-            daily_revenue[day_idx] += float(transaction.amount)
+        month_stats = MonthStats(month, year)
         
         return Response({
-            "data": daily_revenue,
+            "data": month_stats.daily_revenue(),
             "month": month,
             "year": year,
-            "days_in_month": days_in_month
+            "days_in_month": month_stats.days_in_month
         }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({
@@ -1338,37 +1268,18 @@ def daily_revenue(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
-
 def daily_bookings(request):
     try:
         month = int(request.query_params.get('month', timezone.now().month))
         year = int(request.query_params.get('year', timezone.now().year))
         
-        start_date = datetime(year, month, 1)
-        
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = datetime(year, month + 1, 1) - timedelta(days=1)
-        
-        end_date = end_date.replace(hour=23, minute=59, second=59)        
-        days_in_month = (end_date.day)        
-        daily_bookings = [0] * days_in_month
-        
-        bookings = Bookings.objects.filter(
-            created_at__gte=start_date,
-            created_at__lte=end_date
-        )
-        
-        for booking in bookings:
-            day_idx = booking.created_at.day - 1
-            daily_bookings[day_idx] += 1
+        month_stats = MonthStats(month, year)
         
         return Response({
-            "data": daily_bookings,
+            "data": month_stats.daily_bookings(),
             "month": month,
             "year": year,
-            "days_in_month": days_in_month
+            "days_in_month": month_stats.days_in_month
         }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({
@@ -1378,44 +1289,43 @@ def daily_bookings(request):
 @api_view(['GET'])
 def daily_occupancy(request):
     try:
-        month = int(request.query_params.get('month', timezone.now().month))
-        year = int(request.query_params.get('year', timezone.now().year))        
-        
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1).date() - timedelta(days=1)
-        else:
-            end_date = datetime(year, month + 1, 1).date() - timedelta(days=1)
-        
-        days_in_month = (end_date.day)        
-        daily_occupancy = [0] * days_in_month
-        
+        start_param = request.query_params.get('start')
+        end_param = request.query_params.get('end')
         total_rooms = Rooms.objects.count()
-        if total_rooms == 0:
-            return Response({
-                "data": daily_occupancy,
-                "month": month,
-                "year": year,
-                "days_in_month": days_in_month
-            }, status=status.HTTP_200_OK)
         
-        for day in range(1, days_in_month + 1):
-            current_date = date(year, month, day)
+        if start_param or end_param:
+            try:
+                start = datetime.strptime(start_param or '', "%Y-%m-%d").date()
+                end = datetime.strptime(end_param or '', "%Y-%m-%d").date()
+            except ValueError:
+                return Response({
+                    "error": "Invalid date format. Use YYYY-MM-DD"
+                }, status=status.HTTP_400_BAD_REQUEST)
             
-            occupied_rooms = Bookings.objects.filter(
-                Q(check_in_date__lte=current_date) & 
-                Q(check_out_date__gte=current_date) &
-                Q(status__in=['reserved', 'confirmed', 'checked_in']) &
-                Q(is_venue_booking=False)
-            ).count()
+            days = (end - start).days + 1
+            if not 1 <= days <= occupancy_service.MAX_RANGE_DAYS:
+                return Response({
+                    "error": f"The range must span 1 to {occupancy_service.MAX_RANGE_DAYS} days"
+                }, status=status.HTTP_400_BAD_REQUEST)
             
-            occupancy_rate = (occupied_rooms / total_rooms) * 100
-            daily_occupancy[day - 1] = round(occupancy_rate, 2)
+            return Response({
+                "data": occupancy_service.occupancy_rates(start, end, total_rooms),
+                "start": start,
+                "end": end,
+                "days": days
+            }, status=status.HTTP_200_OK)
+        
+        month = int(request.query_params.get('month', timezone.now().month))
+        year = int(request.query_params.get('year', timezone.now().year))
+        month_stats = MonthStats(month, year)
         
         return Response({
-            "data": daily_occupancy,
+            "data": occupancy_service.occupancy_rates(
+                month_stats.start_date.date(), month_stats.end_date.date(), total_rooms
+            ),
             "month": month,
             "year": year,
-            "days_in_month": days_in_month
+            "days_in_month": month_stats.days_in_month
         }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({
@@ -1429,38 +1339,14 @@ def daily_checkins_checkouts(request):
         month = int(request.query_params.get('month', timezone.now().month))
         year = int(request.query_params.get('year', timezone.now().year))
         
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = datetime(year, month + 1, 1) - timedelta(days=1)
-        
-        end_date = end_date.replace(hour=23, minute=59, second=59)
-        
-        days_in_month = (end_date.day)
-        daily_checkins = [0] * days_in_month
-        daily_checkouts = [0] * days_in_month
-        
-        bookings = Bookings.objects.all()
-        
-        for booking in bookings:
-            if booking.check_in_date and booking.check_in_date.month == month and booking.check_in_date.year == year:
-                if booking.status == 'checked_in' or booking.status == 'checked_out':
-                    day_idx = booking.check_in_date.day - 1
-                    if 0 <= day_idx < days_in_month:
-                        daily_checkins[day_idx] += 1
-            
-            if booking.check_out_date and booking.check_out_date.month == month and booking.check_out_date.year == year:
-                if booking.status == 'checked_out':
-                    day_idx = booking.check_out_date.day - 1
-                    if 0 <= day_idx < days_in_month:
-                        daily_checkouts[day_idx] += 1
+        month_stats = MonthStats(month, year)
         
         return Response({
-            "checkins": daily_checkins,
-            "checkouts": daily_checkouts,
+            "checkins": month_stats.daily_checkins(),
+            "checkouts": month_stats.daily_checkouts(),
             "month": month,
             "year": year,
-            "days_in_month": days_in_month
+            "days_in_month": month_stats.days_in_month
         }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({
@@ -1472,32 +1358,15 @@ def daily_checkins_checkouts(request):
 def daily_cancellations(request):
     try:
         month = int(request.query_params.get('month', timezone.now().month))
-        year = int(request.query_params.get('year', timezone.now().year))       
-        start_date = datetime(year, month, 1)
-        
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = datetime(year, month + 1, 1) - timedelta(days=1)
-        
-        end_date = end_date.replace(hour=23, minute=59, second=59)
-        days_in_month = (end_date.day)
-        daily_cancellations = [0] * days_in_month        
-        cancelled_bookings = Bookings.objects.filter(
-            status='cancelled',
-            cancellation_date__gte=start_date,
-            cancellation_date__lte=end_date
-        )
+        year = int(request.query_params.get('year', timezone.now().year))
         
-        for booking in cancelled_bookings:
-            day_idx = booking.cancellation_date.day - 1
-            daily_cancellations[day_idx] += 1
+        month_stats = MonthStats(month, year)
         
         return Response({
-            "data": daily_cancellations,
+            "data": month_stats.daily_cancellations(),
             "month": month,
             "year": year,
-            "days_in_month": days_in_month
+            "days_in_month": month_stats.days_in_month
         }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({
@@ -1510,40 +1379,18 @@ def area_revenue(request):
     try:
         month = int(request.query_params.get('month', timezone.now().month))
         year = int(request.query_params.get('year', timezone.now().year))
-        start_date = datetime(year, month, 1)
         
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = datetime(year, month + 1, 1) - timedelta(days=1)
-            
-        end_date = end_date.replace(hour=23, minute=59, second=59)
+        chart = MonthStats(month, year).property_chart('area', bookings=False)
         
-        response_data = {
-            "area_names": [],
-            "revenue_data": [],
+        return Response({
+            "area_names": chart['names'],
+            "revenue_data": chart['revenue'],
             "month": month,
             "year": year
-        }
-        
-        areas = Areas.objects.all()
-        
-        for area in areas:
-            area_revenue = Transactions.objects.filter(
-                booking__area=area,
-                transaction_date__gte=start_date,
-                transaction_date__lte=end_date,
-                status='completed',
-                booking__is_venue_booking=True
-            ).aggregate(Sum('amount'))['amount__sum'] or 0
-            
-            response_data["area_names"].append(area.area_name)
-            response_data["revenue_data"].append(float(area_revenue))
-        
-        return Response(response_data, status=status.HTTP_200_OK)
+        }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({
-            'error': str(e)
+            "error": str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 @api_view(['GET'])
@@ -1551,37 +1398,16 @@ def area_revenue(request):
 def area_bookings(request):
     try:
         month = int(request.query_params.get('month', timezone.now().month))
-        year = int(request.query_params.get('year', timezone.now().year))        
-        start_date = datetime(year, month, 1)
-        
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = datetime(year, month + 1, 1) - timedelta(days=1)
+        year = int(request.query_params.get('year', timezone.now().year))
         
-        end_date = end_date.replace(hour=23, minute=59, second=59)
+        chart = MonthStats(month, year).property_chart('area', revenue=False)
         
-        response_data = {
-            "area_names": [],
-            "booking_counts": [],
+        return Response({
+            "area_names": chart['names'],
+            "booking_counts": chart['bookings'],
             "month": month,
             "year": year
-        }
-        
-        areas = Areas.objects.all()
-        
-        for area in areas:
-            area_bookings = Bookings.objects.filter(
-                area=area,
-                created_at__gte=start_date,
-                created_at__lte=end_date,
-                is_venue_booking=True
-            ).count()
-            
-            response_data["area_names"].append(area.area_name)
-            response_data["booking_counts"].append(area_bookings)
-        
-        return Response(response_data, status=status.HTTP_200_OK)
+        }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({
             "error": str(e)
@@ -1591,38 +1417,16 @@ def area_bookings(request):
 def room_revenue(request):
     try:
         month = int(request.query_params.get('month', timezone.now().month))
-        year = int(request.query_params.get('year', timezone.now().year))        
-        start_date = datetime(year, month, 1)
+        year = int(request.query_params.get('year', timezone.now().year))
         
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = datetime(year, month + 1, 1) - timedelta(days=1)
-
-        end_date = end_date.replace(hour=23, minute=59, second=59)
+        chart = MonthStats(month, year).property_chart('room', bookings=False)
         
-        response_data = {
-            "room_names": [],
-            "revenue_data": [],
+        return Response({
+            "room_names": chart['names'],
+            "revenue_data": chart['revenue'],
             "month": month,
             "year": year
-        }
-        
-        rooms = Rooms.objects.all()
-        
-        for room in rooms:
-            room_revenue = Transactions.objects.filter(
-                booking__room=room,
-                transaction_date__gte=start_date,
-                transaction_date__lte=end_date,
-                status='completed',
-                booking__is_venue_booking=False
-            ).aggregate(Sum('amount'))['amount__sum'] or 0
-            
-            response_data["room_names"].append(room.room_name)
-            response_data["revenue_data"].append(float(room_revenue))
-        
-        return Response(response_data, status=status.HTTP_200_OK)
+        }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({
             "error": str(e)
@@ -1632,37 +1436,35 @@ def room_revenue(request):
 def room_bookings(request):
     try:
         month = int(request.query_params.get('month', timezone.now().month))
-        year = int(request.query_params.get('year', timezone.now().year))        
-        start_date = datetime(year, month, 1)
-        
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = datetime(year, month + 1, 1) - timedelta(days=1)
+        year = int(request.query_params.get('year', timezone.now().year))
         
-        end_date = end_date.replace(hour=23, minute=59, second=59)
+        chart = MonthStats(month, year).property_chart('room', revenue=False)
         
-        response_data = {
-            "room_names": [],
-            "booking_counts": [],
+        return Response({
+            "room_names": chart['names'],
+            "booking_counts": chart['bookings'],
             "month": month,
             "year": year
-        }
-        
-        rooms = Rooms.objects.all()
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response({
+            "error": str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@api_view(['GET'])
+def property_charts(request):
+    try:
+        month = int(request.query_params.get('month', timezone.now().month))
+        year = int(request.query_params.get('year', timezone.now().year))
         
-        for room in rooms:
-            room_bookings = Bookings.objects.filter(
-                room=room,
-                created_at__gte=start_date,
-                created_at__lte=end_date,
-                is_venue_booking=False
-            ).count()
-            
-            response_data["room_names"].append(room.room_name)
-            response_data["booking_counts"].append(room_bookings)
+        month_stats = MonthStats(month, year)
         
-        return Response(response_data, status=status.HTTP_200_OK)
+        return Response({
+            "rooms": month_stats.property_chart('room'),
+            "areas": month_stats.property_chart('area'),
+            "month": month,
+            "year": year
+        }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({
             "error": str(e)
@@ -1672,46 +1474,16 @@ def room_bookings(request):
 def daily_no_shows_rejected(request):
     try:
         month = int(request.query_params.get('month', timezone.now().month))
-        year = int(request.query_params.get('year', timezone.now().year))        
-        start_date = datetime(year, month, 1)
-        
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = datetime(year, month + 1, 1) - timedelta(days=1)
-        
-        end_date = end_date.replace(hour=23, minute=59, second=59)        
-        days_in_month = (end_date.day)
-        
-        daily_no_shows = [0] * days_in_month
-        daily_rejected = [0] * days_in_month
-        
-        no_show_bookings = Bookings.objects.filter(
-            status='missed_reservation',
-            updated_at__gte=start_date,
-            updated_at__lte=end_date
-        )
-        
-        rejected_bookings = Bookings.objects.filter(
-            status='rejected',
-            updated_at__gte=start_date,
-            updated_at__lte=end_date
-        )
-        
-        for booking in no_show_bookings:
-            day_idx = booking.updated_at.day - 1
-            daily_no_shows[day_idx] += 1
+        year = int(request.query_params.get('year', timezone.now().year))
         
-        for booking in rejected_bookings:
-            day_idx = booking.updated_at.day - 1
-            daily_rejected[day_idx] += 1
+        month_stats = MonthStats(month, year)
         
         return Response({
-            "no_shows": daily_no_shows,
-            "rejected": daily_rejected,
+            "no_shows": month_stats.daily_no_shows(),
+            "rejected": month_stats.daily_rejections(),
             "month": month,
             "year": year,
-            "days_in_month": days_in_month
+            "days_in_month": month_stats.days_in_month
         }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({
@@ -1724,109 +1496,49 @@ def monthly_report(request):
         month = int(request.query_params.get('month', timezone.now().month))
         year = int(request.query_params.get('year', timezone.now().year))
 
-        # Date range
-        start_date = datetime(year, month, 1)
-
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-        else:
-            end_date = datetime(year, month + 1, 1) - timedelta(days=1)
-
-        end_date = end_date.replace(hour=23, minute=59, second=59)
+        month_stats = MonthStats(month, year)
+        start_date = month_stats.start_date
 
-        # Get bookings for the period
-        bookings = Bookings.objects.filter(
-            created_at__gte=start_date,
-            created_at__lte=end_date,
-        )
-
-        # Get completed transactions for revenue
-        transactions = Transactions.objects.filter(
-            transaction_date__gte=start_date,
-            transaction_date__lte=end_date,
-            status='completed'
-        )
-
-        total_revenue = transactions.aggregate(Sum('amount'))['amount__sum'] or 0
-        room_revenue = transactions.filter(
-            booking__is_venue_booking=False
-        ).aggregate(Sum('amount'))['amount__sum'] or 0
-        venue_revenue = transactions.filter(
-            booking__is_venue_booking=True
-        ).aggregate(Sum('amount'))['amount__sum'] or 0
+        counts = month_stats.bookings
+        revenue = month_stats.revenue
+        rooms = month_stats.rooms
 
         # Stats
         stats = {
-            "activeBookings": bookings.filter(status__in=['confirmed', 'reserved', 'checked_in']).count(),
-            "pendingBookings": bookings.filter(status='pending').count(),
-            "totalBookings": bookings.count(),
-            "revenue": float(total_revenue),
-            "formattedRevenue": f"₱{total_revenue:,.2f}",
-            "roomRevenue": float(room_revenue),
-            "venueRevenue": float(venue_revenue),
-            "totalRooms": Rooms.objects.count(),
-            "availableRooms": Rooms.objects.filter(status='available').count(),
-            "occupiedRooms": bookings.filter(
-                status='checked_in',
-                is_venue_booking=False
-            ).count(),
-            "maintenanceRooms": Rooms.objects.filter(status='maintenance').count(),
-            "checkedInCount": bookings.filter(status='checked_in').count(),
+            "activeBookings": counts['active'],
+            "pendingBookings": counts['pending'],
+            "totalBookings": counts['total'],
+            "revenue": float(revenue['total']),
+            "formattedRevenue": f"₱{revenue['total']:,.2f}",
+            "roomRevenue": float(revenue['room']),
+            "venueRevenue": float(revenue['venue']),
+            "totalRooms": rooms['total'],
+            "availableRooms": rooms['available'],
+            "occupiedRooms": counts['occupied_rooms'],
+            "maintenanceRooms": rooms['maintenance'],
+            "checkedInCount": counts['checked_in'],
         }
 
         # Booking status counts
         booking_status_counts = {
-            "reserved": bookings.filter(status='reserved').count(),
-            "checked_out": bookings.filter(status='checked_out').count(),
-            "cancelled": bookings.filter(status='cancelled').count(),
-            "no_show": bookings.filter(status='no_show').count(),
-            "rejected": bookings.filter(status='rejected').count(),
+            status_name: counts[status_name]
+            for status_name in ('reserved', 'checked_out', 'cancelled', 'no_show', 'rejected')
         }
 
-        # Area Revenue + Bookings
-        areas = Areas.objects.all()
-        area_names = []
-        area_revenue_values = []
-        area_booking_values = []
-
-        for area in areas:
-            area_names.append(area.area_name)
-            area_revenue = transactions.filter(
-                booking__area=area,
-                booking__is_venue_booking=True
-            ).aggregate(Sum('amount'))['amount__sum'] or 0
-            area_revenue_values.append(float(area_revenue))
-            area_booking_values.append(
-                bookings.filter(area=area, is_venue_booking=True).count()
-            )
-
-        # Room Revenue + Bookings
-        rooms = Rooms.objects.all()
-        room_names = []
-        room_revenue_values = []
-        room_booking_values = []
-
-        for room in rooms:
-            room_names.append(room.room_name)
-            room_revenue = transactions.filter(
-                booking__room=room,
-                booking__is_venue_booking=False
-            ).aggregate(Sum('amount'))['amount__sum'] or 0
-            room_revenue_values.append(float(room_revenue))
-            room_booking_values.append(
-                bookings.filter(room=room, is_venue_booking=False).count()
-            )
+        # Area and room revenue + bookings
+        area_chart = month_stats.property_chart('area')
+        room_chart = month_stats.property_chart('room')
 
         return Response({
             "period": start_date.strftime("%B %Y"),
             "stats": stats,
             "bookingStatusCounts": booking_status_counts,
-            "areaNames": area_names,
-            "areaRevenueValues": area_revenue_values,
-            "areaBookingValues": area_booking_values,
-            "roomNames": room_names,
-            "roomRevenueValues": room_revenue_values,
-            "roomBookingValues": room_booking_values,
+            "areaNames": area_chart['names'],
+            "areaRevenueValues": area_chart['revenue'],
+            "areaBookingValues": area_chart['bookings'],
+            "roomNames": room_chart['names'],
+            "roomRevenueValues": room_chart['revenue'],
+            "roomBookingValues": room_chart['bookings'],
         }, status=status.HTTP_200_OK)
 
     except Exception as e:
@@ -6,4 +6,6 @@ class BookingConfig(AppConfig):
     name = 'booking'
 
     def ready(self):
-        from user_roles.service import signals
\ No newline at end of file
+        from user_roles.service import signals
+        import booking.checks
+        import booking.signals
\ No newline at end of file
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """The availability index, room holds and ETag stamps sync workers through the default cache."""
+    if settings.CACHES.get('default', {}).get('BACKEND') in PROCESS_LOCAL_CACHES:
+        return [Error(
+            "The default cache is local to each process, so workers do not see each other's "
+            "availability index updates or room holds, and each one stamps ETags on its own: "
+            "clients get different ETags per worker and a worker that missed a write keeps "
+            "answering 304 Not Modified.",
+            hint="Point CACHES['default'] at Redis (set REDIS_URL).",
+            id='booking.E001',
+        )]
+    return []
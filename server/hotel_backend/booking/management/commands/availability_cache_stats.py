@@ -0,0 +1,22 @@
+"""
+Show hit/miss counters of the availability answer cache.
+Run with: python manage.py availability_cache_stats [--reset]
+"""
+
+from django.core.management.base import BaseCommand
+from booking.service import availability_cache
+
+
+class Command(BaseCommand):
+    help = 'Show availability cache hit/miss counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after printing them')
+
+    def handle(self, *args, **options):
+        stats = availability_cache.stats(reset=options['reset'])
+        self.stdout.write(f"Hits:     {stats['hits']}")
+        self.stdout.write(f"Misses:   {stats['misses']}")
+        self.stdout.write(f"Hit rate: {stats['hit_rate']}%")
+        if options['reset']:
+            self.stdout.write('Counters reset.')
@@ -0,0 +1,136 @@
+"""
+Benchmark the availability index against the original queryset path.
+Run with: python manage.py benchmark_availability --bookings 100000
+
+All seeded rows are created inside a transaction that is rolled back at the end,
+so the command is safe to run against a development database.
+"""
+
+import random
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from booking.models import Bookings
+from booking.service.availability import AvailabilityIndex, NON_BLOCKING_STATUSES, _stay_end
+from property.models import Rooms, Areas
+from user_roles.models import CustomUsers
+
+STATUSES = ['pending', 'reserved', 'confirmed', 'checked_in', 'checked_out', 'cancelled', 'rejected']
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compare indexed availability lookups with the queryset path on a seeded dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bookings', type=int, default=100000)
+        parser.add_argument('--rooms', type=int, default=60)
+        parser.add_argument('--areas', type=int, default=10)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        try:
+            with transaction.atomic():
+                self._seed(options)
+                self._run(options)
+                raise _Rollback()
+        except _Rollback:
+            self.stdout.write('Seeded data rolled back.')
+
+    def _seed(self, options):
+        user = CustomUsers.objects.create(username='bench_user', email='bench@example.com', role='guest')
+        rooms = Rooms.objects.bulk_create(
+            [Rooms(room_name=f"Bench Room {i}", room_price=1000 + i) for i in range(options['rooms'])]
+        )
+        areas = Areas.objects.bulk_create(
+            [Areas(area_name=f"Bench Area {i}", capacity=50, price_per_hour=500) for i in range(options['areas'])]
+        )
+
+        today = timezone.localdate()
+        # Days held by active bookings per room/area; a clashing booking is seeded as pending so
+        # the no-overlap exclusion constraints hold on PostgreSQL
+        held = {}
+        batch = []
+        for _ in range(options['bookings']):
+            check_in = today + timedelta(days=random.randint(-700, 180))
+            is_venue = random.random() < 0.1
+            room = None if is_venue else random.choice(rooms)
+            area = random.choice(areas) if is_venue else None
+            check_out = check_in + timedelta(days=random.randint(0, 1) if is_venue else random.randint(1, 7))
+            status = random.choice(STATUSES)
+            if status in Bookings.ACTIVE_STATUSES:
+                days = held.setdefault((is_venue, (area or room).pk), set())
+                stay = {check_in + timedelta(days=n) for n in range((_stay_end(check_in, check_out, is_venue) - check_in).days)}
+                if days & stay:
+                    status = 'pending'
+                else:
+                    days |= stay
+            batch.append(Bookings(
+                user=user, room=room, area=area, is_venue_booking=is_venue,
+                check_in_date=check_in, check_out_date=check_out, status=status,
+            ))
+            if len(batch) >= 5000:
+                Bookings.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Bookings.objects.bulk_create(batch)
+
+    def _queryset_path(self, arrival, departure):
+        booked_room_ids = Bookings.objects.filter(
+            ~Q(status__in=NON_BLOCKING_STATUSES),
+            is_venue_booking=False
+        ).overlapping(arrival, departure).values_list('room_id', flat=True)
+        booked_area_ids = Bookings.objects.filter(
+            ~Q(status__in=NON_BLOCKING_STATUSES),
+            is_venue_booking=True
+        ).overlapping(arrival, departure).values_list('area_id', flat=True)
+        rooms = list(Rooms.objects.filter(status='available').exclude(id__in=booked_room_ids).values_list('id', flat=True))
+        areas = list(Areas.objects.filter(status='available').exclude(id__in=booked_area_ids).values_list('id', flat=True))
+        return set(rooms), set(areas)
+
+    def _index_path(self, index, arrival, departure):
+        booked_room_ids = index.blocked_ids('room', arrival, departure)
+        booked_area_ids = index.blocked_ids('area', arrival, departure)
+        rooms = list(Rooms.objects.filter(status='available').exclude(id__in=booked_room_ids).values_list('id', flat=True))
+        areas = list(Areas.objects.filter(status='available').exclude(id__in=booked_area_ids).values_list('id', flat=True))
+        return set(rooms), set(areas)
+
+    def _run(self, options):
+        today = timezone.localdate()
+        searches = []
+        for _ in range(options['queries']):
+            arrival = today + timedelta(days=random.randint(0, 120))
+            searches.append((arrival, arrival + timedelta(days=random.randint(1, 7))))
+
+        index = AvailabilityIndex()
+        started = time.perf_counter()
+        index.load()
+        load_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        expected = [self._queryset_path(a, d) for a, d in searches]
+        queryset_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        actual = [self._index_path(index, a, d) for a, d in searches]
+        index_ms = (time.perf_counter() - started) * 1000
+
+        mismatches = sum(1 for e, a in zip(expected, actual) if e != a)
+        count = len(searches)
+        self.stdout.write(f"Bookings seeded:        {options['bookings']}")
+        self.stdout.write(f"Index load:             {load_ms:.1f} ms (once per process / after writes elsewhere)")
+        self.stdout.write(f"Queryset path:          {queryset_ms / count:.2f} ms per search")
+        self.stdout.write(f"Index path:             {index_ms / count:.2f} ms per search")
+        self.stdout.write(f"Speedup:                {queryset_ms / max(index_ms, 0.001):.1f}x")
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f"{mismatches} of {count} searches returned different results"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"All {count} searches returned identical results"))
@@ -0,0 +1,66 @@
+"""
+Measure response compression on real API payloads.
+Run with: python manage.py benchmark_compression [--url /master/bookings?page_size=100 ...]
+
+Each URL is fetched as an admin through the full middleware stack, once without
+Accept-Encoding and once per encoding, and the size and compression time are reported.
+"""
+
+import gzip
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from hotel_backend import middleware as compression
+from user_roles.models import CustomUsers
+
+DEFAULT_URLS = [
+    '/property/rooms',
+    '/property/areas',
+    '/booking/bookings?page_size=100',
+    '/master/bookings?page_size=100',
+    '/master/rooms',
+]
+
+
+class Command(BaseCommand):
+    help = 'Report raw, gzip and brotli sizes of API responses on the current database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', action='append', dest='urls')
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        admin = CustomUsers.objects.filter(role='admin').first()
+        if admin is None:
+            raise CommandError('An admin user is needed to fetch the admin routes')
+
+        client = APIClient()
+        client.force_authenticate(admin)
+        encodings = ['gzip'] + (['br'] if compression.brotli else [])
+        if not compression.brotli:
+            self.stdout.write('brotli is not installed; reporting gzip only')
+
+        with override_settings(ALLOWED_HOSTS=['*']):
+            for url in options['urls'] or DEFAULT_URLS:
+                raw = client.get(url)
+                if raw.status_code != 200:
+                    self.stdout.write(f"{url}: HTTP {raw.status_code}, skipped")
+                    continue
+                line = f"{url:<48} {len(raw.content):>9,} B"
+                for encoding in encodings:
+                    body = client.get(url, HTTP_ACCEPT_ENCODING=encoding).content
+                    ms = self._time(raw.content, encoding, options['repeat'])
+                    line += f"   {encoding} {len(body):>8,} B ({len(body) / len(raw.content):4.0%}, {ms:5.2f} ms)"
+                self.stdout.write(line)
+
+    def _time(self, content, encoding, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            if encoding == 'br':
+                compression.brotli.compress(content, quality=compression.BROTLI_QUALITY)
+            else:
+                gzip.compress(content, compresslevel=6, mtime=0)
+        return (time.perf_counter() - started) / repeat * 1000
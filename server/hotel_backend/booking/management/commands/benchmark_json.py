@@ -0,0 +1,134 @@
+"""
+Benchmark the ujson renderer/parser against DRF's stock JSONRenderer/JSONParser.
+Run with: python manage.py benchmark_json --rows 500
+
+Two payloads are timed: a booking list shaped like BookingSerializer output (dates and
+decimals already rendered to strings by the fields) and a report of raw Decimal, date and
+datetime values like the dashboard views return, which goes through the encoder fallbacks.
+No database access is needed.
+"""
+
+import io
+import json
+import time
+from datetime import date, datetime, time as dt_time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from hotel_backend.parsers import UJSONParser
+from hotel_backend.renderers import UJSONRenderer
+from user_roles.service.firebase import sanitize_for_json
+
+
+def _bookings(rows):
+    created = datetime(2025, 1, 1, 8, 30, tzinfo=dt_timezone.utc)
+    bookings = []
+    for i in range(rows):
+        check_in = date(2025, 1, 1) + timedelta(days=i % 300)
+        bookings.append({
+            "id": i + 1,
+            "user": {
+                "id": i % 50 + 1,
+                "first_name": "Juan",
+                "last_name": f"Dela Cruz {i % 50}",
+                "email": f"guest{i % 50}@example.com",
+                "profile_image": "https://res.cloudinary.com/demo/image/upload/v1/profile.jpg",
+            },
+            "room_details": {
+                "id": i % 12 + 1,
+                "room_name": f"Deluxe Room {i % 12}",
+                "room_type": "premium",
+                "bed_type": "queen",
+                "max_guests": 4,
+                "price_per_night": f"₱{3500 + i % 12:,}.00",
+                "discount_percent": 10,
+                "images": [
+                    {"id": n, "room_image": f"https://res.cloudinary.com/demo/image/upload/v1/room_{n}.jpg"}
+                    for n in range(3)
+                ],
+                "amenities": [{"id": n, "description": f"Amenity {n}"} for n in range(5)],
+            },
+            "area_details": None,
+            "check_in_date": check_in.isoformat(),
+            "check_out_date": (check_in + timedelta(days=2)).isoformat(),
+            "status": "confirmed",
+            "total_price": "7000.00",
+            "down_payment": "3500.00",
+            "total_amount": 3500.0,
+            "special_request": "Late check-in, around 10 PM / extra pillows",
+            "created_at": (created + timedelta(hours=i)).isoformat(),
+            "has_review": i % 3 == 0,
+        })
+    return {"data": bookings, "pagination": {"total_pages": 1, "current_page": 1, "total_items": rows}}
+
+
+def _report(rows):
+    start = date(2025, 1, 1)
+    generated = datetime(2025, 1, 1, 8, 30, tzinfo=dt_timezone.utc)
+    return {
+        "generated_at": generated,
+        "days": [
+            {
+                "date": start + timedelta(days=i),
+                "revenue": Decimal("12500.50") + i,
+                "bookings": i % 17,
+                "occupancy_rate": Decimal("0.75"),
+                "first_check_in": dt_time(14, 0),
+            }
+            for i in range(rows)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare the ujson renderer/parser and sanitize_for_json with DRF's JSON classes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500)
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        for label, payload in (('Booking list', _bookings(options['rows'])), ('Raw report', _report(options['rows']))):
+            self._run(label, payload, options['repeat'])
+
+    def _run(self, label, payload, repeat):
+        stock, fast = JSONRenderer(), UJSONRenderer()
+        stock_body = stock.render(payload)
+        fast_body = fast.render(payload)
+        if json.loads(stock_body) != json.loads(fast_body):
+            self.stderr.write(self.style.ERROR(f"{label}: renderers disagree on the payload"))
+            return
+        self.stdout.write(f"{label}: {len(fast_body):,} bytes")
+
+        self._compare('render', lambda: stock.render(payload), lambda: fast.render(payload), repeat)
+        self._compare(
+            'parse',
+            lambda: JSONParser().parse(io.BytesIO(stock_body)),
+            lambda: UJSONParser().parse(io.BytesIO(fast_body)),
+            repeat,
+        )
+        self._compare(
+            'sanitize_for_json',
+            lambda: json.loads(json.dumps(payload, cls=JSONEncoder)),
+            lambda: sanitize_for_json(payload),
+            repeat,
+        )
+
+    def _time(self, func, repeat):
+        func()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - started) / repeat * 1000
+
+    def _compare(self, label, stock, fast, repeat):
+        stock_ms = self._time(stock, repeat)
+        fast_ms = self._time(fast, repeat)
+        self.stdout.write(
+            f"  {label:<18} stock {stock_ms:8.2f} ms   ujson {fast_ms:8.2f} ms   "
+            f"{stock_ms / fast_ms:5.1f}x"
+        )
@@ -0,0 +1,23 @@
+"""
+Rebuild the RoomNight/AreaSlot ledger from the bookings table.
+Run with: python manage.py rebuild_ledger
+"""
+
+import time
+from django.core.management.base import BaseCommand
+from booking.service.ledger import rebuild_ledger
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the nightly room / venue slot ledger from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        nights, slots = rebuild_ledger(batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Ledger rebuilt: {nights} room nights, {slots} area slots in {elapsed:.1f}s"
+        ))
@@ -0,0 +1,159 @@
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+import django.db.models.functions.comparison
+import django.db.models.lookups
+from django.db import migrations, models
+
+# Range column backing Bookings.objects.overlapping() plus the no-overlap exclusion constraints
+# of Bookings.Meta.constraints, which make overlapping active bookings of the same room/area
+# impossible at the database level. PostgreSQL only; other backends keep using plain date
+# comparisons and just record the constraints in the state.
+#
+# stay_range follows booking.service.availability._stay_end: room stays hold the nights before
+# check-out (at least one), venue bookings every day through their check-out day. A venue
+# booking without a start/end time holds the area from the start/until the end of that day.
+
+ACTIVE_STATUSES = "('confirmed', 'reserved', 'checked_in')"
+
+FORWARD_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gist;",
+    """
+    ALTER TABLE bookings ADD COLUMN IF NOT EXISTS stay_range daterange
+        GENERATED ALWAYS AS (
+            CASE WHEN is_venue_booking
+                THEN daterange(check_in_date, GREATEST(check_out_date, check_in_date) + 1, '[)')
+                ELSE daterange(check_in_date, GREATEST(check_out_date, check_in_date + 1), '[)')
+            END
+        ) STORED;
+    """,
+    "CREATE INDEX IF NOT EXISTS bookings_stay_range_gist ON bookings USING gist (stay_range);",
+]
+
+REVERSE_SQL = [
+    "DROP INDEX IF EXISTS bookings_stay_range_gist;",
+    "ALTER TABLE bookings DROP COLUMN IF EXISTS stay_range;",
+]
+
+CONFLICTS_SQL = f"""
+    WITH rooms AS (
+        SELECT id, room_id, daterange(check_in_date, GREATEST(check_out_date, check_in_date + 1), '[)') AS span
+        FROM bookings
+        WHERE NOT is_venue_booking AND room_id IS NOT NULL AND status IN {ACTIVE_STATUSES}
+    ), venues AS (
+        SELECT id, area_id, tsrange(
+            check_in_date + COALESCE(start_time, '00:00'), check_out_date + COALESCE(end_time, '24:00'), '[)'
+        ) AS span
+        FROM bookings
+        WHERE is_venue_booking AND area_id IS NOT NULL AND status IN {ACTIVE_STATUSES}
+            AND check_in_date + COALESCE(start_time, '00:00') < check_out_date + COALESCE(end_time, '24:00')
+    )
+    SELECT a.id, b.id FROM rooms a JOIN rooms b ON a.id < b.id AND a.room_id = b.room_id AND a.span && b.span
+    UNION ALL
+    SELECT a.id, b.id FROM venues a JOIN venues b ON a.id < b.id AND a.area_id = b.area_id AND a.span && b.span
+    LIMIT 20;
+"""
+
+
+def add_stay_range(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for sql in FORWARD_SQL:
+            cursor.execute(sql)
+        cursor.execute(CONFLICTS_SQL)
+        conflicts = cursor.fetchall()
+    if conflicts:
+        pairs = ', '.join(f"{a}/{b}" for a, b in conflicts)
+        raise RuntimeError(
+            f"Cannot add booking exclusion constraints, these active bookings overlap: {pairs}. "
+            "Cancel or move one booking of each pair and run the migration again."
+        )
+
+
+def drop_stay_range(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for sql in REVERSE_SQL:
+            cursor.execute(sql)
+
+
+class AddPostgresConstraint(migrations.AddConstraint):
+    """AddConstraint that only touches the database on PostgreSQL."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+def _plus(lhs, rhs, output_field):
+    return models.Func(lhs, rhs, template='(%(expressions)s)', arg_joiner=' + ', output_field=output_field)
+
+
+def _at(day, time_field, default):
+    return _plus(
+        models.F(day),
+        django.db.models.functions.comparison.Coalesce(
+            time_field, django.db.models.functions.comparison.Cast(models.Value(default), models.TimeField())
+        ),
+        models.DateTimeField(),
+    )
+
+
+VENUE_START = _at('check_in_date', 'start_time', '00:00')
+VENUE_END = _at('check_out_date', 'end_time', '24:00')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_stay_range, drop_stay_range),
+        AddPostgresConstraint(
+            model_name='bookings',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                condition=models.Q(('is_venue_booking', False), ('room__isnull', False), ('status__in', ['confirmed', 'reserved', 'checked_in'])),
+                expressions=[
+                    ('room', '='),
+                    (models.Func(
+                        models.F('check_in_date'),
+                        django.db.models.functions.comparison.Greatest(
+                            'check_out_date', _plus(models.F('check_in_date'), models.Value(1), models.DateField())
+                        ),
+                        models.Value('[)'),
+                        function='DATERANGE',
+                        output_field=django.contrib.postgres.fields.ranges.DateRangeField(),
+                    ), '&&'),
+                ],
+                name='bookings_room_no_overlap',
+            ),
+        ),
+        AddPostgresConstraint(
+            model_name='bookings',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                condition=models.Q(('area__isnull', False), ('is_venue_booking', True), ('status__in', ['confirmed', 'reserved', 'checked_in'])),
+                expressions=[
+                    ('area', '='),
+                    (models.Case(
+                        models.When(
+                            django.db.models.lookups.GreaterThan(VENUE_END, VENUE_START),
+                            then=models.Func(
+                                VENUE_START, VENUE_END, models.Value('[)'),
+                                function='TSRANGE',
+                                output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField(),
+                            ),
+                        ),
+                        output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField(),
+                    ), '&&'),
+                ],
+                name='bookings_area_no_overlap',
+            ),
+        ),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 5.2.2 on 2026-10-16 23:12
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Frozen copy of booking.service.ledger.rebuild_ledger as of this migration, so later changes
+# to the service cannot change what the migration writes
+NON_BLOCKING_STATUSES = ['checked_out', 'cancelled', 'rejected', 'missed_reservation']
+BATCH_SIZE = 5000
+
+
+def _days(booking):
+    """Rooms are held the nights before check-out (at least one), venues through the check-out day."""
+    check_in, check_out = booking.check_in_date, booking.check_out_date
+    if booking.is_venue_booking:
+        end = max(check_in, check_out) + timedelta(days=1)
+    else:
+        end = max(check_out, check_in + timedelta(days=1))
+    day = check_in
+    while day < end:
+        yield day
+        day += timedelta(days=1)
+
+
+def backfill_ledger(apps, schema_editor):
+    Bookings = apps.get_model('booking', 'Bookings')
+    RoomNight = apps.get_model('booking', 'RoomNight')
+    AreaSlot = apps.get_model('booking', 'AreaSlot')
+
+    nights, slots = [], []
+    bookings = Bookings.objects.exclude(status__in=NON_BLOCKING_STATUSES).filter(
+        check_in_date__isnull=False, check_out_date__isnull=False,
+    )
+    for booking in bookings.iterator(chunk_size=BATCH_SIZE):
+        if booking.is_venue_booking and booking.area_id:
+            last_day = max(booking.check_in_date, booking.check_out_date)
+            slots.extend(
+                AreaSlot(
+                    area_id=booking.area_id, booking_id=booking.pk, date=day, status=booking.status,
+                    start_time=booking.start_time if day == booking.check_in_date else None,
+                    end_time=booking.end_time if day == last_day else None,
+                )
+                for day in _days(booking)
+            )
+        elif not booking.is_venue_booking and booking.room_id:
+            nights.extend(
+                RoomNight(room_id=booking.room_id, booking_id=booking.pk, night=day, status=booking.status)
+                for day in _days(booking)
+            )
+        if len(nights) >= BATCH_SIZE:
+            RoomNight.objects.bulk_create(nights, batch_size=BATCH_SIZE)
+            nights = []
+        if len(slots) >= BATCH_SIZE:
+            AreaSlot.objects.bulk_create(slots, batch_size=BATCH_SIZE)
+            slots = []
+    RoomNight.objects.bulk_create(nights, batch_size=BATCH_SIZE)
+    AreaSlot.objects.bulk_create(slots, batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0003_booking_ranges'),
+        ('property', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AreaSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('start_time', models.TimeField(blank=True, null=True)),
+                ('end_time', models.TimeField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('reserved', 'Reserved'), ('confirmed', 'Confirmed'), ('checked_in', 'Checked In'), ('checked_out', 'Checked Out'), ('cancelled', 'Cancelled'), ('rejected', 'Rejected'), ('missed_reservation', 'Missed Reservation')], max_length=20)),
+                ('area', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slots', to='property.areas')),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='area_slots', to='booking.bookings')),
+            ],
+            options={
+                'db_table': 'area_slots',
+                'indexes': [models.Index(fields=['date', 'area'], name='area_slots_date_area_idx'), models.Index(fields=['area', 'date'], name='area_slots_area_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('booking', 'date'), name='area_slots_booking_date_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RoomNight',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('night', models.DateField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('reserved', 'Reserved'), ('confirmed', 'Confirmed'), ('checked_in', 'Checked In'), ('checked_out', 'Checked Out'), ('cancelled', 'Cancelled'), ('rejected', 'Rejected'), ('missed_reservation', 'Missed Reservation')], max_length=20)),
+                ('booking', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='room_nights', to='booking.bookings')),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='nights', to='property.rooms')),
+            ],
+            options={
+                'db_table': 'room_nights',
+                'indexes': [models.Index(fields=['night', 'room'], name='room_nights_night_room_idx'), models.Index(fields=['room', 'night'], name='room_nights_room_night_idx')],
+                'constraints': [models.UniqueConstraint(fields=('booking', 'night'), name='room_nights_booking_night_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_ledger, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.2 on 2026-10-16 23:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0004_ledger'),
+        ('property', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['created_at', 'id'], name='bookings_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='bookings_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bookings',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='bookings_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviews',
+            index=models.Index(fields=['room', 'created_at', 'id'], name='reviews_room_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reviews',
+            index=models.Index(fields=['area', 'created_at', 'id'], name='reviews_area_created_idx'),
+        ),
+    ]
@@ -1,4 +1,12 @@
-from django.db import models
+import copy
+from datetime import datetime
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateRangeField, DateTimeRangeField, RangeOperators
+from django.db import models, connections, router, transaction
+from django.db.models import Case, F, Func, Q, Value, When
+from django.db.models.expressions import Col, Expression
+from django.db.models.functions import Cast, Coalesce, Greatest
+from django.db.models.lookups import GreaterThan
 from property.models import Rooms, Areas
 from user_roles.models import CustomUsers
 from cloudinary.models import CloudinaryField
@@ -7,18 +15,172 @@ from property.models import Rooms, Areas
 
 User = get_user_model()
 
+class GeneratedColumn(Expression):
+    """
+    Reference to a database-generated column that is not declared on the model
+    (see booking/migrations/0003_booking_ranges.py). Resolves to a plain column of the
+    queryset's base table so it keeps working inside subqueries.
+    """
+    def __init__(self, column, output_field):
+        super().__init__(output_field=output_field)
+        self.column = column
+
+    def resolve_expression(self, query=None, allow_joins=True, reuse=None, summarize=False, for_save=False):
+        target = self.output_field.clone()
+        target.set_attributes_from_name(self.column)
+        return Col(query.get_initial_alias(), target)
+
+BOOKING_STATUS_CHOICES = [
+    ('pending', 'Pending'),
+    ('reserved', 'Reserved'),
+    ('confirmed', 'Confirmed'),
+    ('checked_in', 'Checked In'),
+    ('checked_out', 'Checked Out'),
+    ('cancelled', 'Cancelled'),
+    ('rejected', 'Rejected'),
+    ('missed_reservation', 'Missed Reservation'),
+]
+
+# Statuses covered by the no-overlap exclusion constraints
+ACTIVE_STATUSES = ['confirmed', 'reserved', 'checked_in']
+
+# Statuses that hold a room/area against new bookings and holds; every other status frees it
+INVENTORY_STATUSES = ['pending', *ACTIVE_STATUSES]
+NON_BLOCKING_STATUSES = [value for value, _ in BOOKING_STATUS_CHOICES if value not in INVENTORY_STATUSES]
+
+
+def _plus(lhs, rhs, output_field):
+    # date + integer / date + time, which Django cannot type on its own
+    return Func(lhs, rhs, template='(%(expressions)s)', arg_joiner=' + ', output_field=output_field)
+
+
+def _at(day, time_field, default):
+    return _plus(F(day), Coalesce(time_field, Cast(Value(default), models.TimeField())), models.DateTimeField())
+
+
+# Nights a room stay holds: [check_in, check_out), at least one night
+ROOM_STAY_RANGE = Func(
+    F('check_in_date'),
+    Greatest('check_out_date', _plus(F('check_in_date'), Value(1), models.DateField())),
+    Value('[)'),
+    function='DATERANGE',
+    output_field=DateRangeField(),
+)
+
+# Time a venue booking holds; a missing start/end time means the start/end of that day
+VENUE_START = _at('check_in_date', 'start_time', '00:00')
+VENUE_END = _at('check_out_date', 'end_time', '24:00')
+VENUE_RANGE = Case(
+    When(
+        GreaterThan(VENUE_END, VENUE_START),
+        then=Func(VENUE_START, VENUE_END, Value('[)'), function='TSRANGE', output_field=DateTimeRangeField()),
+    ),
+    output_field=DateTimeRangeField(),
+)
+
+
+class BookingsQuerySet(models.QuerySet):
+    def overlapping(self, start, end):
+        """
+        Bookings whose stay overlaps the half-open range [start, end), by the rule of
+        service.availability._stay_end: room stays hold the nights before check-out (at least one),
+        venue bookings every day through their check-out day. On PostgreSQL this filters on the
+        GiST-indexed `stay_range` column; other backends fall back to plain date comparisons.
+        """
+        start = start.date() if isinstance(start, datetime) else start
+        end = end.date() if isinstance(end, datetime) else end
+
+        if connections[self.db].vendor == 'postgresql':
+            from django.contrib.postgres.fields import DateRangeField
+            from django.db.backends.postgresql.psycopg_any import DateRange
+
+            return self.alias(
+                _stay_range=GeneratedColumn('stay_range', DateRangeField())
+            ).filter(_stay_range__overlap=DateRange(start, end, '[)'))
+
+        return self.filter(
+            Q(check_in_date__lt=end)
+            & (Q(check_out_date__gt=start) | Q(check_in_date__gte=start) | Q(is_venue_booking=True, check_out_date=start))
+        )
+
+    def update(self, **kwargs):
+        """
+        Bulk updates skip Bookings.save() and its signals, so refresh the ETags of the affected
+        rows here. When they touch SNAPSHOT_FIELDS, send bookings_updated with the rows as they
+        were and as they are; when they touch fields that decide what a booking holds, also resync
+        the ledger and invalidate availability.
+        """
+        from .service import availability, availability_cache
+        from .service.conditional import touch
+        from .service.ledger import sync_booking_ledger
+        from .signals import bookings_updated
+
+        def field_names(names):
+            return set(names) | {name[:-3] for name in names if name.endswith('_id')}
+
+        if not field_names(self.model.SNAPSHOT_FIELDS).intersection(kwargs):
+            with transaction.atomic(using=self.db):
+                touched = list(self.values_list('id', flat=True))
+                rows = super().update(**kwargs)
+                touch(*(f"booking:{pk}" for pk in touched))
+            return rows
+
+        with transaction.atomic(using=self.db):
+            before = list(self.only(*self.model.SNAPSHOT_FIELDS))
+            rows = super().update(**kwargs)
+            after = self._updated_rows(before, kwargs)
+            scopes = [f"booking:{booking.id}" for booking in before]
+
+            if field_names(self.model.LEDGER_FIELDS).intersection(kwargs):
+                ranges, properties = [], set()
+                for booking in before:
+                    ranges.append((booking.check_in_date, booking.check_out_date, booking.is_venue_booking))
+                    properties.add((booking.room_id, booking.area_id))
+                for booking in after:
+                    sync_booking_ledger(booking)
+                    ranges.append((booking.check_in_date, booking.check_out_date, booking.is_venue_booking))
+                    properties.add((booking.room_id, booking.area_id))
+                availability_cache.on_booking_changed(ranges)
+                keys = {key for room_id, area_id in properties for key in (('room', room_id), ('area', area_id))}
+                transaction.on_commit(lambda: availability.availability_index.invalidate(keys), using=self.db)
+                for room_id, area_id in properties:
+                    scopes += [f"room:{room_id}" if room_id else None, f"area:{area_id}" if area_id else None]
+
+            bookings_updated.send(sender=self.model, before=before, after=after, using=self.db)
+            touch(*scopes)
+        return rows
+
+    def _updated_rows(self, before, kwargs):
+        """
+        `before` as update(**kwargs) left it. Plain values are applied in Python; expressions the
+        database computes (F(), Case() from bulk_update) mean reading the rows back.
+        """
+        values = {}
+        for name, value in kwargs.items():
+            if hasattr(value, 'resolve_expression'):
+                return list(
+                    self.model.objects.using(self.db).filter(id__in=[booking.id for booking in before])
+                    .only(*self.model.SNAPSHOT_FIELDS)
+                )
+            field = self.model._meta.get_field(name)
+            if field.is_relation:
+                value = value.pk if isinstance(value, models.Model) else value
+            else:
+                value = field.to_python(value)
+            values[field.attname] = value
+
+        after = []
+        for booking in before:
+            booking = copy.copy(booking)
+            for attname, value in values.items():
+                setattr(booking, attname, value)
+            after.append(booking)
+        return after
+
 # Create your models here.
 class Bookings(models.Model):
-    BOOKING_STATUS_CHOICES = [
-        ('pending', 'Pending'),
-        ('reserved', 'Reserved'),
-        ('confirmed', 'Confirmed'),
-        ('checked_in', 'Checked In'),
-        ('checked_out', 'Checked Out'),
-        ('cancelled', 'Cancelled'),
-        ('rejected', 'Rejected'),
-        ('missed_reservation', 'Missed Reservation'),
-    ]
+    BOOKING_STATUS_CHOICES = BOOKING_STATUS_CHOICES
+    ACTIVE_STATUSES = ACTIVE_STATUSES
     PAYMENT_METHOD_CHOICES = [
         ('physical', 'Physical Payment'),
         ('gcash', 'GCash'),
@@ -58,6 +220,32 @@ class Bookings(models.Model):
     paymongo_source_id = models.CharField(max_length=255, null=True, blank=True, help_text='PayMongo source ID')
     paymongo_payment_id = models.CharField(max_length=255, null=True, blank=True, help_text='PayMongo payment ID')
 
+    objects = BookingsQuerySet.as_manager()
+
+    # Fields that decide which nights/slots a booking holds in the RoomNight/AreaSlot ledger
+    LEDGER_FIELDS = ('status', 'room_id', 'area_id', 'is_venue_booking', 'check_in_date', 'check_out_date', 'start_time', 'end_time')
+    # Fields of the before/after rows that bulk updates announce through signals.bookings_updated
+    SNAPSHOT_FIELDS = ('id', *LEDGER_FIELDS, 'created_at', 'updated_at', 'cancellation_date')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._ledger_state = instance._get_ledger_state()
+        return instance
+
+    def _get_ledger_state(self):
+        return tuple(getattr(self, name, None) for name in self.LEDGER_FIELDS)
+
+    def save(self, *args, **kwargs):
+        from .service.ledger import sync_booking_ledger
+
+        with transaction.atomic(using=kwargs.get('using') or router.db_for_write(type(self), instance=self)):
+            super().save(*args, **kwargs)
+            state = self._get_ledger_state()
+            if state != getattr(self, '_ledger_state', None):
+                sync_booking_ledger(self)
+                self._ledger_state = state
+
     def apply_pwd_senior_discount(self):
         from user_roles.models import PWD_SENIOR_DISCOUNT_PERCENT
         if not self.is_discounted and self.total_price:
@@ -67,6 +255,28 @@ class Bookings(models.Model):
     
     class Meta:
         db_table = 'bookings'
+        indexes = [
+            # Keyset pagination on (created_at, id), see service/pagination.py
+            models.Index(fields=['created_at', 'id'], name='bookings_created_id_idx'),
+            models.Index(fields=['user', 'created_at', 'id'], name='bookings_user_created_idx'),
+            models.Index(fields=['status', 'created_at', 'id'], name='bookings_status_created_idx'),
+            # Daily check-in/check-out series read while the rollup is stale, see MonthStats.daily_by_date
+            models.Index(fields=['check_in_date', 'status'], name='bookings_check_in_status_idx'),
+            models.Index(fields=['check_out_date', 'status'], name='bookings_check_out_status_idx'),
+        ]
+        # Created on PostgreSQL only, see migrations/0003_booking_ranges.py
+        constraints = [
+            ExclusionConstraint(
+                name='bookings_room_no_overlap',
+                expressions=[('room', RangeOperators.EQUAL), (ROOM_STAY_RANGE, RangeOperators.OVERLAPS)],
+                condition=Q(is_venue_booking=False, room__isnull=False, status__in=ACTIVE_STATUSES),
+            ),
+            ExclusionConstraint(
+                name='bookings_area_no_overlap',
+                expressions=[('area', RangeOperators.EQUAL), (VENUE_RANGE, RangeOperators.OVERLAPS)],
+                condition=Q(is_venue_booking=True, area__isnull=False, status__in=ACTIVE_STATUSES),
+            ),
+        ]
     
     def __str__(self):
         if self.is_venue_booking and self.area:
@@ -83,7 +293,7 @@ class Bookings(models.Model):
         return self.status in ['pending', 'confirmed', 'reserved']
     
     def is_active(self):
-        return self.status in ['confirmed', 'reserved', 'checked_in']
+        return self.status in self.ACTIVE_STATUSES
     
     def get_duration_days(self):
         if self.check_in_date and self.check_out_date:
@@ -137,3 +347,46 @@ class Reviews(models.Model):
 
     class Meta:
         db_table = 'reviews'
+        indexes = [
+            models.Index(fields=['room', 'created_at', 'id'], name='reviews_room_created_idx'),
+            models.Index(fields=['area', 'created_at', 'id'], name='reviews_area_created_idx'),
+        ]
+
+class RoomNight(models.Model):
+    """One row per room per night held by a booking; maintained by Bookings.save() (see service/ledger.py)."""
+    room = models.ForeignKey(Rooms, on_delete=models.CASCADE, related_name='nights')
+    booking = models.ForeignKey(Bookings, on_delete=models.CASCADE, related_name='room_nights')
+    night = models.DateField()
+    status = models.CharField(max_length=20, choices=Bookings.BOOKING_STATUS_CHOICES)
+
+    class Meta:
+        db_table = 'room_nights'
+        constraints = [
+            models.UniqueConstraint(fields=['booking', 'night'], name='room_nights_booking_night_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['night', 'room'], name='room_nights_night_room_idx'),
+            models.Index(fields=['room', 'night'], name='room_nights_room_night_idx'),
+        ]
+
+class AreaSlot(models.Model):
+    """
+    One row per area per day held by a venue booking, with the window booked on that day.
+    A null start/end time means the booking holds the area from the start/until the end of the day.
+    """
+    area = models.ForeignKey(Areas, on_delete=models.CASCADE, related_name='slots')
+    booking = models.ForeignKey(Bookings, on_delete=models.CASCADE, related_name='area_slots')
+    date = models.DateField()
+    start_time = models.TimeField(null=True, blank=True)
+    end_time = models.TimeField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=Bookings.BOOKING_STATUS_CHOICES)
+
+    class Meta:
+        db_table = 'area_slots'
+        constraints = [
+            models.UniqueConstraint(fields=['booking', 'date'], name='area_slots_booking_date_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['date', 'area'], name='area_slots_date_area_idx'),
+            models.Index(fields=['area', 'date'], name='area_slots_area_date_idx'),
+        ]
@@ -3,24 +3,29 @@ from .models import Bookings, Transactions, Reviews
 from user_roles.models import CustomUsers
 from user_roles.serializers import CustomUserSerializer
 from property.models import Rooms, Areas
-from property.serializers import AreaSerializer, RoomSerializer
+from hotel_backend.sparse_fields import SparseFieldsMixin, selects
+from property.serializers import AreaCardSerializer, RoomCardSerializer
 from .validations.booking import validate_booking_request
+from .service import holds as holds_service
+from .service.commit import BookingConflict, commit_booking
+from .service.pricing import PWD_SENIOR_DISCOUNT_PERCENT, room_discount_percent
 from django.utils import timezone
-from datetime import datetime
-from django.db.models import Sum
+from datetime import datetime, time
+from django.db import IntegrityError
+from django.db.models import Exists, OuterRef, Prefetch, Subquery, Sum
 import cloudinary.uploader
 import cloudinary
 import uuid
 
-PWD_SENIOR_DISCOUNT_PERCENT = 20
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user = CustomUserSerializer()
-    room_details = RoomSerializer(source='room', read_only=True)
-    area_details = AreaSerializer(source='area', read_only=True)
+    room_details = RoomCardSerializer(source='room', read_only=True)
+    area_details = AreaCardSerializer(source='area', read_only=True)
     payment_proof = serializers.SerializerMethodField()
     payment_method = serializers.CharField(source='get_payment_method_display')
     total_amount = serializers.SerializerMethodField()
+    has_review = serializers.SerializerMethodField()
     
     class Meta:
         model = Bookings
@@ -51,7 +56,46 @@ class BookingSerializer(serializers.ModelSerializer):
             'total_amount',
             'paymongo_source_id',
             'paymongo_payment_id',
+            'has_review',
         ]
+    expandable_fields = ('user', 'room_details', 'area_details')
+    # Added by to_representation from the room/area and the guest's discount eligibility
+    PRICING_FIELDS = ('original_price', 'discount_percent', 'discounted_price')
+    extra_fields = PRICING_FIELDS
+    
+    @staticmethod
+    def setup_eager_loading(queryset, full_property=False, fields=None):
+        """
+        Join the guest, annotate the paid total and review flag, and prefetch the room/area cards
+        so a page of bookings costs a fixed number of queries however long it is.
+        Pass full_property when the view also renders booking.room/area with the full serializers,
+        and a sparse `fields` selection to leave out whatever it does not need.
+        """
+        from property.serializers import AreaSerializer, RoomSerializer
+
+        pricing = selects(fields, *BookingSerializer.PRICING_FIELDS, 'total_price', 'down_payment')
+        if selects(fields, 'user') or pricing:
+            queryset = queryset.select_related('user')
+        if selects(fields, 'total_amount'):
+            paid = Transactions.objects.filter(
+                booking=OuterRef('pk'), status='completed'
+            ).values('booking').annotate(total=Sum('amount')).values('total')
+            queryset = queryset.annotate(paid_total=Subquery(paid))
+        if selects(fields, 'has_review'):
+            queryset = queryset.annotate(_has_review=Exists(Reviews.objects.filter(booking=OuterRef('pk'))))
+
+        for relation, model, full, card in (
+            ('room', Rooms, RoomSerializer, RoomCardSerializer),
+            ('area', Areas, AreaSerializer, AreaCardSerializer),
+        ):
+            if full_property or selects(fields, f'{relation}_details'):
+                serializer = full if full_property else card
+                queryset = queryset.prefetch_related(
+                    Prefetch(relation, queryset=serializer.setup_eager_loading(model.objects.all()))
+                )
+            elif pricing:
+                queryset = queryset.select_related(relation)
+        return queryset
         
     def get_payment_proof(self, obj):
         if obj.payment_proof:
@@ -61,11 +105,18 @@ class BookingSerializer(serializers.ModelSerializer):
         return None
     
     def get_total_amount(self, obj):
+        if hasattr(obj, 'paid_total'):
+            return obj.paid_total or 0.00
         return Transactions.objects.filter(
             booking=obj,
             status='completed'
         ).aggregate(Sum('amount'))['amount__sum'] or 0.00
     
+    def get_has_review(self, obj):
+        if hasattr(obj, '_has_review'):
+            return obj._has_review
+        return obj.reviews.exists()
+    
     def get_user(self, obj):
         if obj.user:
             return {
@@ -87,6 +138,8 @@ class BookingSerializer(serializers.ModelSerializer):
     
     def to_representation(self, instance):
         representation = super().to_representation(instance)
+        if not self.wants(*self.PRICING_FIELDS, 'total_price', 'down_payment'):
+            return self.sparse(representation)
         user = instance.user if hasattr(instance, 'user') else None
         
         nights = (instance.check_out_date - instance.check_in_date).days if instance.check_in_date and instance.check_out_date else 1
@@ -172,7 +225,7 @@ class BookingSerializer(serializers.ModelSerializer):
             representation['original_price'] = None
             representation['discount_percent'] = 0
             representation['discounted_price'] = None        
-        return representation
+        return self.sparse(representation)
 
 class BookingRequestSerializer(serializers.Serializer):
     firstName = serializers.CharField(max_length=100)
@@ -186,6 +239,9 @@ class BookingRequestSerializer(serializers.Serializer):
     isVenueBooking = serializers.BooleanField(required=False, default=False)
     totalPrice = serializers.DecimalField(required=False, max_digits=10, decimal_places=2)
     arrivalTime = serializers.CharField(required=False, allow_blank=True)
+    startTime = serializers.CharField(required=False, allow_blank=True)
+    endTime = serializers.CharField(required=False, allow_blank=True)
+    holdToken = serializers.CharField(required=False, allow_blank=True, write_only=True)
     numberOfGuests = serializers.IntegerField(required=False, default=1)
     paymentMethod = serializers.ChoiceField(choices=Bookings.PAYMENT_METHOD_CHOICES, default='physical')
     paymentProof = serializers.FileField(required=False, allow_null=True, write_only=True)
@@ -203,6 +259,20 @@ class BookingRequestSerializer(serializers.Serializer):
             raise serializers.ValidationError(errors)
         
         validation_errors = validate_booking_request(data, room)
+        
+        # Rooms/areas held by someone else in the checkout flow are off limits until the hold ends
+        kind = 'area' if data.get('isVenueBooking', False) else 'room'
+        request = self.context.get('request')
+        user_id = request.user.id if request and request.user.is_authenticated else None
+        if kind not in validation_errors and 'time' not in validation_errors and data.get('roomId') and data.get('checkIn') and data.get('checkOut'):
+            held = holds_service.held_ids(
+                kind, [data.get('roomId')], data.get('checkIn'), data.get('checkOut'),
+                user_id=user_id, token=data.get('holdToken'), as_booking=True,
+                start_time=data.get('startTime'), end_time=data.get('endTime')
+            )
+            if held:
+                validation_errors[kind] = f"This {'venue' if kind == 'area' else 'room'} is on hold for another guest. Please try again in a few minutes."
+        
         if validation_errors:
             raise serializers.ValidationError(validation_errors)
         
@@ -290,15 +360,15 @@ class BookingRequestSerializer(serializers.Serializer):
                 start_time = None
                 end_time = None
                 if 'startTime' in validated_data and validated_data['startTime']:
-                    start_time = datetime.strptime(validated_data['startTime'], "%H:%M").time()
+                    start_time = time.fromisoformat(validated_data['startTime'])
                 if 'endTime' in validated_data and validated_data['endTime']:
-                    end_time = datetime.strptime(validated_data['endTime'], "%H:%M").time()
+                    end_time = time.fromisoformat(validated_data['endTime'])
                 
                 original_price = float(validated_data.get('totalPrice', 0))
 
                 total_price = original_price
 
-                booking = Bookings.objects.create(
+                booking = commit_booking(
                     user=user,
                     area=area,
                     room=None,
@@ -322,7 +392,11 @@ class BookingRequestSerializer(serializers.Serializer):
                 if user.is_verified != 'verified':
                     user.last_booking_date = timezone.now().date()
                     user.save()
+                if validated_data.get('holdToken'):
+                    holds_service.release_hold(validated_data['holdToken'])
                 return booking
+            except (IntegrityError, BookingConflict):
+                raise serializers.ValidationError({"area": "This venue is already booked for the selected time"})
             except Exception as e:
                 raise serializers.ValidationError(str(e))
         else:
@@ -331,38 +405,13 @@ class BookingRequestSerializer(serializers.Serializer):
                 
                 price_per_night = float(room.room_price)
                 
-                # Build list of all applicable discounts
-                available_discounts = []
-                
-                # 1. Admin discount (from room.discount_percent)
-                admin_discount = int(room.discount_percent or 0)
-                if admin_discount > 0:
-                    available_discounts.append(admin_discount)
-                
-                # 2. Senior/PWD discount (20%)
-                if discount_percent > 0:  # discount_percent is set earlier for senior/pwd users
-                    available_discounts.append(discount_percent)
-                
-                # 3. Long-stay discount
-                long_stay_discount = 0
-                if nights >= 7:
-                    long_stay_discount = 10
-                elif nights >= 3:
-                    long_stay_discount = 5
-                
-                if long_stay_discount > 0:
-                    available_discounts.append(long_stay_discount)
-                
-                # Select the best (highest) discount
-                if available_discounts:
-                    discount_percent = max(available_discounts)
-                else:
-                    discount_percent = 0
+                # Best of admin, senior/PWD and long-stay discounts
+                discount_percent = room_discount_percent(room, user, nights)
                 
                 discounted_price = price_per_night * (1 - discount_percent / 100)
                 total_price = discounted_price * nights
                 
-                booking = Bookings.objects.create(
+                booking = commit_booking(
                     user=user,
                     room=room,
                     area=None,
@@ -383,9 +432,13 @@ class BookingRequestSerializer(serializers.Serializer):
                 if user.is_verified != 'verified':
                     user.last_booking_date = timezone.now().date()
                     user.save()
+                if validated_data.get('holdToken'):
+                    holds_service.release_hold(validated_data['holdToken'])
                 return booking
             except Rooms.DoesNotExist:
                 raise serializers.ValidationError("Room not found")
+            except (IntegrityError, BookingConflict):
+                raise serializers.ValidationError({"room": "This room is not available for the selected dates"})
             except Exception as e:
                 raise serializers.ValidationError(str(e))
 
@@ -407,6 +460,11 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = ['id', 'rating', 'user_id', 'booking', 'review_text', 'created_at', 'room_id', 'area_id', 'user_profile_image', 'formatted_date', 'user_name', 'booking_details']
         read_only_fields = ['user_id', 'room_id', 'area_id', 'booking']
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Join the reviewer and the booked room/area read by booking_details."""
+        return queryset.select_related('user', 'booking__room', 'booking__area')
+    
     def get_user_name(self, obj):
         if obj.user:
             return f"{obj.user.first_name} {obj.user.last_name}"
@@ -0,0 +1,306 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from booking.models import NON_BLOCKING_STATUSES
+
+logger = logging.getLogger(__name__)
+
+VERSION_CACHE_KEY = 'availability:version'
+CHANGE_CACHE_KEY = 'availability:change:{}'
+
+# How long a write's change entry is kept, and how many of them a process replays before it
+# falls back to reloading everything
+CHANGE_TIMEOUT = 3600
+MAX_REPLAY = 500
+
+# How far back the index keeps bookings; searches that start earlier go to the database
+HISTORY_DAYS = 1
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _stay_end(check_in, check_out, is_venue=False):
+    """
+    Exclusive end date of what a booking holds. Rooms are held for the nights before check-out
+    (at least one); venues are held on every day through the check-out day, when their end time falls.
+    """
+    if check_in is None or check_out is None:
+        return check_out
+    if is_venue:
+        return max(check_in, check_out) + timedelta(days=1)
+    if check_out <= check_in:
+        return check_in + timedelta(days=1)
+    return check_out
+
+
+def _resource_key(booking):
+    if booking.is_venue_booking:
+        return ('area', booking.area_id) if booking.area_id else None
+    return ('room', booking.room_id) if booking.room_id else None
+
+
+class _ResourceIntervals:
+    """Bookings of a single room/area sorted by check-in, with a running max of check-outs."""
+
+    __slots__ = ('bookings', 'starts', 'max_ends')
+
+    def __init__(self):
+        self.bookings = {}
+        self.starts = []
+        self.max_ends = []
+
+    def _rebuild(self):
+        intervals = sorted(self.bookings.values())
+        self.starts = [start for start, _ in intervals]
+        self.max_ends = []
+        running = None
+        for _, end in intervals:
+            running = end if running is None or end > running else running
+            self.max_ends.append(running)
+
+    def add(self, booking_id, start, end):
+        self.bookings[booking_id] = (start, end)
+        self._rebuild()
+
+    def remove(self, booking_id):
+        if self.bookings.pop(booking_id, None) is not None:
+            self._rebuild()
+
+    def overlaps(self, arrival, departure):
+        # Intervals starting before departure form a prefix; one of them must end after arrival
+        idx = bisect_left(self.starts, departure)
+        return idx > 0 and self.max_ends[idx - 1] > arrival
+
+
+class AvailabilityIndex:
+    """
+    In-memory interval index of blocking bookings per room and per area.
+
+    The index is loaded once from the database and then kept current from booking writes (see
+    booking.signals). Every write bumps a version counter in the shared cache and files the
+    rooms/areas it touched under the new version, so other processes reload just those
+    properties when the version moves, and only reload everything when they fall too far behind
+    or a change entry has expired.
+
+    This needs a cache every process shares (Redis in production). With a per-process cache such
+    as LocMemCache, workers never see each other's writes and answer from stale indexes, so run
+    a single process or point CACHES at Redis (`manage.py check --deploy` warns about it).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._resources = {}
+        self._booking_keys = {}
+        self._floor = None
+        self._version = None
+        self._loaded = False
+
+    def _shared_version(self):
+        try:
+            version = cache.get(VERSION_CACHE_KEY)
+            if version is None:
+                # A fresh counter starts from a value no process can have recorded before a cache flush
+                cache.add(VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+                version = cache.get(VERSION_CACHE_KEY)
+            return version
+        except Exception:
+            return None
+
+    def _publish(self, keys):
+        """Bump the shared version and file the touched keys under it; returns the new version."""
+        try:
+            try:
+                version = cache.incr(VERSION_CACHE_KEY)
+            except ValueError:
+                cache.add(VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+                version = cache.incr(VERSION_CACHE_KEY)
+            cache.set(CHANGE_CACHE_KEY.format(version), list(keys), timeout=CHANGE_TIMEOUT)
+            return version
+        except Exception:
+            return None
+
+    def _blocking_rows(self, floor, keys=None):
+        from booking.models import Bookings
+
+        rows = Bookings.objects.filter(
+            check_out_date__gte=floor,
+        ).exclude(
+            status__in=NON_BLOCKING_STATUSES,
+        )
+        if keys is not None:
+            rows = rows.filter(
+                Q(is_venue_booking=False, room_id__in=[pk for kind, pk in keys if kind == 'room'])
+                | Q(is_venue_booking=True, area_id__in=[pk for kind, pk in keys if kind == 'area'])
+            )
+        return rows.values_list('id', 'is_venue_booking', 'room_id', 'area_id', 'check_in_date', 'check_out_date')
+
+    @staticmethod
+    def _index_rows(rows, resources, booking_keys):
+        touched = set()
+        for booking_id, is_venue, room_id, area_id, check_in, check_out in rows:
+            key = ('area', area_id) if is_venue else ('room', room_id)
+            if key[1] is None:
+                continue
+            intervals = resources.setdefault(key, _ResourceIntervals())
+            intervals.bookings[booking_id] = (check_in, _stay_end(check_in, check_out, is_venue))
+            booking_keys[booking_id] = key
+            touched.add(key)
+        for key in touched:
+            resources[key]._rebuild()
+
+    def load(self):
+        """Rebuild the index from bookings that are still blocking and not yet checked out."""
+        floor = timezone.localdate() - timedelta(days=HISTORY_DAYS)
+        # Read the version first: a write committed after it moves the version past it again
+        version = self._shared_version()
+        resources = {}
+        booking_keys = {}
+        self._index_rows(self._blocking_rows(floor).iterator(), resources, booking_keys)
+
+        with self._lock:
+            self._resources = resources
+            self._booking_keys = booking_keys
+            self._floor = floor
+            self._version = version
+            self._loaded = True
+
+    def reload(self, keys):
+        """Reload the bookings of the given ('room'|'area', id) keys from the database."""
+        keys = set(keys)
+        rows = list(self._blocking_rows(self._floor, keys))
+        with self._lock:
+            for key in keys:
+                intervals = self._resources.pop(key, None)
+                for booking_id in intervals.bookings if intervals else ():
+                    self._booking_keys.pop(booking_id, None)
+            self._index_rows(rows, self._resources, self._booking_keys)
+
+    def _ensure_fresh(self):
+        if not self._loaded or self._floor != timezone.localdate() - timedelta(days=HISTORY_DAYS):
+            self.load()
+            return
+        version = self._shared_version()
+        if version == self._version:
+            return
+        if version is None or self._version is None or not 0 < version - self._version <= MAX_REPLAY:
+            self.load()
+            return
+
+        change_keys = [CHANGE_CACHE_KEY.format(v) for v in range(self._version + 1, version + 1)]
+        try:
+            changes = cache.get_many(change_keys)
+        except Exception:
+            changes = {}
+        if len(changes) != len(change_keys):
+            # Expired, or a writer has bumped the version but not filed its change yet
+            self.load()
+            return
+        self.reload({tuple(key) for keys in changes.values() for key in keys})
+        with self._lock:
+            self._version = version
+
+    def blocked_ids(self, kind, arrival, departure):
+        """
+        Return ids of rooms (kind='room') or areas (kind='area') booked within [arrival, departure),
+        or None when `arrival` is older than what the index keeps.
+        """
+        arrival = _as_date(arrival)
+        departure = _as_date(departure)
+        if arrival < timezone.localdate() - timedelta(days=HISTORY_DAYS):
+            # Older than the index keeps, no need to bring it up to date first
+            return None
+        self._ensure_fresh()
+        with self._lock:
+            if self._floor is None or arrival < self._floor:
+                return None
+            return {
+                resource_id
+                for (resource_kind, resource_id), intervals in self._resources.items()
+                if resource_kind == kind and intervals.overlaps(arrival, departure)
+            }
+
+    def apply(self, booking_id, key=None, status=None, check_in=None, check_out=None, previous_key=None):
+        """
+        Update the index for a single booking write (key=None removes it) and tell other processes
+        which rooms/areas it touched; `previous_key` is the one the booking had before the write.
+        """
+        check_in = _as_date(check_in)
+        check_out = _as_date(check_out)
+        with self._lock:
+            indexed_key = self._booking_keys.pop(booking_id, None)
+            if indexed_key is not None and indexed_key in self._resources:
+                self._resources[indexed_key].remove(booking_id)
+
+            blocking = (
+                key is not None
+                and status not in NON_BLOCKING_STATUSES
+                and check_in is not None
+                and check_out is not None
+                and (self._floor is None or check_out >= self._floor)
+            )
+            if blocking:
+                self._resources.setdefault(key, _ResourceIntervals()).add(
+                    booking_id, check_in, _stay_end(check_in, check_out, key[0] == 'area')
+                )
+                self._booking_keys[booking_id] = key
+
+            new_version = self._publish({k for k in (key, previous_key, indexed_key) if k and k[1] is not None})
+            if new_version is not None and self._version is not None and new_version == self._version + 1:
+                # Ours was the only write since the last sync, so the local copy is current;
+                # otherwise the next read replays the writes in between, ours included
+                self._version = new_version
+
+    def invalidate(self, keys):
+        """Make every process reload the given ('room'|'area', id) keys, e.g. after a bulk update."""
+        keys = {key for key in keys if key[1] is not None}
+        if keys:
+            self._publish(keys)
+
+
+availability_index = AvailabilityIndex()
+
+
+def find_blocked_ids(kind, arrival, departure):
+    """Ids of rooms/areas that are not free for [arrival, departure), using the index when possible."""
+    blocked = availability_index.blocked_ids(kind, arrival, departure)
+    if blocked is None:
+        blocked = set(_blocked_ids_from_db(kind, arrival, departure))
+    return blocked
+
+
+def _blocked_ids_from_db(kind, arrival, departure):
+    # The RoomNight/AreaSlot ledger holds exactly the nights of blocking bookings
+    from booking.models import RoomNight, AreaSlot
+
+    arrival = _as_date(arrival)
+    departure = _as_date(departure)
+    if kind == 'area':
+        return AreaSlot.objects.filter(date__gte=arrival, date__lt=departure).values_list('area_id', flat=True)
+    return RoomNight.objects.filter(night__gte=arrival, night__lt=departure).values_list('room_id', flat=True)
+
+
+def on_booking_saved(booking):
+    previous = getattr(booking, '_ledger_state', None)
+    previous_key = None
+    if previous:
+        previous = dict(zip(booking.LEDGER_FIELDS, previous))
+        previous_key = ('area', previous['area_id']) if previous['is_venue_booking'] else ('room', previous['room_id'])
+    args = (booking.pk, _resource_key(booking), booking.status, booking.check_in_date, booking.check_out_date)
+    transaction.on_commit(lambda: availability_index.apply(*args, previous_key=previous_key))
+
+
+def on_booking_deleted(booking):
+    booking_id, key = booking.pk, _resource_key(booking)
+    transaction.on_commit(lambda: availability_index.apply(booking_id, previous_key=key))
@@ -0,0 +1,128 @@
+"""
+Cache of availability answers keyed by (arrival, departure).
+
+Each calendar day has a version counter in the shared cache. A cached answer records the
+versions of the days it covers and is only served while they are unchanged, so a booking
+write evicts exactly the searches whose range overlaps the days that booking holds.
+"""
+
+import logging
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .availability import _as_date, _stay_end, find_blocked_ids
+
+logger = logging.getLogger(__name__)
+
+CACHE_TIMEOUT = 300
+MAX_CACHED_DAYS = 62
+HITS_KEY = 'availability:cache:hits'
+MISSES_KEY = 'availability:cache:misses'
+
+
+def _days(start, end):
+    day = start
+    while day < end:
+        yield day
+        day += timedelta(days=1)
+
+
+def _day_key(day):
+    return f"availability:day:{day.isoformat()}"
+
+
+def _answer_key(arrival, departure):
+    return f"availability:answer:{arrival.isoformat()}:{departure.isoformat()}"
+
+
+def _count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+    except Exception:
+        pass
+
+
+def _day_versions(day_keys):
+    found = cache.get_many(day_keys)
+    return [found.get(key) for key in day_keys]
+
+
+def blocked_ids(arrival, departure):
+    """(blocked room ids, blocked area ids) for [arrival, departure), served from the cache when current."""
+    arrival = _as_date(arrival)
+    departure = _as_date(departure)
+    day_keys = [_day_key(day) for day in _days(arrival, departure)]
+    if len(day_keys) > MAX_CACHED_DAYS:
+        return find_blocked_ids('room', arrival, departure), find_blocked_ids('area', arrival, departure)
+
+    key = _answer_key(arrival, departure)
+    try:
+        versions = _day_versions(day_keys)
+        cached = cache.get(key)
+    except Exception:
+        logger.warning("Availability cache unavailable", exc_info=True)
+        return find_blocked_ids('room', arrival, departure), find_blocked_ids('area', arrival, departure)
+
+    if cached is not None and cached['versions'] == versions:
+        _count(HITS_KEY)
+        return set(cached['rooms']), set(cached['areas'])
+
+    _count(MISSES_KEY)
+    rooms = find_blocked_ids('room', arrival, departure)
+    areas = find_blocked_ids('area', arrival, departure)
+    try:
+        cache.set(key, {'versions': versions, 'rooms': list(rooms), 'areas': list(areas)}, CACHE_TIMEOUT)
+    except Exception:
+        pass
+    return rooms, areas
+
+
+def invalidate_days(days):
+    """Bump the version of every given day so cached answers covering them stop being served."""
+    for day in set(days):
+        key = _day_key(day)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # A fresh key starts from a value older answers cannot have recorded
+            cache.add(key, time.time_ns(), timeout=None)
+        except Exception:
+            logger.warning("Could not invalidate availability cache for %s", day, exc_info=True)
+
+
+def held_days(check_in, check_out, is_venue=False):
+    check_in = _as_date(check_in)
+    check_out = _as_date(check_out)
+    if check_in is None or check_out is None:
+        return []
+    return list(_days(check_in, _stay_end(check_in, check_out, is_venue)))
+
+
+def on_booking_changed(ranges):
+    """
+    Invalidate after commit for each (check_in, check_out, is_venue) range a write touched,
+    both the dates a booking held before the write and the ones it holds after.
+    """
+    days = set()
+    for check_in, check_out, is_venue in ranges:
+        days.update(held_days(check_in, check_out, is_venue))
+    if days:
+        transaction.on_commit(lambda: invalidate_days(days))
+
+
+def stats(reset=False):
+    hits = cache.get(HITS_KEY) or 0
+    misses = cache.get(MISSES_KEY) or 0
+    if reset:
+        cache.delete_many([HITS_KEY, MISSES_KEY])
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total * 100, 2) if total else 0.0,
+    }
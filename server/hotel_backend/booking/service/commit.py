@@ -0,0 +1,76 @@
+"""
+Booking insert path that is safe under concurrent requests.
+
+Validation stays outside (BookingRequestSerializer.validate). Here only the affected room or
+area row is locked with SELECT ... FOR UPDATE, the overlap is re-checked under that lock and the
+booking is inserted, all in one short transaction. Bookings for different rooms never wait on
+each other; lock timeouts and deadlocks are retried.
+"""
+
+import random
+import time
+
+from django.db import OperationalError, transaction
+
+from .availability import NON_BLOCKING_STATUSES
+from .slots import has_conflict
+
+MAX_ATTEMPTS = 5
+RETRY_DELAY = 0.05
+
+
+class BookingConflict(Exception):
+    """The room/area was taken by a concurrent booking."""
+
+
+def room_taken(room_id, check_in, check_out):
+    """
+    True when a booking that still holds inventory (pending ones included) overlaps the stay.
+    The one rule for rooms, shared by request validation, holds and the locked commit below.
+    """
+    from booking.models import Bookings
+
+    return Bookings.objects.filter(room_id=room_id).exclude(
+        status__in=NON_BLOCKING_STATUSES
+    ).overlapping(check_in, check_out).exists()
+
+
+def area_taken(area_id, check_in, check_out, start_time=None, end_time=None):
+    """The same rule for venues: any requested slot taken by a booking that holds inventory."""
+    return has_conflict(area_id, check_in, check_out, start_time, end_time)
+
+
+def _lock_and_check(fields):
+    from property.models import Rooms, Areas
+
+    if fields.get('is_venue_booking'):
+        area = Areas.objects.select_for_update().only('id').get(pk=fields['area'].pk)
+        if area_taken(
+            area.pk, fields['check_in_date'], fields['check_out_date'],
+            fields.get('start_time'), fields.get('end_time')
+        ):
+            raise BookingConflict()
+        return
+
+    room = Rooms.objects.select_for_update().only('id').get(pk=fields['room'].pk)
+    if room_taken(room.pk, fields['check_in_date'], fields['check_out_date']):
+        raise BookingConflict()
+
+
+def commit_booking(**fields):
+    """
+    Create a Bookings row with the given fields while holding a lock on its room/area.
+    Raises BookingConflict when another booking already holds the dates.
+    """
+    from booking.models import Bookings
+
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            with transaction.atomic():
+                _lock_and_check(fields)
+                return Bookings.objects.create(**fields)
+        except OperationalError:
+            # Lock timeout, deadlock or a busy database; back off and try the whole transaction again
+            if attempt == MAX_ATTEMPTS or transaction.get_connection().in_atomic_block:
+                raise
+            time.sleep(RETRY_DELAY * attempt * (1 + random.random()))
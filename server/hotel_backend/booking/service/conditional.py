@@ -0,0 +1,141 @@
+"""
+Conditional GET (ETag / Last-Modified) for catalog and booking resources.
+
+Every resource scope ('rooms', 'room:<id>', 'booking:<id>', ...) has a stamp in the shared cache
+that writes refresh through signals.py. A view's validators are built from the stamps of the
+scopes it renders, so answering a revalidation costs one cache round trip and a 304 skips the
+queries and serialization entirely. The stamps must live in a cache every worker shares (see the
+booking.E001 deploy check), or workers hand out different ETags and miss each other's writes.
+"""
+
+import hashlib
+import logging
+import time
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import condition
+
+logger = logging.getLogger(__name__)
+
+
+def _key(scope):
+    return f"etag:{scope}"
+
+
+def stamps(scopes):
+    """Nanosecond stamp of the last write to each scope; scopes never written (or evicted) start now."""
+    keys = [_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        now = time.time_ns()
+        for key in missing:
+            cache.add(key, now, timeout=None)
+        found.update(cache.get_many(missing))
+    return [found[key] for key in keys]
+
+
+def touch(*scopes):
+    """Mark scopes as changed once the current transaction commits."""
+    scopes = {scope for scope in scopes if scope}
+    if not scopes:
+        return
+
+    def refresh():
+        try:
+            cache.set_many({_key(scope): time.time_ns() for scope in scopes}, timeout=None)
+        except Exception:
+            logger.warning("Could not refresh ETag stamps for %s", scopes, exc_info=True)
+
+    transaction.on_commit(refresh)
+
+
+def _validators(request, scopes_func, args, kwargs):
+    # Django's condition() asks for the ETag and Last-Modified separately; look the stamps up once
+    if not hasattr(request, '_conditional_validators'):
+        validators = None
+        if request.method in ('GET', 'HEAD'):
+            try:
+                scopes = scopes_func(request, *args, **kwargs)
+                values = stamps(scopes) if scopes else None
+            except Exception:
+                logger.warning("Conditional GET validators unavailable", exc_info=True)
+                values = None
+            if values:
+                # Responses also vary by query string, by the senior/PWD discount of the caller and
+                # by the negotiated format (JSON or MessagePack)
+                user = getattr(request, 'user', None)
+                variant = (
+                    f"{request.get_full_path()}|{bool(getattr(user, 'is_senior_or_pwd', False))}"
+                    f"|{request.META.get('HTTP_ACCEPT', '')}"
+                )
+                digest = hashlib.md5(f"{variant}|{values}".encode()).hexdigest()
+                validators = (
+                    f'"{digest}"',
+                    datetime.fromtimestamp(max(values) / 1e9, tz=dt_timezone.utc),
+                )
+        request._conditional_validators = validators
+    return request._conditional_validators
+
+
+def conditional(scopes_func):
+    """
+    View decorator (place it under @api_view): answers 304 Not Modified when the client's
+    If-None-Match / If-Modified-Since still matches the stamps of scopes_func(request, **kwargs).
+    Only GET and HEAD are conditional; other methods reach the view untouched. When scopes_func
+    returns nothing the view runs normally, so it can refuse callers it should not answer.
+    """
+    def etag(request, *args, **kwargs):
+        validators = _validators(request, scopes_func, args, kwargs)
+        return validators[0] if validators else None
+
+    def last_modified(request, *args, **kwargs):
+        validators = _validators(request, scopes_func, args, kwargs)
+        return validators[1] if validators else None
+
+    def decorator(view):
+        conditional_view = condition(etag_func=etag, last_modified_func=last_modified)(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+            response = conditional_view(request, *args, **kwargs)
+            # The validators differ per negotiated format, so caches must not mix JSON and MessagePack
+            patch_vary_headers(response, ('Accept',))
+            return response
+        return wrapper
+
+    return decorator
+
+
+def can_view_booking(user, owner_id):
+    """Admins see every booking, guests only their own."""
+    if not getattr(user, 'is_authenticated', False):
+        return False
+    return user.role != 'guest' or user.id == owner_id
+
+
+def booking_scopes(booking_id, user):
+    """
+    Scopes a booking detail renders: the booking, its guest and its room/area. None when the
+    booking does not exist or `user` may not see it, so no validator ever answers for it.
+    """
+    from booking.models import Bookings
+
+    row = Bookings.objects.filter(id=booking_id).values_list('user_id', 'room_id', 'area_id').first()
+    if row is None:
+        return None
+    user_id, room_id, area_id = row
+    if not can_view_booking(user, user_id):
+        return None
+    return [
+        f"booking:{booking_id}",
+        f"user:{user_id}",
+        f"room:{room_id}" if room_id else f"area:{area_id}",
+        'amenities',
+    ]
@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+import numpy as np
+
+from .holds import held_nights
+from .pricing import room_discount_percent
+from .slots import FULL_DAY
+
+MAX_NIGHTS = 30
+MAX_HORIZON_DAYS = 180
+
+
+def occupancy_matrix(rooms, start, days, user_id=None, hold_token=None):
+    """
+    rooms x days boolean matrix of nights already booked, read from the RoomNight ledger in one
+    query, or on hold for another guest, read from the cache in one more.
+    """
+    from booking.models import RoomNight
+
+    row_of = {room.id: row for row, room in enumerate(rooms)}
+    occupied = np.zeros((len(rooms), days), dtype=bool)
+    nights = RoomNight.objects.filter(
+        room_id__in=list(row_of),
+        night__gte=start,
+        night__lt=start + timedelta(days=days),
+    ).values_list('room_id', 'night')
+    for room_id, night in nights:
+        occupied[row_of[room_id], (night - start).days] = True
+    held = held_nights(
+        'room', list(row_of), {start + timedelta(days=offset): FULL_DAY for offset in range(days)}, user_id, hold_token
+    )
+    for room_id, night in held:
+        occupied[row_of[room_id], (night - start).days] = True
+    return occupied
+
+
+def free_windows(occupied, nights):
+    """
+    Boolean rooms x starts matrix, True where `nights` consecutive nights beginning at that
+    start are all free. Uses a cumulative sum so every window of every room is checked at once.
+    """
+    rooms, days = occupied.shape
+    if nights > days:
+        return np.zeros((rooms, 0), dtype=bool)
+    busy = np.zeros((rooms, days + 1), dtype=np.int32)
+    np.cumsum(occupied, axis=1, out=busy[:, 1:])
+    return (busy[:, nights:] - busy[:, :-nights]) == 0
+
+
+def search(rooms, start, nights, horizon, user=None, limit=50, hold_token=None):
+    """
+    Every free `nights`-night window starting within `horizon` days of `start`, cheapest first
+    (ties go to the earliest check-in). Nights held by `user` or under `hold_token` count as free.
+    Prices use the same discount rules as booking creation.
+    """
+    rooms = list(rooms)
+    if not rooms:
+        return [], 0
+
+    occupied = occupancy_matrix(rooms, start, horizon + nights - 1, user.id if user else None, hold_token)
+    feasible = free_windows(occupied, nights)
+
+    discounts = np.array([room_discount_percent(room, user, nights) for room in rooms])
+    nightly = np.array([float(room.room_price) for room in rooms]) * (1 - discounts / 100)
+
+    room_rows, start_offsets = np.nonzero(feasible)
+    totals = nightly[room_rows] * nights
+    order = np.lexsort((start_offsets, totals))
+
+    results = []
+    for index in order[:limit]:
+        room = rooms[room_rows[index]]
+        check_in = start + timedelta(days=int(start_offsets[index]))
+        results.append({
+            "room_id": room.id,
+            "room_name": room.room_name,
+            "room_type": room.room_type,
+            "max_guests": room.max_guests,
+            "check_in": check_in,
+            "check_out": check_in + timedelta(days=nights),
+            "nights": nights,
+            "price_per_night": float(room.room_price),
+            "discount_percent": int(discounts[room_rows[index]]),
+            "total_price": round(float(totals[index]), 2),
+        })
+    return results, int(len(order))
@@ -0,0 +1,169 @@
+"""
+Short-lived holds on a room or area for a date range, kept in the shared cache (Redis in
+production) so they expire on their own.
+
+Every held room night, and every held 30-minute venue slot, is its own key claimed with an
+atomic add, so two guests can never hold the same room night or venue slot and reads never
+need database locks. A guest may re-hold what their own earlier holds cover.
+"""
+
+import uuid
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .availability_cache import held_days
+from .slots import FULL_DAY, SLOTS_PER_DAY, _parse_time, requested_masks
+
+DEFAULT_MINUTES = 10
+MAX_MINUTES = 30
+
+
+def _night_key(kind, resource_id, day):
+    return f"hold:{kind}:{resource_id}:{day.isoformat()}"
+
+
+def _slot_key(resource_id, day, slot):
+    return f"hold:area:{resource_id}:{day.isoformat()}:{slot}"
+
+
+def _hold_key(token):
+    return f"hold:token:{token}"
+
+
+def _owner(value):
+    token, _, user_id = (value or '').partition(':')
+    return token, user_id
+
+
+def _wanted(kind, check_in, check_out, start_time=None, end_time=None, as_booking=True):
+    """
+    Per-day slot masks to hold or check. Rooms take the nights of [check_in, check_out); areas take
+    what a venue booking with these dates and times would, or whole days for a plain date search.
+    """
+    if kind == 'area' and as_booking:
+        return requested_masks(check_in, check_out, start_time, end_time)
+    return {day: FULL_DAY for day in held_days(check_in, check_out)}
+
+
+def _keys(kind, resource_id, masks):
+    """Cache keys of the (resource, day) units in `masks`, mapped to their day."""
+    if kind != 'area':
+        return {_night_key(kind, resource_id, day): day for day in masks}
+    return {
+        _slot_key(resource_id, day, slot): day
+        for day, mask in masks.items()
+        for slot in range(SLOTS_PER_DAY)
+        if mask >> slot & 1
+    }
+
+
+def _claim(key, value, user_id, timeout):
+    """Atomically take a free key, or take over one held by the same user. Returns the value replaced."""
+    if cache.add(key, value, timeout=timeout):
+        return True, None
+    current = cache.get(key)
+    if current is None:
+        # Expired in between
+        return cache.add(key, value, timeout=timeout), None
+    if _owner(current)[1] == str(user_id):
+        cache.set(key, value, timeout=timeout)
+        return True, current
+    return False, None
+
+
+def place_hold(kind, resource_id, check_in, check_out, user_id, minutes=DEFAULT_MINUTES, start_time=None, end_time=None):
+    """
+    Hold a room for the nights of [check_in, check_out), or an area for the slots a venue booking
+    from check_in/start_time to check_out/end_time would take. Returns the hold, or None when
+    someone else already holds part of it.
+    """
+    token = uuid.uuid4().hex
+    timeout = int(minutes * 60)
+    value = f"{token}:{user_id}"
+    if kind == 'area':
+        start_time, end_time = _parse_time(start_time), _parse_time(end_time)
+    masks = _wanted(kind, check_in, check_out, start_time, end_time)
+
+    claimed = []
+    for key in _keys(kind, resource_id, masks):
+        taken, previous = _claim(key, value, user_id, timeout)
+        if not taken:
+            for claimed_key, claimed_previous in claimed:
+                if claimed_previous is None:
+                    cache.delete(claimed_key)
+                else:
+                    cache.set(claimed_key, claimed_previous, timeout=timeout)
+            return None
+        claimed.append((key, previous))
+
+    hold = {
+        'token': token,
+        'kind': kind,
+        'resource_id': int(resource_id),
+        'check_in': check_in.isoformat(),
+        'check_out': check_out.isoformat(),
+        'user_id': str(user_id),
+        'expires_at': (timezone.now() + timedelta(seconds=timeout)).isoformat(),
+    }
+    if kind == 'area':
+        hold['start_time'] = start_time.isoformat() if start_time else None
+        hold['end_time'] = end_time.isoformat() if end_time else None
+    cache.set(_hold_key(token), hold, timeout=timeout)
+    return hold
+
+
+def get_hold(token):
+    return cache.get(_hold_key(token)) if token else None
+
+
+def release_hold(token):
+    """Release a hold before it expires (booking created, guest backed out)."""
+    hold = get_hold(token)
+    if not hold:
+        return False
+    masks = _wanted(
+        hold['kind'],
+        date.fromisoformat(hold['check_in']),
+        date.fromisoformat(hold['check_out']),
+        hold.get('start_time'),
+        hold.get('end_time'),
+    )
+    keys = list(_keys(hold['kind'], hold['resource_id'], masks))
+    # Only drop units that still belong to this hold
+    owned = [key for key, value in cache.get_many(keys).items() if _owner(value)[0] == token]
+    cache.delete_many(owned + [_hold_key(token)])
+    return True
+
+
+def held_nights(kind, resource_ids, masks, user_id=None, token=None):
+    """
+    (resource id, day) pairs among `resource_ids` where someone else holds part of the per-day
+    slot `masks`, in one cache read. Holds placed by `user_id` or under `token` do not count.
+    """
+    keys = {}
+    for resource_id in resource_ids:
+        for key, day in _keys(kind, resource_id, masks).items():
+            keys[key] = (resource_id, day)
+    if not keys:
+        return set()
+    held = set()
+    for key, value in cache.get_many(list(keys)).items():
+        hold_token, hold_user = _owner(value)
+        if token and hold_token == token:
+            continue
+        if user_id is not None and hold_user == str(user_id):
+            continue
+        held.add(keys[key])
+    return held
+
+
+def held_ids(kind, resource_ids, arrival, departure, user_id=None, token=None, as_booking=False, start_time=None, end_time=None):
+    """
+    Ids among `resource_ids` held by someone else for any night of [arrival, departure), or for
+    the slots a booking with these dates and times would take when `as_booking` is set.
+    Holds placed by `user_id` or under `token` do not count.
+    """
+    masks = _wanted(kind, arrival, departure, start_time, end_time, as_booking)
+    return {resource_id for resource_id, _ in held_nights(kind, list(resource_ids), masks, user_id, token)}
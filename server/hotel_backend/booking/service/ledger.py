@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+from django.db import transaction
+
+from .availability import NON_BLOCKING_STATUSES, _stay_end
+
+
+def _holds_inventory(booking):
+    return booking.status not in NON_BLOCKING_STATUSES and booking.check_in_date and booking.check_out_date
+
+
+def _dates(check_in, check_out, is_venue=False):
+    day = check_in
+    end = _stay_end(check_in, check_out, is_venue)
+    while day < end:
+        yield day
+        day += timedelta(days=1)
+
+
+def venue_days(check_in, check_out, start_time=None, end_time=None):
+    """
+    (date, start, end) windows a venue booking holds. The start time applies to the first day,
+    the end time to the last one, and days in between are held in full (None).
+    """
+    last_day = max(check_in, check_out)
+    for day in _dates(check_in, check_out, is_venue=True):
+        yield (
+            day,
+            start_time if day == check_in else None,
+            end_time if day == last_day else None,
+        )
+
+
+def build_ledger_rows(booking, room_night_model, area_slot_model):
+    """Unsaved RoomNight/AreaSlot rows for every night (or venue day) the booking holds."""
+    if not _holds_inventory(booking):
+        return [], []
+    if booking.is_venue_booking:
+        if not booking.area_id:
+            return [], []
+        return [], [
+            area_slot_model(
+                area_id=booking.area_id,
+                booking_id=booking.pk,
+                date=day,
+                start_time=start_time,
+                end_time=end_time,
+                status=booking.status,
+            )
+            for day, start_time, end_time in venue_days(
+                booking.check_in_date, booking.check_out_date, booking.start_time, booking.end_time
+            )
+        ]
+    if not booking.room_id:
+        return [], []
+    return [
+        room_night_model(room_id=booking.room_id, booking_id=booking.pk, night=day, status=booking.status)
+        for day in _dates(booking.check_in_date, booking.check_out_date)
+    ], []
+
+
+def sync_booking_ledger(booking):
+    """Replace the ledger rows of a single booking; called from Bookings.save() inside its transaction."""
+    from booking.models import RoomNight, AreaSlot
+
+    nights, slots = build_ledger_rows(booking, RoomNight, AreaSlot)
+    with transaction.atomic():
+        RoomNight.objects.filter(booking_id=booking.pk).delete()
+        AreaSlot.objects.filter(booking_id=booking.pk).delete()
+        if nights:
+            RoomNight.objects.bulk_create(nights)
+        if slots:
+            AreaSlot.objects.bulk_create(slots)
+
+
+def rebuild_ledger(batch_size=5000):
+    """Rebuild RoomNight/AreaSlot from scratch in bulk. Returns (nights, slots) written."""
+    from booking.models import Bookings, RoomNight, AreaSlot
+
+    fields = ('id', 'status', 'room_id', 'area_id', 'is_venue_booking', 'check_in_date', 'check_out_date', 'start_time', 'end_time')
+    night_count = slot_count = 0
+    with transaction.atomic():
+        RoomNight.objects.all().delete()
+        AreaSlot.objects.all().delete()
+
+        nights, slots = [], []
+        bookings = Bookings.objects.exclude(status__in=NON_BLOCKING_STATUSES).only(*fields)
+        for booking in bookings.iterator(chunk_size=batch_size):
+            booking_nights, booking_slots = build_ledger_rows(booking, RoomNight, AreaSlot)
+            nights.extend(booking_nights)
+            slots.extend(booking_slots)
+            if len(nights) >= batch_size:
+                RoomNight.objects.bulk_create(nights, batch_size=batch_size)
+                night_count += len(nights)
+                nights = []
+            if len(slots) >= batch_size:
+                AreaSlot.objects.bulk_create(slots, batch_size=batch_size)
+                slot_count += len(slots)
+                slots = []
+
+        RoomNight.objects.bulk_create(nights, batch_size=batch_size)
+        AreaSlot.objects.bulk_create(slots, batch_size=batch_size)
+        night_count += len(nights)
+        slot_count += len(slots)
+    return night_count, slot_count
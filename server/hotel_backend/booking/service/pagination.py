@@ -0,0 +1,65 @@
+"""
+Keyset (cursor) pagination on (timestamp, id).
+
+Opt-in alternative to Paginator for long lists: each page is a single indexed range scan that
+continues after the last row of the previous page, so there is no OFFSET to walk and no
+COUNT(*) unless the client asks for one with ?count=true.
+"""
+
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+MAX_PAGE_SIZE = 100
+
+
+def is_cursor_request(params):
+    """Cursor mode is opt-in: any ?cursor= (empty for the first page) switches a list over."""
+    return 'cursor' in params
+
+
+def encode_cursor(value, pk):
+    raw = f"{value.isoformat()}|{pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(timestamp, id) from an opaque cursor. Raises ValueError on anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        value, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(value), int(pk)
+    except (TypeError, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def cursor_page(queryset, params, page_size, field='created_at', descending=True):
+    """
+    One page of `queryset` ordered by (field, id) starting after ?cursor=.
+    Returns (rows, pagination) where pagination carries next_cursor/has_more, plus
+    total_items only when ?count=true was passed.
+    """
+    page_size = max(1, min(int(page_size), MAX_PAGE_SIZE))
+    direction = 'lt' if descending else 'gt'
+    prefix = '-' if descending else ''
+    rows = queryset.order_by(f"{prefix}{field}", f"{prefix}id")
+
+    cursor = params.get('cursor')
+    if cursor:
+        value, pk = decode_cursor(cursor)
+        rows = rows.filter(
+            Q(**{f"{field}__{direction}": value}) | Q(**{field: value, f"id__{direction}": pk})
+        )
+
+    rows = list(rows[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    pagination = {
+        "next_cursor": encode_cursor(getattr(rows[-1], field), rows[-1].pk) if has_more else None,
+        "has_more": has_more,
+        "page_size": page_size,
+    }
+    if params.get('count') in ('1', 'true'):
+        pagination["total_items"] = queryset.count()
+    return rows, pagination
@@ -0,0 +1,17 @@
+PWD_SENIOR_DISCOUNT_PERCENT = 20
+
+
+def long_stay_discount(nights):
+    if nights >= 7:
+        return 10
+    if nights >= 3:
+        return 5
+    return 0
+
+
+def room_discount_percent(room, user=None, nights=1):
+    """Best single discount for a room stay: admin discount, senior/PWD or long-stay, whichever is highest."""
+    available_discounts = [int(room.discount_percent or 0), long_stay_discount(nights)]
+    if user is not None and getattr(user, 'is_senior_or_pwd', False):
+        available_discounts.append(PWD_SENIOR_DISCOUNT_PERCENT)
+    return max(available_discounts)
@@ -0,0 +1,107 @@
+from datetime import datetime, time
+
+from .availability import _as_date
+
+# Venue bookings are tracked in 30-minute buckets; a day is a 48-bit integer bitmap
+SLOT_MINUTES = 30
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+FULL_DAY = (1 << SLOTS_PER_DAY) - 1
+
+
+def _parse_time(value):
+    if value is None or isinstance(value, time):
+        return value
+    if isinstance(value, datetime):
+        return value.time()
+    value = str(value).strip()
+    if not value:
+        return None
+    for fmt in ("%H:%M", "%H:%M:%S"):
+        try:
+            return datetime.strptime(value, fmt).time()
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid time '{value}'. Use HH:MM")
+
+
+def slot_mask(start_time=None, end_time=None):
+    """
+    Bitmap of the slots touched by [start_time, end_time). A missing start/end means the start/end
+    of the day; partial buckets count as taken, and an end at or before the start runs to midnight.
+    """
+    start_time = _parse_time(start_time)
+    end_time = _parse_time(end_time)
+    first = 0
+    last = SLOTS_PER_DAY
+    if start_time is not None:
+        first = (start_time.hour * 60 + start_time.minute) // SLOT_MINUTES
+    if end_time is not None:
+        minutes = end_time.hour * 60 + end_time.minute + (1 if end_time.second else 0)
+        last = -(-minutes // SLOT_MINUTES)
+    if last <= first and start_time is not None:
+        last = SLOTS_PER_DAY
+    return ((1 << last) - 1) ^ ((1 << first) - 1)
+
+
+def slot_label(index):
+    minutes = index * SLOT_MINUTES
+    if minutes >= 24 * 60:
+        return "24:00"
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def day_bitmaps(area_id, start_date, end_date=None, statuses=None, exclude_booking_id=None):
+    """
+    Booked-slot bitmaps of an area per date in [start_date, end_date] (inclusive), read from the
+    AreaSlot ledger in one query. `statuses` narrows which bookings count; by default every
+    booking that holds inventory does.
+    """
+    from booking.models import AreaSlot
+
+    start_date = _as_date(start_date)
+    end_date = _as_date(end_date) or start_date
+    rows = AreaSlot.objects.filter(area_id=area_id, date__range=(start_date, end_date))
+    if statuses is not None:
+        rows = rows.filter(status__in=statuses)
+    if exclude_booking_id is not None:
+        rows = rows.exclude(booking_id=exclude_booking_id)
+
+    bitmaps = {}
+    for day, start_time, end_time in rows.values_list('date', 'start_time', 'end_time'):
+        bitmaps[day] = bitmaps.get(day, 0) | slot_mask(start_time, end_time)
+    return bitmaps
+
+
+def requested_masks(check_in, check_out, start_time=None, end_time=None):
+    """Per-date bitmaps a venue booking from check_in/start_time to check_out/end_time would take."""
+    from .ledger import venue_days
+
+    return {
+        day: slot_mask(start, end)
+        for day, start, end in venue_days(
+            _as_date(check_in), _as_date(check_out), _parse_time(start_time), _parse_time(end_time)
+        )
+    }
+
+
+def has_conflict(area_id, check_in, check_out, start_time=None, end_time=None, statuses=None, exclude_booking_id=None):
+    """True when any requested slot is already taken; one query plus one AND per day."""
+    wanted = requested_masks(check_in, check_out, start_time, end_time)
+    if not wanted:
+        return False
+    taken = day_bitmaps(area_id, min(wanted), max(wanted), statuses, exclude_booking_id)
+    return any(taken.get(day, 0) & mask for day, mask in wanted.items())
+
+
+def free_ranges(bitmap):
+    """Merge the free slots of a day bitmap into [{"start", "end"}] windows."""
+    ranges = []
+    start = None
+    for index in range(SLOTS_PER_DAY + 1):
+        free = index < SLOTS_PER_DAY and not (bitmap >> index) & 1
+        if free and start is None:
+            start = index
+        elif not free and start is not None:
+            ranges.append({"start": slot_label(start), "end": slot_label(index)})
+            start = None
+    return ranges
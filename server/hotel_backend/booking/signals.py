@@ -0,0 +1,65 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+from .models import Bookings, Reviews, Transactions
+from .service.availability import on_booking_saved, on_booking_deleted
+from .service import availability_cache
+from .service.conditional import touch
+
+# Sent by BookingsQuerySet.update() inside its transaction with `before` and `after`, the updated
+# rows (Bookings.SNAPSHOT_FIELDS only) as they were and as they are now
+bookings_updated = Signal()
+
+@receiver(post_save, sender=Bookings)
+def sync_availability_on_save(sender, instance, **kwargs):
+    """Keep the availability index in step with booking creates, status and date changes"""
+    on_booking_saved(instance)
+
+@receiver(post_save, sender=Bookings)
+def invalidate_availability_cache_on_save(sender, instance, created, **kwargs):
+    """Evict cached availability answers for the dates the booking held before and after the save"""
+    previous = getattr(instance, '_ledger_state', None)
+    if not created and previous == instance._get_ledger_state():
+        return
+    ranges = [(instance.check_in_date, instance.check_out_date, instance.is_venue_booking)]
+    if previous:
+        previous = dict(zip(Bookings.LEDGER_FIELDS, previous))
+        ranges.append((previous['check_in_date'], previous['check_out_date'], previous['is_venue_booking']))
+    availability_cache.on_booking_changed(ranges)
+
+@receiver(post_delete, sender=Bookings)
+def sync_availability_on_delete(sender, instance, **kwargs):
+    """Drop deleted bookings from the availability index"""
+    on_booking_deleted(instance)
+
+@receiver(post_delete, sender=Bookings)
+def invalidate_availability_cache_on_delete(sender, instance, **kwargs):
+    """Evict cached availability answers for the dates a deleted booking held"""
+    availability_cache.on_booking_changed([(instance.check_in_date, instance.check_out_date, instance.is_venue_booking)])
+
+def _property_scopes(room_id, area_id):
+    return (f"room:{room_id}" if room_id else None, f"area:{area_id}" if area_id else None)
+
+@receiver([post_save, post_delete], sender=Bookings)
+def touch_booking(sender, instance, **kwargs):
+    """Refresh the booking detail ETag and the room/area details that show active bookings"""
+    scopes = [f"booking:{instance.pk}", *_property_scopes(instance.room_id, instance.area_id)]
+    previous = getattr(instance, '_ledger_state', None)
+    if previous:
+        previous = dict(zip(Bookings.LEDGER_FIELDS, previous))
+        scopes.extend(_property_scopes(previous['room_id'], previous['area_id']))
+    touch(*scopes)
+
+@receiver([post_save, post_delete], sender=Transactions)
+def touch_booking_payments(sender, instance, **kwargs):
+    if instance.booking_id:
+        touch(f"booking:{instance.booking_id}")
+
+@receiver([post_save, post_delete], sender=Reviews)
+def touch_reviewed(sender, instance, **kwargs):
+    """Reviews feed ratings on the lists and the review sections of the details"""
+    touch(
+        f"booking:{instance.booking_id}" if instance.booking_id else None,
+        'rooms' if instance.room_id else None,
+        'areas' if instance.area_id else None,
+        *_property_scopes(instance.room_id, instance.area_id),
+    )
@@ -1,3 +1,811 @@
-from django.test import TestCase
+import threading
+import time
+from importlib import import_module
+from datetime import date, time as dt_time, timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import msgpack
+from django.apps import apps as django_apps
+from django.core.cache import cache
+from django.db import IntegrityError, connection, connections, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from booking.checks import check_shared_cache
+from booking.models import AreaSlot, Bookings, Reviews, RoomNight, Transactions
+from booking.service import availability, availability_cache, holds
+from booking.service.availability import AvailabilityIndex, _ResourceIntervals, _stay_end
+from booking.service.commit import BookingConflict, commit_booking
+from booking.service.ledger import rebuild_ledger
+from booking.service.slots import SLOTS_PER_DAY, slot_mask
+from booking.validations.booking import validate_booking_request
+from hotel_backend.testing import EndpointBudgetMixin
+from property.models import Areas, Rooms
+from user_roles.models import CustomUsers, Notification
+
+
+class BookingEndpointBudgetTests(EndpointBudgetMixin, TestCase):
+    """Query/latency budgets for /booking/** GET routes."""
+
+    def test_availability(self):
+        arrival = self.month_start + timedelta(days=3)
+        self.assertWithinBudget(f"/booking/availability?arrival={arrival}&departure={arrival + timedelta(days=2)}", 8)
+
+    def test_flexible_availability(self):
+        start = timezone.localdate() + timedelta(days=1)
+        self.assertWithinBudget(f"/booking/availability/flex?start={start}&nights=2&horizon=60", 4)
+
+    def test_bookings_list(self):
+        self.assertWithinBudget('/booking/bookings?page_size=30', 6)
+
+    def test_bookings_list_sparse(self):
+        response = self.assertWithinBudget('/booking/bookings?page_size=30&fields=id,status,check_in_date', 2)
+        self.assertEqual(set(response.json()['data'][0]), {'id', 'status', 'check_in_date'})
+
+    def test_bookings_list_expand(self):
+        response = self.assertWithinBudget('/booking/bookings?page_size=30&fields=id,total_amount&expand=room_details', 4)
+        self.assertEqual(set(response.json()['data'][0]), {'id', 'total_amount', 'room_details'})
+
+    def test_booking_detail(self):
+        self.assertWithinBudget(f"/booking/bookings/{self.booking.id}", 6)
+
+    def test_booking_reviews(self):
+        self.assertWithinBudget(f"/booking/bookings/{self.booking.id}/reviews", 4, user=self.guest)
+
+    def test_user_bookings(self):
+        self.assertWithinBudget('/booking/user/bookings?page_size=20', 9, user=self.guest)
+
+    def test_user_reviews(self):
+        self.assertWithinBudget('/booking/user/reviews', 2, user=self.guest)
+
+    def test_reservation_list(self):
+        self.assertWithinBudget('/booking/reservation', 6)
+
+    def test_reservation_detail(self):
+        self.assertWithinBudget(f"/booking/reservation/{self.booking.id}", 10)
+
+    def test_review_detail(self):
+        review = Reviews.objects.filter(user=self.guest).first()
+        self.assertWithinBudget(f"/booking/reviews/{review.id}", 4, user=self.guest)
+
+    def test_area_reservations(self):
+        self.assertWithinBudget('/booking/areas', 4)
+
+    def test_area_detail(self):
+        self.assertWithinBudget(f"/booking/areas/{self.area.id}", 4)
+
+    def test_area_bookings(self):
+        self.assertWithinBudget(f"/booking/areas/{self.area.id}/bookings", 1)
+
+    def test_area_slots(self):
+        self.assertWithinBudget(f"/booking/areas/{self.area.id}/slots?date={self.month_start}", 3)
+
+    def test_area_reviews(self):
+        self.assertWithinBudget(f"/booking/areas/{self.area.id}/reviews?page=1&page_size=10", 2)
+
+    def test_room_detail(self):
+        self.assertWithinBudget(f"/booking/rooms/{self.room.id}", 5)
+
+    def test_room_bookings(self):
+        self.assertWithinBudget(f"/booking/rooms/{self.room.id}/bookings", 1)
+
+    def test_room_reviews(self):
+        self.assertWithinBudget(f"/booking/rooms/{self.room.id}/reviews?page=1&page_size=10", 2)
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentBookingCommitTests(TransactionTestCase):
+    """50 parallel bookers through the locked commit path (needs row locks, i.e. PostgreSQL)."""
+
+    BOOKERS = 50
+
+    def setUp(self):
+        self.users = [
+            CustomUsers.objects.create(username=f"booker{i}", email=f"booker{i}@example.com", role='guest')
+            for i in range(self.BOOKERS)
+        ]
+        self.check_in = timezone.localdate() + timedelta(days=7)
+        self.check_out = self.check_in + timedelta(days=2)
+
+    def _run_bookers(self, rooms):
+        results = [None] * self.BOOKERS
+        start = threading.Barrier(self.BOOKERS)
+
+        def book(index):
+            try:
+                start.wait()
+                commit_booking(
+                    user=self.users[index],
+                    room=rooms[index],
+                    area=None,
+                    check_in_date=self.check_in,
+                    check_out_date=self.check_out,
+                    status='pending',
+                    is_venue_booking=False,
+                )
+                results[index] = 'booked'
+            except BookingConflict:
+                results[index] = 'conflict'
+            except Exception as e:
+                results[index] = repr(e)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=book, args=(i,)) for i in range(self.BOOKERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_parallel_bookers_on_different_rooms_all_succeed(self):
+        rooms = [Rooms.objects.create(room_name=f"Room {i}", room_price=1000) for i in range(self.BOOKERS)]
+
+        results = self._run_bookers(rooms)
+
+        self.assertEqual(results, ['booked'] * self.BOOKERS)
+        self.assertEqual(Bookings.objects.count(), self.BOOKERS)
+
+    def test_parallel_bookers_on_same_room_never_double_book(self):
+        room = Rooms.objects.create(room_name="Contested Room", room_price=1000)
+
+        results = self._run_bookers([room] * self.BOOKERS)
+
+        self.assertEqual(results.count('booked'), 1, results)
+        self.assertEqual(results.count('conflict'), self.BOOKERS - 1, results)
+        self.assertEqual(Bookings.objects.filter(room=room).count(), 1)
+
+
+class CursorPaginationTests(EndpointBudgetMixin, TestCase):
+    """?cursor= keyset pagination walks every row once, ties on created_at included."""
+
+    def _walk(self, url, user=None, key='data'):
+        client = APIClient()
+        client.force_authenticate(user or self.admin)
+        ids, cursor = [], ''
+        while cursor is not None:
+            body = client.get(f"{url}&cursor={cursor}").json()
+            ids.extend(row['id'] for row in body[key])
+            cursor = body['pagination']['next_cursor'] if 'pagination' in body else body['next_cursor']
+        return ids
+
+    def test_bookings_walk_every_row_once(self):
+        # Same timestamp on a run of rows so only the id tie-break keeps pages apart
+        Bookings.objects.filter(id__lte=10).update(created_at=timezone.now())
+        expected = list(Bookings.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+        self.assertEqual(self._walk('/booking/bookings?page_size=7'), expected)
+
+    def test_admin_bookings_walk_oldest_first(self):
+        expected = list(
+            Bookings.objects.filter(status='confirmed').order_by('created_at', 'id').values_list('id', flat=True)
+        )
+        self.assertEqual(self._walk('/master/bookings?status=confirmed&page_size=4'), expected)
+
+    def test_notifications_walk(self):
+        expected = list(
+            Notification.objects.filter(user=self.guest).order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(self._walk('/api/guest/notifications?limit=3', self.guest, key='notifications'), expected)
+
+    def test_cursor_page_skips_count(self):
+        response = self.assertWithinBudget('/booking/bookings?page_size=30&cursor=', 5)
+        self.assertNotIn('total_items', response.json()['pagination'])
+
+        response = self.assertWithinBudget('/booking/bookings?page_size=30&cursor=&count=true', 6)
+        self.assertEqual(response.json()['pagination']['total_items'], Bookings.objects.count())
+
+    def test_invalid_cursor(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        self.assertEqual(client.get('/booking/bookings?cursor=not-a-cursor').status_code, 400)
+
+
+class BookingConditionalGetTests(EndpointBudgetMixin, TestCase):
+    def test_booking_detail_revalidates_until_paid(self):
+        client = APIClient()
+        client.force_authenticate(self.guest)
+        url = f"/booking/bookings/{self.booking.id}"
+        etag = client.get(url)['ETag']
+
+        with self.assertNumQueries(1):
+            self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Transactions.objects.create(
+                booking=self.booking, user=self.guest, transaction_type='booking', amount=500,
+                transaction_date=timezone.now(), status='completed',
+            )
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_bulk_status_update_refreshes_etag(self):
+        client = APIClient()
+        client.force_authenticate(self.guest)
+        url = f"/booking/bookings/{self.booking.id}"
+        etag = client.get(url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Bookings.objects.filter(id=self.booking.id).update(special_request='Late check-in')
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_other_guests_never_revalidate(self):
+        client = APIClient()
+        client.force_authenticate(self.guest)
+        url = f"/booking/bookings/{self.booking.id}"
+        etag = client.get(url)['ETag']
+
+        client.force_authenticate(self.guests[1])
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn('ETag', response)
+
+        client.force_authenticate(None)
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 401)
+
+    def test_writes_ignore_validators(self):
+        client = APIClient()
+        client.force_authenticate(self.guest)
+        url = f"/booking/bookings/{self.booking.id}"
+        etag = client.get(url)['ETag']
+
+        response = client.put(url, {'special_request': 'Extra pillows'}, format='json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        response = client.put(url, {'special_request': 'Late check-in'}, format='json', HTTP_IF_MATCH='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Bookings.objects.get(id=self.booking.id).special_request, 'Late check-in')
+
+        self.assertEqual(client.delete(url, HTTP_IF_NONE_MATCH='*').status_code, 204)
+        self.assertFalse(Bookings.objects.filter(id=self.booking.id).exists())
+
+
+class MessagePackNegotiationTests(EndpointBudgetMixin, TestCase):
+    def test_lists_in_msgpack_match_json(self):
+        client = APIClient()
+        for user, url in (
+            (self.admin, '/booking/bookings?page_size=20'),
+            (self.admin, '/property/rooms'),
+            (self.guest, '/api/guest/notifications?limit=20'),
+        ):
+            client.force_authenticate(user)
+            packed = client.get(url, HTTP_ACCEPT='application/msgpack')
+            self.assertEqual(packed.status_code, 200)
+            self.assertEqual(packed['Content-Type'], 'application/msgpack')
+            self.assertEqual(msgpack.unpackb(packed.content), client.get(url).json())
+
+    def test_etag_depends_on_format(self):
+        client = APIClient()
+        client.force_authenticate(self.guest)
+        url = f"/booking/bookings/{self.booking.id}"
+        etag = client.get(url)['ETag']
+        packed = client.get(url, HTTP_ACCEPT='application/msgpack', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(packed.status_code, 200)
+        self.assertEqual(msgpack.unpackb(packed.content)['data']['id'], self.booking.id)
+
+        not_modified = client.get(url, HTTP_ACCEPT='application/msgpack', HTTP_IF_NONE_MATCH=packed['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        for response in (packed, not_modified):
+            self.assertIn('Accept', response['Vary'])
+
+
+class AvailabilityIndexTests(TestCase):
+    """The in-memory index answers like the bookings table and follows writes across processes."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUsers.objects.create(username='index-guest', email='index@example.com', role='guest')
+        self.rooms = [Rooms.objects.create(room_name=f"Room {i}", room_price=1000) for i in range(3)]
+        self.area = Areas.objects.create(area_name='Garden', capacity=50, price_per_hour=800)
+        self.check_in = timezone.localdate() + timedelta(days=5)
+        self.check_out = self.check_in + timedelta(days=2)
+
+    def _book(self, room, status='confirmed', **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Bookings.objects.create(
+                user=self.user, room=room, check_in_date=self.check_in, check_out_date=self.check_out,
+                status=status, **fields
+            )
+
+    def _blocked(self, index, kind='room', arrival=None, departure=None):
+        return index.blocked_ids(kind, arrival or self.check_in, departure or self.check_out)
+
+    def test_interval_overlap(self):
+        intervals = _ResourceIntervals()
+        intervals.add(1, date(2025, 3, 10), date(2025, 3, 12))
+        intervals.add(2, date(2025, 3, 1), date(2025, 3, 20))
+        intervals.remove(2)
+
+        # Stays are half-open, so back-to-back stays do not overlap
+        self.assertFalse(intervals.overlaps(date(2025, 3, 12), date(2025, 3, 14)))
+        self.assertFalse(intervals.overlaps(date(2025, 3, 8), date(2025, 3, 10)))
+        self.assertTrue(intervals.overlaps(date(2025, 3, 11), date(2025, 3, 12)))
+        self.assertTrue(intervals.overlaps(date(2025, 3, 1), date(2025, 3, 30)))
+
+        # A long stay hidden behind a later start is still found through the running max
+        intervals.add(3, date(2025, 3, 2), date(2025, 3, 25))
+        self.assertTrue(intervals.overlaps(date(2025, 3, 20), date(2025, 3, 21)))
+
+    def test_follows_writes(self):
+        index = availability.availability_index
+        booking = self._book(self.rooms[0])
+        self.assertEqual(self._blocked(index), {self.rooms[0].id})
+
+        booking.room = self.rooms[1]
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.save()
+        self.assertEqual(self._blocked(index), {self.rooms[1].id})
+
+        booking.status = 'cancelled'
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.save()
+        self.assertEqual(self._blocked(index), set())
+
+    def test_venue_holds_check_out_day(self):
+        self._book(None, area=self.area, is_venue_booking=True)
+        index = AvailabilityIndex()
+        self.assertEqual(self._blocked(index, 'area', self.check_out, self.check_out + timedelta(days=1)), {self.area.id})
+
+    def test_other_process_reloads_only_touched_properties(self):
+        other = AvailabilityIndex()
+        self._book(self.rooms[0])
+        self.assertEqual(self._blocked(other), {self.rooms[0].id})
+
+        booking = self._book(self.rooms[1])
+        with mock.patch.object(other, 'load', side_effect=AssertionError('full reload')), self.assertNumQueries(1):
+            self.assertEqual(self._blocked(other), {self.rooms[0].id, self.rooms[1].id})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.delete()
+        with mock.patch.object(other, 'load', side_effect=AssertionError('full reload')):
+            self.assertEqual(self._blocked(other), {self.rooms[0].id})
+
+    def test_bulk_update_reaches_other_processes(self):
+        other = AvailabilityIndex()
+        self._book(self.rooms[0])
+        self.assertEqual(self._blocked(other), {self.rooms[0].id})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Bookings.objects.filter(room=self.rooms[0]).update(status='cancelled')
+        with mock.patch.object(other, 'load', side_effect=AssertionError('full reload')):
+            self.assertEqual(self._blocked(other), set())
+
+    def test_cache_flush_reloads(self):
+        self._book(self.rooms[0])
+        cache.clear()
+        other = AvailabilityIndex()
+        self.assertEqual(self._blocked(other), {self.rooms[0].id})
+
+        # The booking is cancelled behind the index's back, then the shared cache is flushed again
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE bookings SET status = 'cancelled'")
+        cache.clear()
+        self.assertEqual(self._blocked(other), set())
+
+    def test_expired_change_reloads_everything(self):
+        other = AvailabilityIndex()
+        self.assertEqual(self._blocked(other), set())
+        self._book(self.rooms[2])
+        cache.delete(availability.CHANGE_CACHE_KEY.format(cache.get(availability.VERSION_CACHE_KEY)))
+
+        with mock.patch.object(other, 'load', wraps=other.load) as load:
+            self.assertEqual(self._blocked(other), {self.rooms[2].id})
+        load.assert_called_once()
+
+
+
+class AvailabilityCacheTests(TestCase):
+    """A booking write evicts exactly the cached searches covering the days it holds."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUsers.objects.create(username='cache-guest', email='cache@example.com', role='guest')
+        self.room = Rooms.objects.create(room_name='Room', room_price=1000)
+        self.area = Areas.objects.create(area_name='Garden', capacity=50, price_per_hour=800)
+        self.day = timezone.localdate() + timedelta(days=10)
+        self.searches = {
+            offset: (self.day + timedelta(days=offset), self.day + timedelta(days=offset + 2))
+            for offset in (-3, -1, 1, 3)
+        }
+
+    def _recomputed(self):
+        """Offsets of the searches that missed the cache."""
+        with mock.patch.object(availability_cache, 'find_blocked_ids', wraps=availability_cache.find_blocked_ids) as find:
+            missed = set()
+            for offset, (arrival, departure) in self.searches.items():
+                calls = find.call_count
+                availability_cache.blocked_ids(arrival, departure)
+                if find.call_count > calls:
+                    missed.add(offset)
+        return missed
+
+    def test_room_write_evicts_its_nights(self):
+        self.assertEqual(self._recomputed(), set(self.searches))
+        self.assertEqual(self._recomputed(), set())
+
+        # Holds the nights of day and day + 1
+        with self.captureOnCommitCallbacks(execute=True):
+            booking = Bookings.objects.create(
+                user=self.user, room=self.room, status='confirmed',
+                check_in_date=self.day, check_out_date=self.day + timedelta(days=2),
+            )
+        self.assertEqual(self._recomputed(), {-1, 1})
+        self.assertEqual(availability_cache.blocked_ids(*self.searches[1])[0], {self.room.id})
+
+        # Moving the stay evicts the old and the new nights
+        booking.check_in_date += timedelta(days=3)
+        booking.check_out_date += timedelta(days=3)
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.save()
+        self.assertEqual(self._recomputed(), {-1, 1, 3})
+
+    def test_venue_write_evicts_its_check_out_day(self):
+        self._recomputed()
+        with self.captureOnCommitCallbacks(execute=True):
+            Bookings.objects.create(
+                user=self.user, area=self.area, is_venue_booking=True, status='confirmed',
+                check_in_date=self.day - timedelta(days=2), check_out_date=self.day - timedelta(days=1),
+            )
+        self.assertEqual(self._recomputed(), {-3, -1})
+
+    def test_delete_evicts(self):
+        booking = Bookings.objects.create(
+            user=self.user, room=self.room, status='confirmed',
+            check_in_date=self.day + timedelta(days=3), check_out_date=self.day + timedelta(days=4),
+        )
+        self._recomputed()
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.delete()
+        self.assertEqual(self._recomputed(), {3})
+
+class BookingRangeTests(TestCase):
+    """Calendar listings and the no-overlap exclusion constraints."""
+
+    def setUp(self):
+        self.user = CustomUsers.objects.create(username='range-guest', email='range@example.com', role='guest')
+        self.room = Rooms.objects.create(room_name='Room', room_price=1000)
+        self.area = Areas.objects.create(area_name='Garden', capacity=50, price_per_hour=800)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _listed(self, url, start, end):
+        response = self.client.get(f"{url}?start_date={start}&end_date={end}")
+        self.assertEqual(response.status_code, 200)
+        return {row['id'] for row in response.json()['data']}
+
+    def test_listings_include_check_out_day(self):
+        stay = Bookings.objects.create(
+            user=self.user, room=self.room, check_in_date=date(2025, 3, 8), check_out_date=date(2025, 3, 10),
+            status='confirmed',
+        )
+        venue = Bookings.objects.create(
+            user=self.user, area=self.area, is_venue_booking=True, status='confirmed',
+            check_in_date=date(2025, 3, 10), check_out_date=date(2025, 3, 10),
+        )
+        self.assertEqual(self._listed(f"/booking/rooms/{self.room.id}/bookings", '2025-03-10', '2025-03-12'), {stay.id})
+        self.assertEqual(self._listed(f"/booking/rooms/{self.room.id}/bookings", '2025-03-11', '2025-03-12'), set())
+        self.assertEqual(self._listed(f"/booking/areas/{self.area.id}/bookings", '2025-03-10', '2025-03-10'), {venue.id})
+        self.assertEqual(self._listed(f"/booking/areas/{self.area.id}/bookings", '2025-03-11', '2025-03-11'), set())
+
+    @skipUnless(connection.vendor == 'postgresql', 'exclusion constraints are PostgreSQL only')
+    def test_venue_without_times_holds_whole_day(self):
+        day = date(2025, 3, 10)
+        Bookings.objects.create(
+            user=self.user, area=self.area, is_venue_booking=True, status='confirmed',
+            check_in_date=day, check_out_date=day,
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Bookings.objects.create(
+                user=self.user, area=self.area, is_venue_booking=True, status='reserved',
+                check_in_date=day, check_out_date=day, start_time=dt_time(9, 0), end_time=dt_time(12, 0),
+            )
+        # The next day and inactive bookings stay free
+        Bookings.objects.create(
+            user=self.user, area=self.area, is_venue_booking=True, status='confirmed',
+            check_in_date=day + timedelta(days=1), check_out_date=day + timedelta(days=1),
+            start_time=dt_time(0, 0), end_time=dt_time(9, 0),
+        )
+        Bookings.objects.create(
+            user=self.user, area=self.area, is_venue_booking=True, status='cancelled',
+            check_in_date=day, check_out_date=day,
+        )
+
+    def test_overlapping_follows_stay_end(self):
+        day = date(2025, 3, 10)
+        bookings = [
+            Bookings.objects.create(
+                user=self.user, room=None if venue else self.room, area=self.area if venue else None,
+                is_venue_booking=venue, status='pending', check_in_date=day, check_out_date=day + timedelta(days=length),
+            )
+            for venue in (False, True) for length in (0, 1, 2)
+        ]
+        for offset in range(-1, 4):
+            start = day + timedelta(days=offset)
+            expected = {
+                booking.id for booking in bookings
+                if booking.check_in_date < start + timedelta(days=1)
+                and _stay_end(booking.check_in_date, booking.check_out_date, booking.is_venue_booking) > start
+            }
+            found = set(Bookings.objects.overlapping(start, start + timedelta(days=1)).values_list('id', flat=True))
+            self.assertEqual(found, expected, start)
+
+    @skipUnless(connection.vendor == 'postgresql', 'stay_range is PostgreSQL only')
+    def test_stay_range_column_matches_stay_end(self):
+        day = date(2025, 3, 10)
+        for venue in (False, True):
+            for length in (0, 1, 2):
+                booking = Bookings.objects.create(
+                    user=self.user, room=None if venue else self.room, area=self.area if venue else None,
+                    is_venue_booking=venue, status='pending', check_in_date=day, check_out_date=day + timedelta(days=length),
+                )
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT upper(stay_range) FROM bookings WHERE id = %s", [booking.id])
+                    self.assertEqual(cursor.fetchone()[0], _stay_end(booking.check_in_date, booking.check_out_date, venue))
+
+    def test_venue_request_accepts_seconds(self):
+        self.user.first_name, self.user.last_name = 'Ana', 'Cruz'
+        self.user.save()
+        day = timezone.localdate() + timedelta(days=10)
+        response = self.client.post('/booking/bookings', {
+            'firstName': 'Ana', 'lastName': 'Cruz', 'phoneNumber': '09171234567', 'roomId': str(self.area.id),
+            'checkIn': str(day), 'checkOut': str(day), 'isVenueBooking': True, 'totalPrice': '2400',
+            'startTime': '09:00:00', 'endTime': '12:30:00', 'numberOfGuests': 10,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        booking = Bookings.objects.get(id=response.json()['id'])
+        self.assertEqual((booking.start_time, booking.end_time), (dt_time(9, 0), dt_time(12, 30)))
+
+
+    def test_pending_bookings_block_requests_and_holds(self):
+        day = timezone.localdate() + timedelta(days=10)
+        other = CustomUsers.objects.create(username='range-other', email='other@example.com', role='guest')
+        Bookings.objects.create(
+            user=other, room=self.room, status='pending', check_in_date=day, check_out_date=day + timedelta(days=2),
+        )
+        Bookings.objects.create(
+            user=other, area=self.area, is_venue_booking=True, status='pending',
+            check_in_date=day, check_out_date=day, start_time=dt_time(9, 0), end_time=dt_time(12, 0),
+        )
+
+        # Validation turns away what the locked commit path would
+        room_request = {'checkIn': day + timedelta(days=1), 'checkOut': day + timedelta(days=3)}
+        self.assertIn('room', validate_booking_request(room_request, self.room))
+        venue_request = {
+            'isVenueBooking': True, 'roomId': self.area.id, 'checkIn': day, 'checkOut': day,
+            'startTime': '11:00', 'endTime': '13:00',
+        }
+        self.assertIn('area', validate_booking_request(venue_request, None))
+        venue_request.update(startTime='12:00', endTime='15:00')
+        self.assertNotIn('area', validate_booking_request(venue_request, None))
+
+        for payload in (
+            {'room_id': self.room.id, 'check_in': day + timedelta(days=1), 'check_out': day + timedelta(days=2)},
+            {'area_id': self.area.id, 'check_in': day, 'check_out': day, 'start_time': '11:00', 'end_time': '13:00'},
+        ):
+            self.assertEqual(self.client.post('/booking/holds', payload, format='json').status_code, 409)
+
+    def test_missed_reservations_free_the_room(self):
+        day = timezone.localdate() + timedelta(days=10)
+        other = CustomUsers.objects.create(username='range-other', email='other@example.com', role='guest')
+        missed = Bookings.objects.create(
+            user=other, room=self.room, status='missed_reservation', check_in_date=day, check_out_date=day + timedelta(days=2),
+        )
+        self.assertFalse(RoomNight.objects.filter(booking=missed).exists())
+        self.assertNotIn(self.room.id, availability.find_blocked_ids('room', day, day + timedelta(days=2)))
+        self.assertNotIn('room', validate_booking_request({'checkIn': day, 'checkOut': day + timedelta(days=2)}, self.room))
+
+        payload = {'room_id': self.room.id, 'check_in': day, 'check_out': day + timedelta(days=2)}
+        self.assertEqual(self.client.post('/booking/holds', payload, format='json').status_code, 201)
+        booking = commit_booking(
+            user=self.user, room=self.room, status='pending', check_in_date=day, check_out_date=day + timedelta(days=2),
+        )
+        self.assertEqual(RoomNight.objects.filter(booking=booking).count(), 2)
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    def test_process_local_cache_fails_the_deploy_check(self):
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.assertEqual([error.id for error in check_shared_cache(None)], ['booking.E001'])
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache'}}):
+            self.assertEqual(check_shared_cache(None), [])
+
+
+class SlotMaskTests(SimpleTestCase):
+    def _slots(self, start, end):
+        mask = slot_mask(start, end)
+        return [index for index in range(SLOTS_PER_DAY) if mask >> index & 1]
+
+    def test_whole_day(self):
+        self.assertEqual(self._slots(None, None), list(range(SLOTS_PER_DAY)))
+        self.assertEqual(self._slots('00:00', None), list(range(SLOTS_PER_DAY)))
+
+    def test_midnight(self):
+        # An end at midnight closes the day that starts, a bare 00:00 end holds nothing of it
+        self.assertEqual(self._slots('22:00', '00:00'), [44, 45, 46, 47])
+        self.assertEqual(self._slots(None, '00:00'), [])
+        self.assertEqual(self._slots(None, '00:30'), [0])
+
+    def test_seconds(self):
+        self.assertEqual(slot_mask('09:00:00', '10:00:00'), slot_mask('09:00', '10:00'))
+        self.assertEqual(self._slots(dt_time(9, 15, 30), '10:00:01'), [18, 19, 20])
+
+    def test_end_before_start_runs_to_midnight(self):
+        self.assertEqual(self._slots('23:00', '02:00'), [46, 47])
+        self.assertEqual(self._slots('10:00', '10:00'), list(range(20, SLOTS_PER_DAY)))
+
+
+class LedgerTests(TestCase):
+    """RoomNight/AreaSlot rows follow every write to a booking."""
+
+    def setUp(self):
+        self.user = CustomUsers.objects.create(username='ledger-guest', email='ledger@example.com', role='guest')
+        self.rooms = [Rooms.objects.create(room_name=f"Room {i}", room_price=1000) for i in range(2)]
+        self.area = Areas.objects.create(area_name='Garden', capacity=50, price_per_hour=800)
+        self.booking = Bookings.objects.create(
+            user=self.user, room=self.rooms[0], status='reserved',
+            check_in_date=date(2025, 3, 10), check_out_date=date(2025, 3, 12),
+        )
+
+    def _nights(self):
+        return sorted(RoomNight.objects.values_list('room_id', 'night', 'status'))
+
+    def _slots(self):
+        return sorted(AreaSlot.objects.values_list('area_id', 'date', 'start_time', 'end_time', 'status'))
+
+    def test_status_change(self):
+        self.booking.status = 'checked_in'
+        self.booking.save()
+        self.assertEqual(self._nights(), [
+            (self.rooms[0].id, date(2025, 3, 10), 'checked_in'),
+            (self.rooms[0].id, date(2025, 3, 11), 'checked_in'),
+        ])
+
+        self.booking.status = 'cancelled'
+        self.booking.save()
+        self.assertEqual(self._nights(), [])
+
+    def test_date_and_room_change(self):
+        self.booking.check_out_date = date(2025, 3, 13)
+        self.booking.room = self.rooms[1]
+        self.booking.save()
+        self.assertEqual([night[:2] for night in self._nights()], [
+            (self.rooms[1].id, date(2025, 3, 10)),
+            (self.rooms[1].id, date(2025, 3, 11)),
+            (self.rooms[1].id, date(2025, 3, 12)),
+        ])
+
+    def test_bulk_update(self):
+        Bookings.objects.filter(pk=self.booking.pk).update(check_in_date=date(2025, 3, 11))
+        self.assertEqual([night[1] for night in self._nights()], [date(2025, 3, 11)])
+
+    def test_venue_days(self):
+        Bookings.objects.create(
+            user=self.user, area=self.area, is_venue_booking=True, status='confirmed',
+            check_in_date=date(2025, 3, 10), check_out_date=date(2025, 3, 11),
+            start_time=dt_time(18, 0), end_time=dt_time(2, 0),
+        )
+        self.assertEqual(self._slots(), [
+            (self.area.id, date(2025, 3, 10), dt_time(18, 0), None, 'confirmed'),
+            (self.area.id, date(2025, 3, 11), None, dt_time(2, 0), 'confirmed'),
+        ])
+
+    def test_delete(self):
+        self.booking.delete()
+        self.assertEqual(self._nights(), [])
+
+    def test_migration_backfill_matches_rebuild(self):
+        Bookings.objects.create(
+            user=self.user, area=self.area, is_venue_booking=True, status='pending',
+            check_in_date=date(2025, 3, 10), check_out_date=date(2025, 3, 10), start_time=dt_time(9, 0),
+        )
+        rebuild_ledger()
+        expected = self._nights(), self._slots()
+
+        RoomNight.objects.all().delete()
+        AreaSlot.objects.all().delete()
+        import_module('booking.migrations.0004_ledger').backfill_ledger(django_apps, None)
+        self.assertEqual((self._nights(), self._slots()), expected)
+
+
+class HoldTests(TestCase):
+    """Room nights and venue slots held in the cache, and who they keep out."""
+
+    def setUp(self):
+        cache.clear()
+        self.guest, self.other = [
+            CustomUsers.objects.create(username=f"hold-guest{i}", email=f"hold{i}@example.com", role='guest')
+            for i in range(2)
+        ]
+        self.room = Rooms.objects.create(room_name='Room', room_price=1000)
+        self.area = Areas.objects.create(area_name='Garden', capacity=50, price_per_hour=800)
+        self.day = timezone.localdate() + timedelta(days=10)
+
+    def _room_hold(self, user, offset=0, nights=2):
+        check_in = self.day + timedelta(days=offset)
+        return holds.place_hold('room', self.room.id, check_in, check_in + timedelta(days=nights), user.id)
+
+    def _area_hold(self, user, start_time, end_time):
+        return holds.place_hold(
+            'area', self.area.id, self.day, self.day, user.id, start_time=start_time, end_time=end_time
+        )
+
+    def _room_held_for(self, user, offset=0, nights=2):
+        check_in = self.day + timedelta(days=offset)
+        return holds.held_ids('room', [self.room.id], check_in, check_in + timedelta(days=nights), user_id=user.id)
+
+    def test_room_hold_keeps_others_out(self):
+        hold = self._room_hold(self.guest)
+        self.assertIsNone(self._room_hold(self.other, offset=1))
+        self.assertEqual(self._room_held_for(self.other, offset=1), {self.room.id})
+        self.assertEqual(self._room_held_for(self.other, offset=2), set())
+        self.assertEqual(self._room_held_for(self.guest), set())
+        self.assertEqual(holds.held_ids('room', [self.room.id], self.day, self.day + timedelta(days=1), token=hold['token']), set())
+
+    def test_owner_can_re_hold(self):
+        first = self._room_hold(self.guest)
+        second = self._room_hold(self.guest, offset=1)
+        self.assertIsNotNone(second)
+        self.assertIsNone(self._room_hold(self.other, offset=1))
+
+        # Releasing the first hold leaves the nights the second one took over
+        holds.release_hold(first['token'])
+        self.assertEqual(self._room_held_for(self.other), {self.room.id})
+        self.assertIsNotNone(self._room_hold(self.other, offset=-2))
+
+    def test_failed_hold_gives_back_what_it_claimed(self):
+        self._room_hold(self.other, offset=1, nights=1)
+        mine = self._room_hold(self.guest, offset=2, nights=1)
+        self.assertIsNone(self._room_hold(self.guest, offset=0, nights=3))
+
+        self.assertEqual(self._room_held_for(self.other, offset=0, nights=1), set())
+        self.assertEqual(self._room_held_for(self.other, offset=2, nights=1), {self.room.id})
+        self.assertEqual(holds.get_hold(mine['token'])['check_in'], (self.day + timedelta(days=2)).isoformat())
+
+    def test_release(self):
+        hold = self._room_hold(self.guest)
+        self.assertTrue(holds.release_hold(hold['token']))
+        self.assertIsNone(holds.get_hold(hold['token']))
+        self.assertEqual(self._room_held_for(self.other), set())
+        self.assertFalse(holds.release_hold(hold['token']))
+
+    def test_expiry(self):
+        hold = holds.place_hold('room', self.room.id, self.day, self.day + timedelta(days=1), self.guest.id, minutes=1)
+        with mock.patch('time.time', return_value=time.time() + 61):
+            self.assertIsNone(holds.get_hold(hold['token']))
+            self.assertEqual(self._room_held_for(self.other, nights=1), set())
+            self.assertIsNotNone(self._room_hold(self.other, nights=1))
+
+    def test_venue_slots(self):
+        morning = self._area_hold(self.guest, '09:00', '12:00')
+        self.assertEqual((morning['start_time'], morning['end_time']), ('09:00:00', '12:00:00'))
+        self.assertIsNotNone(self._area_hold(self.other, '12:00', '15:00'))
+        self.assertIsNone(self._area_hold(self.other, '11:30:00', '13:00'))
+
+        def held_for(user, start_time, end_time):
+            return holds.held_ids(
+                'area', [self.area.id], self.day, self.day, user_id=user.id, as_booking=True,
+                start_time=start_time, end_time=end_time,
+            )
+
+        self.assertEqual(held_for(self.other, '08:00', '09:00'), set())
+        self.assertEqual(held_for(self.other, '08:00', '09:30'), {self.area.id})
+        self.assertEqual(held_for(self.guest, '15:00', '18:00'), set())
+        self.assertEqual(held_for(self.guest, '14:30', '18:00'), {self.area.id})
+        # A plain date search counts any hold on the day
+        self.assertEqual(holds.held_ids('area', [self.area.id], self.day, self.day + timedelta(days=1)), {self.area.id})
+
+        holds.release_hold(morning['token'])
+        self.assertEqual(held_for(self.other, '08:00', '12:00'), set())
+
+    def test_flex_search_skips_held_nights(self):
+        client = APIClient()
+        self._room_hold(self.guest, nights=3)
+
+        def windows(user):
+            client.force_authenticate(user)
+            response = client.get(f"/booking/availability/flex?start={self.day}&nights=1&horizon=5")
+            self.assertEqual(response.status_code, 200, response.content)
+            return [row['check_in'] for row in response.json()['data']]
+
+        free = [str(self.day + timedelta(days=offset)) for offset in range(5)]
+        self.assertEqual(sorted(windows(self.other)), free[3:])
+        self.assertEqual(sorted(windows(self.guest)), free)
@@ -4,6 +4,9 @@ from . import views
 # /booking/** routes
 urlpatterns = [
     path('availability', views.fetch_availability, name='availability'),
+    path('availability/flex', views.fetch_flexible_availability, name='flexible_availability'),
+    path('holds', views.create_hold, name='create_hold'),
+    path('holds/<str:token>', views.hold_detail, name='hold_detail'),
     path('bookings', views.bookings_list, name='bookings_list'),
     path('bookings/<str:booking_id>', views.booking_detail, name='booking_detail'),
     path('bookings/<str:booking_id>/cancel', views.cancel_booking, name='cancel_booking'),
@@ -16,6 +19,7 @@ urlpatterns = [
     path('areas', views.area_reservations, name='area_reservations'),
     path('areas/<str:area_id>', views.area_detail, name='area_detail'),
     path('areas/<str:area_id>/bookings', views.fetch_area_bookings, name='area_bookings'),
+    path('areas/<int:area_id>/slots', views.fetch_area_slots, name='area_slots'),
     path('areas/<int:area_id>/reviews', views.area_reviews, name='area_reviews'),
     path('rooms/<str:room_id>', views.room_detail, name='room_detail'),
     path('rooms/<int:room_id>/bookings', views.fetch_room_bookings, name='room_bookings'),
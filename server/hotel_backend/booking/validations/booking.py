@@ -3,6 +3,7 @@ from datetime import datetime
 from django.utils import timezone
 from rest_framework import serializers
 from booking.models import Bookings
+from booking.service.commit import area_taken, room_taken
 
 def validate_guest_name(name):
     """Validate guest name - letters and spaces only, minimum 2 characters"""
@@ -28,11 +29,9 @@ def validate_email(email, check_in_date=None, check_out_date=None, is_venue_book
     if not is_venue_booking and check_in_date and check_out_date:
         overlapping_bookings = Bookings.objects.filter(
             user__email=email,
-            check_in_date__lt=check_out_date,
-            check_out_date__gt=check_in_date,
             status__in=['pending', 'reserved', 'confirmed', 'checked_in'],
             is_venue_booking=False
-        )
+        ).overlapping(check_in_date, check_out_date)
         
         if overlapping_bookings.exists():
             raise serializers.ValidationError("You already have an active booking during this period")
@@ -224,16 +223,24 @@ def validate_booking_request(data, room):
         check_in = data.get('checkIn')
         check_out = data.get('checkOut')
         
-        overlapping_bookings = Bookings.objects.filter(
-            room=room,
-            check_in_date__lt=check_out,
-            check_out_date__gt=check_in,
-            status__in=['reserved', 'confirmed', 'checked_in']
-        )
-        
-        if overlapping_bookings.exists():
+        if room_taken(room.pk, check_in, check_out):
             errors['room'] = "This room is not available for the selected dates"
     
+    if is_venue_booking and data.get('roomId') and data.get('checkIn') and data.get('checkOut'):
+        try:
+            venue_taken = area_taken(
+                data.get('roomId'),
+                data.get('checkIn'),
+                data.get('checkOut'),
+                data.get('startTime'),
+                data.get('endTime')
+            )
+        except ValueError as e:
+            errors['time'] = str(e)
+        else:
+            if venue_taken:
+                errors['area'] = "This venue is already booked for the selected time"
+    
     if user and hasattr(user, 'last_booking_date') and user.role == 'guest' and data.get('checkIn'):
         check_in_date = data.get('checkIn')
         today = timezone.now().date()
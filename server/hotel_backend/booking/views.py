@@ -5,7 +5,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from .models import Bookings, Reviews
 from property.models import Rooms, Areas
-from property.serializers import AreaSerializer, RoomSerializer
+from property.serializers import AreaSerializer, RoomSerializer, AreaCardSerializer, RoomCardSerializer
 from .serializers import (
     BookingSerializer, 
     BookingRequestSerializer,
@@ -14,12 +14,18 @@ from .serializers import (
 from django.utils import timezone
 from rest_framework.permissions import IsAuthenticated
 from datetime import datetime
-from django.db.models import Q
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from .pdf_generator import EReceiptGenerator
 from django.views.decorators.csrf import csrf_exempt
 from django.http import HttpResponse
 from .service import paymongo as paymongo_service
+from .service import availability_cache
+from .service import holds as holds_service
+from .service import slots as slots_service
+from .service import flex as flex_service
+from .service import pagination as pagination_service
+from .service.commit import area_taken, room_taken
+from .service.conditional import booking_scopes, can_view_booking, conditional
 from django.http import HttpResponseRedirect
 import uuid
 from django.utils.http import urlencode
@@ -35,10 +41,6 @@ logger = logging.getLogger(__name__)
 def fetch_availability(request):
     arrival_date = request.query_params.get('arrival') or request.data.get('arrival')
     departure_date = request.query_params.get('departure') or request.data.get('departure')
-    exclude_statuses = request.query_params.get('exclude_statuses', '').split(',')
-    
-    if not exclude_statuses or '' in exclude_statuses:
-        exclude_statuses = ['reserved', 'checked_in']
     
     if not arrival_date or not departure_date:
         return Response({
@@ -58,34 +60,158 @@ def fetch_availability(request):
             'error': "Departure date should be greater than arrival date"
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    rooms = Rooms.objects.filter(status='available')
-    
-    booked_room_ids = Bookings.objects.filter(
-        ~Q(status__in=['cancelled', 'rejected', 'checked_out', 'no_show']),
-        Q(check_in_date__lt=departure) & Q(check_out_date__gt=arrival),
-        is_venue_booking=False
-    ).values_list('room_id', flat=True)
-    
-    rooms = rooms.exclude(id__in=booked_room_ids)
+    booked_room_ids, booked_area_ids = availability_cache.blocked_ids(arrival, departure)
     
-    areas = Areas.objects.filter(status='available')
+    # Holds are short-lived, so they are layered on top of the cached answer
+    user_id = request.user.id if request.user.is_authenticated else None
+    hold_token = request.query_params.get('hold_token')
+    rooms = Rooms.objects.filter(status='available').exclude(id__in=booked_room_ids)
+    held_room_ids = holds_service.held_ids(
+        'room', rooms.values_list('id', flat=True), arrival, departure, user_id=user_id, token=hold_token
+    )
+    rooms = rooms.exclude(id__in=held_room_ids)
     
-    booked_area_ids = Bookings.objects.filter(
-        ~Q(status__in=['cancelled', 'rejected', 'checked_out', 'no_show']),
-        Q(check_in_date__lt=departure) & Q(check_out_date__gt=arrival),
-        is_venue_booking=True
-    ).values_list('area_id', flat=True)
+    areas = Areas.objects.filter(status='available').exclude(id__in=booked_area_ids)
+    held_area_ids = holds_service.held_ids(
+        'area', areas.values_list('id', flat=True), arrival, departure, user_id=user_id, token=hold_token
+    )
+    areas = areas.exclude(id__in=held_area_ids)
     
-    areas = areas.exclude(id__in=booked_area_ids)
-    
-    room_serializer = RoomSerializer(rooms, many=True, context={'request': request})
-    area_serializer = AreaSerializer(areas, many=True)
+    room_serializer = RoomCardSerializer(RoomCardSerializer.setup_eager_loading(rooms), many=True, context={'request': request})
+    area_serializer = AreaCardSerializer(AreaCardSerializer.setup_eager_loading(areas), many=True)
     
     return Response({
         "rooms": room_serializer.data,
         "areas": area_serializer.data
     }, status=status.HTTP_200_OK)
 
+@api_view(['GET'])
+def fetch_flexible_availability(request):
+    try:
+        nights = int(request.query_params.get('nights', 1))
+        horizon = int(request.query_params.get('horizon', 60))
+        guests = int(request.query_params.get('guests', 1))
+        limit = int(request.query_params.get('limit', 50))
+    except ValueError:
+        return Response({
+            "error": "nights, horizon, guests and limit must be numbers"
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    if not 1 <= nights <= flex_service.MAX_NIGHTS:
+        return Response({
+            "error": f"nights must be between 1 and {flex_service.MAX_NIGHTS}"
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    if not 1 <= horizon <= flex_service.MAX_HORIZON_DAYS:
+        return Response({
+            "error": f"horizon must be between 1 and {flex_service.MAX_HORIZON_DAYS} days"
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    today = timezone.localdate()
+    start_param = request.query_params.get('start')
+    try:
+        start = datetime.strptime(start_param, "%Y-%m-%d").date() if start_param else today
+    except ValueError:
+        return Response({
+            "error": "Invalid date format. Use YYYY-MM-DD"
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    if start < today:
+        return Response({
+            "error": "Start date cannot be in the past"
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        user = request.user if request.user.is_authenticated else None
+        rooms = Rooms.objects.filter(status='available', max_guests__gte=max(guests, 1)).order_by('id')
+        windows, total = flex_service.search(
+            rooms, start, nights, horizon, user=user, limit=max(min(limit, 500), 1),
+            hold_token=request.query_params.get('hold_token')
+        )
+        
+        return Response({
+            "data": windows,
+            "total_windows": total,
+            "nights": nights,
+            "horizon": horizon,
+            "start": start
+        }, status=status.HTTP_200_OK)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def create_hold(request):
+    try:
+        room_id = request.data.get('room_id')
+        area_id = request.data.get('area_id')
+        if bool(room_id) == bool(area_id):
+            return Response({
+                "error": "Provide either room_id or area_id"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            check_in = datetime.strptime(str(request.data.get('check_in')), "%Y-%m-%d").date()
+            check_out = datetime.strptime(str(request.data.get('check_out')), "%Y-%m-%d").date()
+        except ValueError:
+            return Response({
+                "error": "Invalid date format. Use YYYY-MM-DD"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if check_in < timezone.localdate() or check_out < check_in or (room_id and check_out == check_in):
+            return Response({
+                "error": "Invalid date range"
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            minutes = int(request.data.get('minutes', holds_service.DEFAULT_MINUTES))
+        except (TypeError, ValueError):
+            return Response({"error": "minutes must be a number"}, status=status.HTTP_400_BAD_REQUEST)
+        minutes = max(1, min(minutes, holds_service.MAX_MINUTES))
+        
+        if room_id:
+            kind, resource = 'room', Rooms.objects.get(id=room_id)
+            taken = room_taken(resource.id, check_in, check_out)
+        else:
+            kind, resource = 'area', Areas.objects.get(id=area_id)
+            taken = area_taken(
+                resource.id, check_in, check_out,
+                request.data.get('start_time'), request.data.get('end_time')
+            )
+        
+        if resource.status != 'available' or taken:
+            return Response({
+                "error": f"This {'venue' if kind == 'area' else 'room'} is not available for the selected dates"
+            }, status=status.HTTP_409_CONFLICT)
+        
+        hold = holds_service.place_hold(
+            kind, resource.id, check_in, check_out, request.user.id, minutes,
+            start_time=request.data.get('start_time'), end_time=request.data.get('end_time')
+        )
+        if hold is None:
+            return Response({
+                "error": f"This {'venue' if kind == 'area' else 'room'} is on hold for another guest. Please try again in a few minutes."
+            }, status=status.HTTP_409_CONFLICT)
+        
+        return Response({"data": hold}, status=status.HTTP_201_CREATED)
+    except (Rooms.DoesNotExist, Areas.DoesNotExist):
+        return Response({"error": "Property not found"}, status=status.HTTP_404_NOT_FOUND)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def hold_detail(request, token):
+    hold = holds_service.get_hold(token)
+    if not hold or hold['user_id'] != str(request.user.id):
+        return Response({"error": "Hold not found or already expired"}, status=status.HTTP_404_NOT_FOUND)
+    
+    if request.method == 'GET':
+        return Response({"data": hold}, status=status.HTTP_200_OK)
+    
+    holds_service.release_hold(token)
+    return Response({"message": "Hold released"}, status=status.HTTP_200_OK)
+
 @api_view(['GET', 'POST'])
 def bookings_list(request):
     try:
@@ -98,7 +224,8 @@ def bookings_list(request):
             page = request.query_params.get('page', 1)
             page_size = request.query_params.get('page_size', 10)
             status_filter = request.query_params.get('status')
-            bookings = Bookings.objects.all().order_by('-created_at')
+            fields = BookingSerializer.select_fields(request.query_params)
+            bookings = BookingSerializer.setup_eager_loading(Bookings.objects.all(), fields=fields).order_by('-created_at')
             
             if status_filter:
                 bookings = bookings.filter(status=status_filter)
@@ -106,6 +233,14 @@ def bookings_list(request):
             if request.user.role == 'guest':
                 bookings = bookings.filter(user=request.user)
             
+            if pagination_service.is_cursor_request(request.query_params):
+                page_rows, pagination = pagination_service.cursor_page(bookings, request.query_params, page_size)
+                serializer = BookingSerializer(page_rows, many=True, fields=fields)
+                return Response({
+                    "data": serializer.data,
+                    "pagination": pagination
+                }, status=status.HTTP_200_OK)
+            
             paginator = Paginator(bookings, page_size)
             try:
                 paginated_bookings = paginator.page(page)
@@ -114,7 +249,7 @@ def bookings_list(request):
             except EmptyPage:
                 paginated_bookings = paginator.page(paginator.num_pages)
             
-            serializer = BookingSerializer(paginated_bookings, many=True)
+            serializer = BookingSerializer(paginated_bookings, many=True, fields=fields)
             
             return Response({
                 "data": serializer.data,
@@ -168,14 +303,22 @@ def bookings_list(request):
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['GET', 'PUT', 'DELETE'])
+@permission_classes([IsAuthenticated])
+@conditional(lambda request, booking_id: booking_scopes(booking_id, request.user))
 def booking_detail(request, booking_id):
     if not booking_id.isdigit():
         return Response({"error": "Invalid booking ID"}, status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        booking = Bookings.objects.get(id=booking_id)
+        booking = BookingSerializer.setup_eager_loading(
+            Bookings.objects.all(), full_property=True
+        ).get(id=booking_id)
     except Bookings.DoesNotExist:
         return Response({"error": "Booking not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    if not can_view_booking(request.user, booking.user_id):
+        return Response({"error": "You don't have permission to access this booking"},
+                        status=status.HTTP_403_FORBIDDEN)
     
     if request.method == 'GET':
         booking_serializer = BookingSerializer(booking)
@@ -216,7 +359,7 @@ def reservation_list(request):
                     "error": "Authentication required to view reservations"
                 }, status=status.HTTP_401_UNAUTHORIZED)
             
-            bookings = Bookings.objects.all()
+            bookings = BookingSerializer.setup_eager_loading(Bookings.objects.all())
             serializer = BookingSerializer(bookings, many=True)
             return Response({
                 "data": serializer.data
@@ -241,7 +384,7 @@ def reservation_list(request):
 @api_view(['GET', 'PUT', 'DELETE'])
 def reservation_detail(request, reservation_id):
     try:
-        booking = Bookings.objects.get(id=reservation_id)
+        booking = BookingSerializer.setup_eager_loading(Bookings.objects.all()).get(id=reservation_id)
     except Bookings.DoesNotExist:
         return Response({"error": "Booking not found"}, status=status.HTTP_404_NOT_FOUND)
     if request.method == 'GET':
@@ -270,8 +413,11 @@ def area_reservations(request):
                     "error": "Authentication required to view area reservations"
                 }, status=status.HTTP_401_UNAUTHORIZED)
                 
-            bookings = Bookings.objects.filter(is_venue_booking=True).order_by('-created_at')
-            serializer = BookingSerializer(bookings, many=True)
+            fields = BookingSerializer.select_fields(request.query_params)
+            bookings = BookingSerializer.setup_eager_loading(
+                Bookings.objects.filter(is_venue_booking=True), fields=fields
+            ).order_by('-created_at')
+            serializer = BookingSerializer(bookings, many=True, fields=fields)
             return Response({
                 "data": serializer.data
             }, status=status.HTTP_200_OK)
@@ -293,9 +439,10 @@ def area_reservations(request):
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['GET'])
+@conditional(lambda request, area_id: [f"area:{area_id}"])
 def area_detail(request, area_id):
     try:
-        area = Areas.objects.get(id=area_id)
+        area = AreaSerializer.setup_eager_loading(Areas.objects.all()).get(id=area_id)
         
         serializer = AreaSerializer(area, context={'request': request})
         serialized_data = serializer.data
@@ -309,9 +456,10 @@ def area_detail(request, area_id):
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['GET'])
+@conditional(lambda request, room_id: [f"room:{room_id}", 'amenities'])
 def room_detail(request, room_id):
     try:
-        room = Rooms.objects.get(id=room_id)
+        room = RoomSerializer.setup_eager_loading(Rooms.objects.all()).get(id=room_id)
         serializer = RoomSerializer(room, context={'request': request})
         return Response({
             "data": serializer.data
@@ -325,19 +473,31 @@ def room_detail(request, room_id):
 def user_bookings(request):
     try:
         user = request.user
-        bookings = Bookings.objects.filter(user=user).order_by('-created_at')
+        bookings = BookingSerializer.setup_eager_loading(
+            Bookings.objects.filter(user=user), full_property=True
+        ).order_by('-created_at')
         
         page = request.query_params.get('page', 1)
         page_size = request.query_params.get('page_size', 5)
         
-        paginator = Paginator(bookings, page_size)
-        
-        try:
-            paginated_bookings = paginator.page(page)
-        except PageNotAnInteger:
-            paginated_bookings = paginator.page(1)
-        except EmptyPage:
-            paginated_bookings = paginator.page(paginator.num_pages)
+        if pagination_service.is_cursor_request(request.query_params):
+            paginated_bookings, pagination = pagination_service.cursor_page(bookings, request.query_params, page_size)
+        else:
+            paginator = Paginator(bookings, page_size)
+            
+            try:
+                paginated_bookings = paginator.page(page)
+            except PageNotAnInteger:
+                paginated_bookings = paginator.page(1)
+            except EmptyPage:
+                paginated_bookings = paginator.page(paginator.num_pages)
+            
+            pagination = {
+                "total_pages": paginator.num_pages,
+                "current_page": int(page),
+                "total_items": paginator.count,
+                "page_size": int(page_size)
+            }
             
         booking_data = []
         for booking in paginated_bookings:
@@ -355,12 +515,7 @@ def user_bookings(request):
         
         return Response({
             "data": booking_data,
-            "pagination": {
-                "total_pages": paginator.num_pages,
-                "current_page": int(page),
-                "total_items": paginator.count,
-                "page_size": int(page_size)
-            }
+            "pagination": pagination
         }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -414,19 +569,18 @@ def fetch_room_bookings(request, room_id):
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
         
-        query = Q(room_id=room_id) & ~Q(status__in=['cancelled', 'rejected'])
+        bookings = Bookings.objects.filter(room_id=room_id).exclude(status__in=['cancelled', 'rejected'])
 
         if start_date and end_date:
             try:
-                start = datetime.strptime(start_date, "%Y-%m-%d")
-                end = datetime.strptime(end_date, "%Y-%m-%d")
-                
-                query = query & Q(check_in_date__lte=end) & Q(check_out_date__gte=start)
+                start = datetime.strptime(start_date, "%Y-%m-%d").date()
+                end = datetime.strptime(end_date, "%Y-%m-%d").date()
             except ValueError:
                 return Response({"error": "Invalid date format. Use YYYY-MM-DD"}, 
                                status=status.HTTP_400_BAD_REQUEST)
-        
-        bookings = Bookings.objects.filter(query)
+            
+            # Bookings touching the inclusive [start, end] window, check-out days included
+            bookings = bookings.filter(check_in_date__lte=end, check_out_date__gte=start)
         
         booking_data = []
         for booking in bookings:
@@ -450,19 +604,18 @@ def fetch_area_bookings(request, area_id):
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
         
-        query = Q(area_id=area_id) & ~Q(status__in=['cancelled', 'rejected'])
+        bookings = Bookings.objects.filter(area_id=area_id).exclude(status__in=['cancelled', 'rejected'])
         
         if start_date and end_date:
             try:
-                start = datetime.strptime(start_date, "%Y-%m-%d")
-                end = datetime.strptime(end_date, "%Y-%m-%d")
-                
-                query = query & Q(check_in_date__lte=end) & Q(check_out_date__gte=start)
+                start = datetime.strptime(start_date, "%Y-%m-%d").date()
+                end = datetime.strptime(end_date, "%Y-%m-%d").date()
             except ValueError:
                 return Response({"error": "Invalid date format. Use YYYY-MM-DD"}, 
                                status=status.HTTP_400_BAD_REQUEST)
-        
-        bookings = Bookings.objects.filter(query)
+            
+            # Bookings touching the inclusive [start, end] window, check-out days included
+            bookings = bookings.filter(check_in_date__lte=end, check_out_date__gte=start)
         
         booking_data = []
         for booking in bookings:
@@ -482,6 +635,44 @@ def fetch_area_bookings(request, area_id):
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+@api_view(['GET'])
+def fetch_area_slots(request, area_id):
+    try:
+        area = Areas.objects.get(id=area_id)
+        
+        date_param = request.query_params.get('date')
+        try:
+            day = datetime.strptime(date_param, "%Y-%m-%d").date() if date_param else timezone.localdate()
+        except ValueError:
+            return Response({"error": "Invalid date format. Use YYYY-MM-DD"}, 
+                           status=status.HTTP_400_BAD_REQUEST)
+        
+        if area.status != 'available':
+            bitmap = slots_service.FULL_DAY
+        else:
+            bitmap = slots_service.day_bitmaps(area.id, day).get(day, 0)
+        
+        slots = [
+            {
+                "start": slots_service.slot_label(index),
+                "end": slots_service.slot_label(index + 1),
+                "available": not (bitmap >> index) & 1
+            }
+            for index in range(slots_service.SLOTS_PER_DAY)
+        ]
+        
+        return Response({
+            "area_id": area.id,
+            "date": day,
+            "slot_minutes": slots_service.SLOT_MINUTES,
+            "slots": slots,
+            "free_ranges": slots_service.free_ranges(bitmap)
+        }, status=status.HTTP_200_OK)
+    except Areas.DoesNotExist:
+        return Response({"error": "Area not found"}, status=status.HTTP_404_NOT_FOUND)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
 @api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 def booking_reviews(request, booking_id):
@@ -495,7 +686,7 @@ def booking_reviews(request, booking_id):
                     status=status.HTTP_403_FORBIDDEN)
     
     if request.method == 'GET':
-        reviews = Reviews.objects.filter(booking=booking)
+        reviews = ReviewSerializer.setup_eager_loading(Reviews.objects.filter(booking=booking))
         serializer = ReviewSerializer(reviews, many=True)
         return Response({"data": serializer.data}, status=status.HTTP_200_OK)
     
@@ -530,7 +721,7 @@ def booking_reviews(request, booking_id):
 
 @api_view(['GET'])
 def user_reviews(request):
-    reviews = Reviews.objects.filter(user=request.user).order_by('-created_at')
+    reviews = ReviewSerializer.setup_eager_loading(Reviews.objects.filter(user=request.user)).order_by('-created_at')
     serializer = ReviewSerializer(reviews, many=True)
     return Response({"data": serializer.data}, status=status.HTTP_200_OK)
 
@@ -566,10 +757,18 @@ def review_detail(request, review_id):
 @api_view(['GET'])
 def room_reviews(request, room_id):
     try:
-        page = int(request.query_params.get('page'))
         page_size = int(request.query_params.get('page_size'))
+        reviews = ReviewSerializer.setup_eager_loading(Reviews.objects.filter(room_id=room_id)).order_by('-created_at')
+        
+        if pagination_service.is_cursor_request(request.query_params):
+            page_rows, pagination = pagination_service.cursor_page(reviews, request.query_params, page_size)
+            serializer = ReviewSerializer(page_rows, many=True)
+            return Response({
+                "data": serializer.data,
+                **pagination
+            }, status=status.HTTP_200_OK)
         
-        reviews = Reviews.objects.filter(room_id=room_id).order_by('-created_at')
+        page = int(request.query_params.get('page'))
         paginator = Paginator(reviews, page_size)
         
         try:
@@ -593,10 +792,18 @@ def room_reviews(request, room_id):
 @api_view(['GET'])
 def area_reviews(request, area_id):
     try:
-        page = int(request.query_params.get('page'))
         page_size = int(request.query_params.get('page_size'))
+        reviews = ReviewSerializer.setup_eager_loading(Reviews.objects.filter(area_id=area_id)).order_by('-created_at')
+        
+        if pagination_service.is_cursor_request(request.query_params):
+            page_rows, pagination = pagination_service.cursor_page(reviews, request.query_params, page_size)
+            serializer = ReviewSerializer(page_rows, many=True)
+            return Response({
+                "data": serializer.data,
+                **pagination
+            }, status=status.HTTP_200_OK)
         
-        reviews = Reviews.objects.filter(area_id=area_id).order_by('-created_at')
+        page = int(request.query_params.get('page'))
         paginator = Paginator(reviews, page_size)
         
         try:
@@ -1128,6 +1335,9 @@ def paymongo_webhook(request):
                 booking.save()
                 booking_id = str(booking.id)
                 
+                if booking_data.get('hold_token'):
+                    holds_service.release_hold(booking_data['hold_token'])
+                
             except Exception as e:
                 return HttpResponse(status=500)
         
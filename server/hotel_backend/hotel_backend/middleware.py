@@ -0,0 +1,73 @@
+"""
+Response compression for API payloads.
+
+Only responses that are worth it are compressed: at least MIN_SIZE bytes, a content type in
+COMPRESSIBLE_TYPES and a path outside EXCLUDED_PATHS. Brotli is used when the client accepts it
+and the brotli package is installed, gzip otherwise.
+"""
+
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_SIZE = 1024
+BROTLI_QUALITY = 5
+
+COMPRESSIBLE_TYPES = (
+    'application/json',
+    'application/msgpack',
+    'text/csv',
+    'text/plain',
+)
+
+EXCLUDED_PATHS = (
+    # WebSocket upgrades and the PayMongo pages opened in the in-app browser
+    '/ws/',
+    '/booking/paymongo/',
+    # Token responses stay uncompressed so secrets never share a compression context (BREACH)
+    '/api/auth/',
+)
+
+re_accepts_br = _lazy_re_compile(r"\bbr\b")
+
+
+def _compressible(request, response):
+    if request.META.get('HTTP_UPGRADE') or request.path.startswith(EXCLUDED_PATHS):
+        return False
+    if response.has_header('Content-Encoding'):
+        return False
+    content_type = response.get('Content-Type', '').split(';', 1)[0].strip().lower()
+    if content_type not in COMPRESSIBLE_TYPES:
+        return False
+    return response.streaming or len(response.content) >= MIN_SIZE
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """GZipMiddleware limited to large API payloads, preferring brotli when available."""
+
+    def process_response(self, request, response):
+        if not _compressible(request, response):
+            return response
+
+        if brotli is None or response.streaming or not re_accepts_br.search(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        ):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed_content = brotli.compress(response.content, quality=BROTLI_QUALITY)
+        if len(compressed_content) >= len(response.content):
+            return response
+        response.content = compressed_content
+        response.headers['Content-Length'] = str(len(response.content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
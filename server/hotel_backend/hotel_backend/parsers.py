@@ -0,0 +1,38 @@
+"""
+Request parsing for the API, the counterparts of renderers.UJSONRenderer and
+renderers.MessagePackRenderer.
+"""
+
+import msgpack
+import ujson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+
+class UJSONParser(JSONParser):
+    """JSONParser with ujson doing the decoding."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        try:
+            body = stream.read()
+            # ujson reads UTF-8 bytes directly; only other charsets need decoding first
+            if encoding.lower().replace('-', '') != 'utf8':
+                body = body.decode(encoding)
+            return ujson.loads(body)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class MessagePackParser(BaseParser):
+    """Request bodies sent as Content-Type: application/msgpack."""
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except Exception as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
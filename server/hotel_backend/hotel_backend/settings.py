@@ -63,6 +63,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'hotel_backend.middleware.CompressionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -97,8 +98,13 @@ CORS_ALLOW_HEADERS = [
     'sec-websocket-extensions',
     'sec-websocket-key',
     'sec-websocket-version',
+    'if-none-match',
+    'if-modified-since',
 ]
 
+# Conditional GET validators (booking/service/conditional.py) must be readable by web clients
+CORS_EXPOSE_HEADERS = ['etag', 'last-modified']
+
 SESSION_COOKIE_SAMESITE = 'Lax'
 SESSION_COOKIE_SECURE = False
 CSRF_COOKIE_SAMESITE = 'Lax'
@@ -125,7 +131,18 @@ TEMPLATES = [
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'user_roles.authentication.CookieJWTAuthentication',
-    )
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'hotel_backend.renderers.UJSONRenderer',
+        'hotel_backend.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'hotel_backend.parsers.UJSONParser',
+        'hotel_backend.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SIMPLE_JWT = {
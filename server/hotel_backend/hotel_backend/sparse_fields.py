@@ -0,0 +1,53 @@
+"""
+Sparse field selection (?fields= / ?expand=) shared by the booking and property serializers.
+"""
+
+
+def selects(fields, *names):
+    """True when a sparse field selection (None means everything) asks for any of `names`."""
+    return fields is None or any(name in fields for name in names)
+
+
+def _csv(value):
+    return {part.strip() for part in value.split(',') if part.strip()} if value is not None else None
+
+
+class SparseFieldsMixin:
+    """
+    ?fields= keeps only the listed fields and ?expand= picks which of `expandable_fields`
+    (nested relations) are rendered. Dropped fields are removed from the serializer before it
+    runs, so their getters never execute; setup_eager_loading takes the same selection so it
+    skips their annotations and prefetches too.
+    """
+    expandable_fields = ()
+    extra_fields = ()
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.selected_fields = fields
+        if fields is not None:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+    @classmethod
+    def select_fields(cls, params):
+        """Field names to render for these query params, or None for the full representation."""
+        fields = _csv(params.get('fields'))
+        expand = _csv(params.get('expand'))
+        if fields is None and expand is None:
+            return None
+        if fields is None:
+            fields = set(cls.Meta.fields) | set(cls.extra_fields)
+            fields -= set(cls.expandable_fields)
+        return fields | ((expand or set()) & set(cls.expandable_fields))
+
+    def wants(self, *names):
+        return selects(self.selected_fields, *names)
+
+    def sparse(self, representation):
+        """Drop keys added in to_representation that were not selected."""
+        if self.selected_fields is None:
+            return representation
+        for key in set(representation) - self.selected_fields:
+            del representation[key]
+        return representation
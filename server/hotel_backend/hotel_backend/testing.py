@@ -0,0 +1,125 @@
+"""
+Test helpers shared by the apps' test modules.
+"""
+
+import time
+from datetime import timedelta
+
+import cloudinary
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from booking.models import Bookings, Reviews, Transactions
+from property.models import Amenities, AreaImages, Areas, RoomImages, Rooms
+from user_roles.models import CustomUsers, Notification
+
+
+class EndpointBudgetMixin:
+    """
+    Seeds a hotel with enough rooms, guests and bookings that a per-row query shows up as a
+    blown budget, then checks a GET route against a query count and a wall-time ceiling.
+    """
+
+    ROOMS = 12
+    AREAS = 6
+    GUESTS = 30
+    BOOKINGS_PER_GUEST = 4
+    MAX_MS = 500
+
+    @classmethod
+    def setUpClass(cls):
+        # Seeded bookings notify their guests through the channel layer; keep it in memory so the
+        # budgets measure queries, not whether Redis is running
+        channel_layers = override_settings(CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}})
+        channel_layers.enable()
+        cls.addClassCleanup(channel_layers.disable)
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        # Image URLs are built locally, but the SDK refuses to without a cloud name
+        if not cloudinary.config().cloud_name:
+            cloudinary.config(cloud_name='budget-tests')
+
+        today = timezone.localdate()
+        cls.month_start = today.replace(day=1)
+        cls.admin = CustomUsers.objects.create(username='budget-admin', email='admin@example.com', role='admin')
+
+        amenities = Amenities.objects.bulk_create([Amenities(description=f"Amenity {i}") for i in range(5)])
+        cls.rooms = []
+        for i in range(cls.ROOMS):
+            room = Rooms.objects.create(room_name=f"Room {i}", room_price=1500 + i * 100, discount_percent=i % 3 * 5)
+            room.amenities.set(amenities)
+            RoomImages.objects.bulk_create([RoomImages(room=room, room_image=f"rooms/{i}-{n}") for n in range(3)])
+            cls.rooms.append(room)
+        cls.areas = []
+        for i in range(cls.AREAS):
+            area = Areas.objects.create(area_name=f"Area {i}", capacity=50, price_per_hour=800)
+            AreaImages.objects.bulk_create([AreaImages(area=area, area_image=f"areas/{i}-{n}") for n in range(3)])
+            cls.areas.append(area)
+
+        statuses = ['checked_out', 'confirmed', 'cancelled', 'checked_in', 'reserved', 'missed_reservation', 'rejected', 'pending']
+        cls.guests = []
+        for g in range(cls.GUESTS):
+            guest = CustomUsers.objects.create(
+                username=f"budget-guest{g}", email=f"guest{g}@example.com", role='guest',
+                first_name='Guest', last_name=str(g), is_senior_or_pwd=g % 5 == 0,
+            )
+            cls.guests.append(guest)
+            for n in range(cls.BOOKINGS_PER_GUEST):
+                index = g * cls.BOOKINGS_PER_GUEST + n
+                check_in = cls.month_start + timedelta(days=index % 27)
+                # Stays of the same room land at least three days apart and venue days of the same
+                # area never coincide, so the seed never trips the no-overlap exclusion constraints
+                # on PostgreSQL
+                if n % 2:
+                    booking = Bookings.objects.create(
+                        user=guest, area=cls.areas[g % cls.AREAS], is_venue_booking=True,
+                        check_in_date=check_in, check_out_date=check_in,
+                        status=statuses[index // 2 % len(statuses)], total_price=4000,
+                    )
+                else:
+                    booking = Bookings.objects.create(
+                        user=guest, room=cls.rooms[index // 2 % cls.ROOMS],
+                        check_in_date=check_in, check_out_date=check_in + timedelta(days=2),
+                        status=statuses[index // 2 % len(statuses)], total_price=3000,
+                    )
+                Transactions.objects.create(
+                    booking=booking, user=guest, transaction_type='booking', amount=1500,
+                    transaction_date=timezone.now(), status='completed',
+                )
+                if booking.status == 'checked_out':
+                    Reviews.objects.create(
+                        user=guest, booking=booking, room=booking.room, area=booking.area,
+                        rating=4 + index % 2, review_text='Lovely stay.',
+                    )
+                Notification.objects.create(user=guest, booking=booking, message='Booking updated')
+
+        cls.guest = cls.guests[0]
+        cls.room = cls.rooms[0]
+        cls.area = cls.areas[0]
+        cls.booking = Bookings.objects.filter(user=cls.guest).first()
+
+    def assertWithinBudget(self, url, queries, user=None, max_ms=None):
+        client = APIClient()
+        client.force_authenticate(user or self.admin)
+        # Warm imports and lazy setup outside the measurement, then start from a cold cache
+        client.get(url)
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(url)
+            elapsed = (time.perf_counter() - started) * 1000
+
+        self.assertEqual(response.status_code, 200, f"{url}: {response.content[:300]}")
+        self.assertLessEqual(
+            len(captured), queries,
+            f"{url} ran {len(captured)} queries (budget {queries}):\n"
+            + "\n".join(query['sql'] for query in captured.captured_queries)
+        )
+        self.assertLess(elapsed, max_ms or self.MAX_MS, f"{url} took {elapsed:.0f} ms")
+        return response
@@ -0,0 +1,82 @@
+import gzip
+import io
+from datetime import date, datetime, time, timezone as dt_timezone
+from decimal import Decimal
+
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory, SimpleTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from hotel_backend.middleware import CompressionMiddleware
+from hotel_backend.parsers import MessagePackParser, UJSONParser
+from hotel_backend.renderers import MessagePackRenderer, UJSONRenderer
+
+PAYLOAD = {
+    "total": Decimal("3500.50"),
+    "day": date(2025, 3, 1),
+    "at": datetime(2025, 3, 1, 6, 30, tzinfo=dt_timezone.utc),
+    "check_in": time(14, 0),
+    "note": "Room 2/B \u2028 ₱",
+    "ids": (1, 2),
+}
+
+
+class UJSONTests(SimpleTestCase):
+    payload = PAYLOAD
+
+    def test_renders_like_drf(self):
+        self.assertEqual(UJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    def test_parse_round_trip(self):
+        parsed = UJSONParser().parse(io.BytesIO(UJSONRenderer().render(self.payload)))
+        self.assertEqual(parsed["total"], 3500.5)
+        self.assertEqual(parsed["at"], "2025-03-01T06:30:00Z")
+        self.assertEqual(parsed["note"], self.payload["note"])
+
+
+class MessagePackTests(SimpleTestCase):
+    def test_round_trip_matches_json(self):
+        payload = {**PAYLOAD, "amounts": [Decimal("0.10"), Decimal("1500")], "bytes": b"\x00\xff"}
+        packed = MessagePackRenderer().render(payload)
+        parsed = MessagePackParser().parse(io.BytesIO(packed))
+        self.assertEqual(parsed["total"], 3500.5)
+        self.assertEqual(parsed["amounts"], [0.1, 1500.0])
+        self.assertEqual(parsed["day"], "2025-03-01")
+        self.assertEqual(parsed["at"], "2025-03-01T06:30:00Z")
+        self.assertEqual(parsed["check_in"], "14:00:00")
+        self.assertEqual(parsed["bytes"], b"\x00\xff")
+        del payload["bytes"], parsed["bytes"]
+        self.assertEqual(parsed, UJSONParser().parse(io.BytesIO(UJSONRenderer().render(payload))))
+
+    def test_rejects_garbage(self):
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(io.BytesIO(b"\xc1"))
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    rows = {"data": [{"id": i, "status": "confirmed", "room_name": "Deluxe Room"} for i in range(100)]}
+
+    def compress(self, path, response, **headers):
+        request = RequestFactory().get(path, HTTP_ACCEPT_ENCODING='gzip, deflate', **headers)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_large_json_is_gzipped(self):
+        response = self.compress('/booking/bookings', JsonResponse(self.rows))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), JsonResponse(self.rows).content)
+
+    def test_small_or_unlisted_responses_are_left_alone(self):
+        small = self.compress('/booking/bookings', JsonResponse({"data": []}))
+        html = self.compress('/booking/bookings', HttpResponse('<p>hi</p>' * 500))
+        self.assertFalse(small.has_header('Content-Encoding'))
+        self.assertFalse(html.has_header('Content-Encoding'))
+
+    def test_excluded_paths(self):
+        paymongo = self.compress(
+            '/booking/paymongo/redirect/success', HttpResponse('x' * 5000, content_type='text/plain')
+        )
+        upgrade = self.compress('/ws/notifications', JsonResponse(self.rows), HTTP_UPGRADE='websocket')
+        self.assertFalse(paymongo.has_header('Content-Encoding'))
+        self.assertFalse(upgrade.has_header('Content-Encoding'))
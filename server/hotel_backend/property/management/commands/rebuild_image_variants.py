@@ -0,0 +1,33 @@
+"""
+Store thumb/card/full variants for images uploaded before variants existed.
+Run with: python manage.py rebuild_image_variants [--all]
+"""
+
+from django.core.management.base import BaseCommand
+from property.models import AreaImages, RoomImages
+from property.service.image_variants import PROFILE_VARIANTS, PROPERTY_VARIANTS, sync_variants
+from user_roles.models import CustomUsers
+
+TARGETS = (
+    (RoomImages, 'room_image', 'variants', PROPERTY_VARIANTS),
+    (AreaImages, 'area_image', 'variants', PROPERTY_VARIANTS),
+    (CustomUsers, 'profile_image', 'profile_image_variants', PROFILE_VARIANTS),
+)
+
+
+class Command(BaseCommand):
+    help = 'Build and store responsive image variants for room, area and profile images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Rebuild rows that already have variants too')
+
+    def handle(self, *args, **options):
+        for model, image_field, variants_field, variants in TARGETS:
+            rows = model.objects.exclude(**{f"{image_field}__isnull": True}).exclude(**{image_field: ''})
+            if not options['all']:
+                rows = rows.filter(**{variants_field: {}})
+            count = 0
+            for instance in rows.only('pk', image_field, variants_field).iterator():
+                sync_variants(instance, image_field, variants_field, variants)
+                count += 1
+            self.stdout.write(f"{model.__name__}: {count} checked")
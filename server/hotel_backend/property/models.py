@@ -64,10 +64,18 @@ class Rooms(models.Model):
 class RoomImages(models.Model):
     room = models.ForeignKey(Rooms, related_name='images', on_delete=models.CASCADE)
     room_image = CloudinaryField('room_image', null=True, blank=True)
+    # thumb/card/full delivery URLs, see service/image_variants.py
+    variants = models.JSONField(default=dict, blank=True)
     
     class Meta:
         db_table = 'room_images'
 
+    def save(self, *args, **kwargs):
+        from .service.image_variants import sync_variants
+
+        super().save(*args, **kwargs)
+        sync_variants(self, 'room_image', 'variants', update_fields=kwargs.get('update_fields'))
+
 class Areas(models.Model):
     AREA_STATUS_CHOICES = [
         ('available', 'Available'),
@@ -103,6 +111,14 @@ class Areas(models.Model):
 class AreaImages(models.Model):
     area = models.ForeignKey(Areas, related_name='images', on_delete=models.CASCADE)
     area_image = CloudinaryField('area_image', null=True, blank=True)
+    # thumb/card/full delivery URLs, see service/image_variants.py
+    variants = models.JSONField(default=dict, blank=True)
     
     class Meta:
         db_table = 'area_images'
+
+    def save(self, *args, **kwargs):
+        from .service.image_variants import sync_variants
+
+        super().save(*args, **kwargs)
+        sync_variants(self, 'area_image', 'variants', update_fields=kwargs.get('update_fields'))
@@ -1,6 +1,43 @@
 from rest_framework import serializers
-from django.db.models import Avg
+from django.db.models import Avg, Count, Exists, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from .models import Amenities, Rooms, Areas, RoomImages, AreaImages
+from hotel_backend.sparse_fields import SparseFieldsMixin, selects
+from .service.image_variants import variants_of
+
+def _prefetched_reviews(obj):
+    """Reviews loaded by setup_eager_loading (already newest first), or None when not prefetched."""
+    if 'reviews' in getattr(obj, '_prefetched_objects_cache', {}):
+        return obj.reviews.all()
+    return None
+
+def _with_related(queryset, field, *prefetches, reviews=True, fields=None):
+    from booking.models import Bookings, Reviews
+
+    ratings = Reviews.objects.filter(**{field: OuterRef('pk')}).values(field)
+    active_bookings = Bookings.objects.filter(
+        **{field: OuterRef('pk')}, status__in=Bookings.ACTIVE_STATUSES
+    )
+    annotations = {}
+    if selects(fields, 'average_rating'):
+        annotations['_average_rating'] = Subquery(ratings.annotate(avg=Avg('rating')).values('avg'))
+    if selects(fields, 'review_count'):
+        annotations['_review_count'] = Coalesce(Subquery(ratings.annotate(count=Count('id')).values('count')), 0)
+    if selects(fields, 'has_active_bookings'):
+        annotations['_has_active_bookings'] = Exists(active_bookings)
+    queryset = queryset.annotate(**annotations).prefetch_related(
+        *(prefetch for prefetch in prefetches if selects(fields, prefetch))
+    )
+    if reviews and selects(fields, 'reviews'):
+        queryset = queryset.prefetch_related(
+            Prefetch(
+                'reviews',
+                queryset=Reviews.objects.select_related(
+                    'user', 'booking__room', 'booking__area'
+                ).order_by('-created_at'),
+            )
+        )
+    return queryset
 
 class AmenitySerializer(serializers.ModelSerializer):
     class Meta:
@@ -10,24 +47,26 @@ class AmenitySerializer(serializers.ModelSerializer):
 class RoomImagesSerializer(serializers.ModelSerializer):
     class Meta:
         model = RoomImages
-        fields = ['id', 'room_image']
+        fields = ['id', 'room_image', 'variants']
         
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         representation['room_image'] = instance.room_image.url if instance.room_image else None
+        representation['variants'] = variants_of(instance, 'room_image', 'variants')
         return representation
 
 class AreaImagesSerializer(serializers.ModelSerializer):
     class Meta:
         model = AreaImages
-        fields = ['id', 'area_image']
+        fields = ['id', 'area_image', 'variants']
         
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         representation['area_image'] = instance.area_image.url if instance.area_image else None
+        representation['variants'] = variants_of(instance, 'area_image', 'variants')
         return representation
 
-class RoomSerializer(serializers.ModelSerializer):
+class RoomSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     amenities = AmenitySerializer(many=True, read_only=True)
     average_rating = serializers.SerializerMethodField()
     discounted_price = serializers.SerializerMethodField()
@@ -56,10 +95,19 @@ class RoomSerializer(serializers.ModelSerializer):
             'reviews',
             'has_active_bookings',
         ]
+    expandable_fields = ('amenities', 'images', 'reviews')
+    extra_fields = ('price_per_night', 'discounted_price_numeric')
+    
+    @staticmethod
+    def setup_eager_loading(queryset, fields=None):
+        """Annotate ratings/active-booking flags and prefetch relations so a page costs a fixed number of queries."""
+        return _with_related(queryset, 'room', 'amenities', 'images', fields=fields)
         
     def get_reviews(self, obj):
         from booking.serializers import ReviewSerializer
-        reviews = obj.reviews.all().order_by('-created_at')
+        reviews = _prefetched_reviews(obj)
+        if reviews is None:
+            reviews = obj.reviews.all().order_by('-created_at')
         return ReviewSerializer(reviews, many=True, context=self.context).data
         
     def to_representation(self, instance):
@@ -82,9 +130,11 @@ class RoomSerializer(serializers.ModelSerializer):
                 representation['discounted_price'] = None
                 representation['discounted_price_numeric'] = None
                 representation['discount_percent'] = 0
-        return representation
+        return self.sparse(representation)
 
     def get_average_rating(self, obj):
+        if hasattr(obj, '_average_rating'):
+            return obj._average_rating or 0
         return obj.reviews.aggregate(Avg('rating'))['rating__avg'] or 0
 
     def get_discounted_price(self, obj):
@@ -109,9 +159,11 @@ class RoomSerializer(serializers.ModelSerializer):
     
     def get_has_active_bookings(self, obj):
         """Check if room has active bookings (reserved, confirmed, or checked_in)"""
+        if hasattr(obj, '_has_active_bookings'):
+            return obj._has_active_bookings
         return obj.has_active_bookings()
 
-class AreaSerializer(serializers.ModelSerializer):
+class AreaSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     average_rating = serializers.SerializerMethodField()
     discounted_price = serializers.SerializerMethodField()
     images = AreaImagesSerializer(many=True, read_only=True)
@@ -136,10 +188,19 @@ class AreaSerializer(serializers.ModelSerializer):
             'reviews',
             'has_active_bookings',
         ]
+    expandable_fields = ('images', 'reviews')
+    extra_fields = ('price_per_hour_numeric', 'discounted_price_numeric')
+    
+    @staticmethod
+    def setup_eager_loading(queryset, fields=None):
+        """Annotate ratings/active-booking flags and prefetch relations so a page costs a fixed number of queries."""
+        return _with_related(queryset, 'area', 'images', fields=fields)
         
     def get_reviews(self, obj):
         from booking.serializers import ReviewSerializer
-        reviews = obj.reviews.all().order_by('-created_at')
+        reviews = _prefetched_reviews(obj)
+        if reviews is None:
+            reviews = obj.reviews.all().order_by('-created_at')
         return ReviewSerializer(reviews, many=True, context=self.context).data
         
     def to_representation(self, instance):
@@ -162,9 +223,11 @@ class AreaSerializer(serializers.ModelSerializer):
                 representation['discounted_price'] = None
                 representation['discounted_price_numeric'] = None
                 representation['discount_percent'] = 0
-        return representation
+        return self.sparse(representation)
 
     def get_average_rating(self, obj):
+        if hasattr(obj, '_average_rating'):
+            return obj._average_rating or 0
         return obj.reviews.aggregate(Avg('rating'))['rating__avg'] or 0
     
     def get_discounted_price(self, obj):
@@ -189,4 +252,115 @@ class AreaSerializer(serializers.ModelSerializer):
     
     def get_has_active_bookings(self, obj):
         """Check if area has active bookings (reserved, confirmed, or checked_in)"""
-        return obj.has_active_bookings()
\ No newline at end of file
+        if hasattr(obj, '_has_active_bookings'):
+            return obj._has_active_bookings
+        return obj.has_active_bookings()
+
+class _CardMixin:
+    """Compact list/search representation: no reviews or amenities, only the first image."""
+    image_field = None
+
+    @staticmethod
+    def first_image_prefetch(image_model):
+        # A sliced Prefetch ranks each property's images with ROW_NUMBER() in SQL, so only the
+        # first one per room/area is loaded instead of the whole gallery
+        return Prefetch('images', queryset=image_model.objects.order_by('id')[:1], to_attr='first_images')
+
+    def _first_image(self, obj):
+        if hasattr(obj, 'first_images'):
+            return obj.first_images[0] if obj.first_images else None
+        # Loaded for the full serializer (booking detail renders both): reuse the whole gallery
+        if 'images' in getattr(obj, '_prefetched_objects_cache', {}):
+            return min(obj.images.all(), key=lambda image: image.id, default=None)
+        return obj.images.order_by('id').first()
+
+    def get_image(self, obj):
+        image = self._first_image(obj)
+        value = getattr(image, self.image_field, None) if image else None
+        return value.url if value else None
+
+    def get_images(self, obj):
+        # Kept as a one-item list so existing list screens keep reading images[0]
+        image = self._first_image(obj)
+        if not image:
+            return []
+        value = getattr(image, self.image_field, None)
+        return [{
+            'id': image.id,
+            self.image_field: value.url if value else None,
+            'variants': variants_of(image, self.image_field, 'variants'),
+        }]
+
+    def get_review_count(self, obj):
+        if hasattr(obj, '_review_count'):
+            return obj._review_count
+        return obj.reviews.count()
+
+class RoomCardSerializer(_CardMixin, RoomSerializer):
+    image_field = 'room_image'
+    image = serializers.SerializerMethodField()
+    images = serializers.SerializerMethodField()
+    review_count = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Rooms
+        fields = [
+            'id',
+            'room_name',
+            'room_type',
+            'bed_type',
+            'status',
+            'description',
+            'max_guests',
+            'room_price',
+            'discount_percent',
+            'discounted_price',
+            'senior_discounted_price',
+            'image',
+            'images',
+            'average_rating',
+            'review_count',
+        ]
+    expandable_fields = ('images',)
+
+    @staticmethod
+    def setup_eager_loading(queryset, fields=None):
+        # Only annotate what a card renders, not everything RoomSerializer can
+        fields = set(RoomCardSerializer.Meta.fields) if fields is None else fields
+        queryset = _with_related(queryset, 'room', reviews=False, fields=fields)
+        if selects(fields, 'image', 'images'):
+            queryset = queryset.prefetch_related(RoomCardSerializer.first_image_prefetch(RoomImages))
+        return queryset
+
+class AreaCardSerializer(_CardMixin, AreaSerializer):
+    image_field = 'area_image'
+    image = serializers.SerializerMethodField()
+    images = serializers.SerializerMethodField()
+    review_count = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Areas
+        fields = [
+            'id',
+            'area_name',
+            'description',
+            'status',
+            'capacity',
+            'price_per_hour',
+            'discount_percent',
+            'discounted_price',
+            'senior_discounted_price',
+            'image',
+            'images',
+            'average_rating',
+            'review_count',
+        ]
+    expandable_fields = ('images',)
+
+    @staticmethod
+    def setup_eager_loading(queryset, fields=None):
+        fields = set(AreaCardSerializer.Meta.fields) if fields is None else fields
+        queryset = _with_related(queryset, 'area', reviews=False, fields=fields)
+        if selects(fields, 'image', 'images'):
+            queryset = queryset.prefetch_related(AreaCardSerializer.first_image_prefetch(AreaImages))
+        return queryset
@@ -0,0 +1,83 @@
+"""
+Named, resized variants of Cloudinary images.
+
+Phones should not download a full-size upload to draw a thumbnail. Each image gets a small set of
+delivery URLs (thumb/card/full, all f_auto,q_auto) that is built once when the image is saved and
+stored next to it, so serializers hand out {"thumb": url, "card": url, "full": url} without
+building URLs per request. Cloudinary derives and caches each variant on its first fetch.
+"""
+
+from cloudinary.utils import generate_transformation_string
+
+# Room and area photos: square list thumbnails, 3:2 cards, and a bounded full-screen view
+PROPERTY_VARIANTS = {
+    'thumb': {'width': 200, 'height': 200, 'crop': 'fill'},
+    'card': {'width': 600, 'height': 400, 'crop': 'fill'},
+    'full': {'width': 1600, 'crop': 'limit'},
+}
+
+# Profile pictures: avatars in lists and reviews, the profile header, and the picture itself
+PROFILE_VARIANTS = {
+    'thumb': {'width': 96, 'height': 96, 'crop': 'fill', 'gravity': 'face'},
+    'card': {'width': 320, 'height': 320, 'crop': 'fill', 'gravity': 'face'},
+    'full': {'width': 1080, 'crop': 'limit'},
+}
+
+DELIVERY = {'fetch_format': 'auto', 'quality': 'auto'}
+
+
+def _from_url(url, transformation):
+    # Images stored as a full delivery URL (e.g. imported Google profile pictures)
+    head, sep, tail = url.partition('/upload/')
+    if not sep:
+        return None
+    return f"{head}/upload/{generate_transformation_string(**transformation)[0]}/{tail}"
+
+
+def build_variants(resource, variants=PROPERTY_VARIANTS):
+    """{name: url} for every variant of a CloudinaryResource; {} when there is no image."""
+    public_id = getattr(resource, 'public_id', None)
+    if not public_id:
+        return {}
+
+    source = None
+    if public_id.startswith(('http://', 'https://')):
+        source = f"{public_id}.{resource.format}" if resource.format else public_id
+
+    urls = {}
+    for name, options in variants.items():
+        transformation = {**options, **DELIVERY}
+        if source:
+            url = _from_url(source, transformation)
+            if url is None:
+                return {}
+        else:
+            url = resource.build_url(**transformation)
+        urls[name] = url
+    return urls
+
+
+def _image(instance, image_field):
+    value = getattr(instance, image_field)
+    # Assigned as a string (stored URL or public id) rather than uploaded in this save
+    if isinstance(value, str):
+        value = instance._meta.get_field(image_field).to_python(value) if value else None
+    return value
+
+
+def sync_variants(instance, image_field, variants_field, variants=PROPERTY_VARIANTS, update_fields=None):
+    """
+    Store the variants of instance.<image_field> in instance.<variants_field>. Meant for save():
+    runs after the upload and writes only when the image actually changed.
+    """
+    if update_fields is not None and image_field not in update_fields:
+        return
+    value = build_variants(_image(instance, image_field), variants)
+    if value != getattr(instance, variants_field):
+        setattr(instance, variants_field, value)
+        type(instance)._default_manager.filter(pk=instance.pk).update(**{variants_field: value})
+
+
+def variants_of(instance, image_field, variants_field, variants=PROPERTY_VARIANTS):
+    """Stored variants, built on the fly for images saved before variants existed."""
+    return getattr(instance, variants_field) or build_variants(_image(instance, image_field), variants)
@@ -0,0 +1,37 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from booking.service.conditional import touch
+from .models import Amenities, AreaImages, Areas, RoomImages, Rooms
+
+@receiver([post_save, post_delete], sender=Rooms)
+def touch_room(sender, instance, **kwargs):
+    """Refresh the ETags of room lists and of this room's detail"""
+    touch('rooms', f"room:{instance.pk}")
+
+@receiver([post_save, post_delete], sender=Areas)
+def touch_area(sender, instance, **kwargs):
+    touch('areas', f"area:{instance.pk}")
+
+@receiver([post_save, post_delete], sender=RoomImages)
+def touch_room_image(sender, instance, **kwargs):
+    touch('rooms', f"room:{instance.room_id}")
+
+@receiver([post_save, post_delete], sender=AreaImages)
+def touch_area_image(sender, instance, **kwargs):
+    touch('areas', f"area:{instance.area_id}")
+
+@receiver([post_save, post_delete], sender=Amenities)
+def touch_amenity(sender, instance, **kwargs):
+    touch('amenities')
+
+@receiver(m2m_changed, sender=Rooms.amenities.through)
+def touch_room_amenities(sender, instance, action, reverse, pk_set, **kwargs):
+    """Amenities added to/removed from rooms, from either side of the relation"""
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        touch(f"room:{instance.pk}")
+    elif pk_set:
+        touch(*(f"room:{pk}" for pk in pk_set))
+    else:
+        touch('amenities')
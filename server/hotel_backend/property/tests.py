@@ -1,3 +1,124 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from hotel_backend.testing import EndpointBudgetMixin
+from user_roles.models import CustomUsers
+from .models import Amenities, AreaImages, Areas, RoomImages, Rooms
+from .serializers import AreaCardSerializer, RoomCardSerializer, RoomSerializer
+
+
+class PropertyEndpointBudgetTests(EndpointBudgetMixin, TestCase):
+    """Query/latency budgets for /property/** routes."""
+
+    def test_rooms(self):
+        self.assertWithinBudget('/property/rooms', 3)
+
+    def test_rooms_sparse(self):
+        response = self.assertWithinBudget('/property/rooms?fields=id,room_name,image', 3)
+        self.assertEqual(set(response.json()['data'][0]), {'id', 'room_name', 'image'})
+
+    def test_cards_annotate_only_what_they_render(self):
+        rooms = RoomCardSerializer.setup_eager_loading(Rooms.objects.all())
+        areas = AreaCardSerializer.setup_eager_loading(Areas.objects.all())
+        self.assertEqual(set(rooms.query.annotations), {'_average_rating', '_review_count'})
+        self.assertEqual(set(areas.query.annotations), {'_average_rating', '_review_count'})
+        self.assertIn('_has_active_bookings', RoomSerializer.setup_eager_loading(Rooms.objects.all()).query.annotations)
+
+    def test_cards_load_only_the_first_image(self):
+        for serializer, model, image_model, relation in (
+            (RoomCardSerializer, Rooms, RoomImages, 'room'),
+            (AreaCardSerializer, Areas, AreaImages, 'area'),
+        ):
+            with CaptureQueriesContext(connection) as queries:
+                items = list(serializer.setup_eager_loading(model.objects.all()))
+            self.assertIn('ROW_NUMBER', queries[-1]['sql'].upper())
+            for item in items:
+                first = image_model.objects.filter(**{relation: item}).order_by('id').first()
+                self.assertEqual(item.first_images, [first])
+                self.assertEqual(serializer(item).data['images'][0]['id'], first.id)
+
+    def test_room_detail(self):
+        self.assertWithinBudget(f"/property/rooms/{self.room.id}", 4)
+
+    def test_areas(self):
+        self.assertWithinBudget('/property/areas', 3)
+
+    def test_area_detail(self):
+        self.assertWithinBudget(f"/property/areas/{self.area.id}", 3)
+
+    def test_amenities(self):
+        self.assertWithinBudget('/property/amenities', 1)
+
+
+class ConditionalGetTests(EndpointBudgetMixin, TestCase):
+    """Catalog endpoints answer revalidations with 304 until a write touches what they render."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.guest)
+
+    def _revalidate(self, url, etag):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_rooms_are_not_reserialized(self):
+        first = self.client.get('/property/rooms')
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.has_header('Last-Modified'))
+
+        with self.assertNumQueries(0):
+            response = self._revalidate('/property/rooms', first['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_writes_refresh_the_etag(self):
+        url = f"/property/rooms/{self.room.id}"
+        etag = self.client.get(url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            RoomImages.objects.create(room=self.room, room_image='rooms/new')
+        self.assertEqual(self._revalidate(url, etag).status_code, 200)
+
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.room.amenities.add(Amenities.objects.create(description='Sauna'))
+        self.assertEqual(self._revalidate(url, etag).status_code, 200)
+
+        # Another room's write leaves this one cached
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rooms[1].save()
+        self.assertEqual(self._revalidate(url, etag).status_code, 304)
+
+    def test_etag_varies_by_query_string(self):
+        etag = self.client.get('/property/areas?page=1')['ETag']
+        self.assertEqual(self._revalidate('/property/areas?page=2', etag).status_code, 200)
+
+
+
+class ImageVariantsTests(EndpointBudgetMixin, TestCase):
+    def test_variants_are_stored_on_save(self):
+        image = RoomImages.objects.create(room=self.room, room_image='image/upload/v1/rooms/suite.jpg')
+        image.refresh_from_db()
+        self.assertEqual(set(image.variants), {'thumb', 'card', 'full'})
+        self.assertIn('/upload/c_fill,f_auto,h_200,q_auto,w_200/v1/rooms/suite.jpg', image.variants['thumb'])
+
+    def test_room_images_expose_variants(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        images = client.get(f"/property/rooms/{self.room.id}").json()['data']['images']
+        self.assertTrue(images)
+        for image in images:
+            self.assertEqual(set(image['variants']), {'thumb', 'card', 'full'})
+            self.assertIn('w_600', image['variants']['card'])
+
+    def test_profile_picture_from_delivery_url(self):
+        user = CustomUsers.objects.create(
+            username='variants', email='variants@example.com',
+            profile_image='https://res.cloudinary.com/demo/image/upload/v17/profile_images/me.jpg',
+        )
+        user.refresh_from_db()
+        self.assertEqual(
+            user.profile_image_variants['thumb'],
+            'https://res.cloudinary.com/demo/image/upload/c_fill,f_auto,g_face,h_96,q_auto,w_96/v17/profile_images/me.jpg',
+        )
@@ -3,13 +3,16 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from .models import Rooms, Areas, Amenities
-from .serializers import RoomSerializer, AreaSerializer, AmenitySerializer
+from .serializers import RoomSerializer, AreaSerializer, AmenitySerializer, RoomCardSerializer, AreaCardSerializer
+from booking.service.conditional import conditional
 
 # Create your views here.
 @api_view(['GET'])
+@conditional(lambda request: ['rooms'])
 def fetch_rooms(request):
     try:
-        rooms = Rooms.objects.filter(status='available').order_by('id')
+        fields = RoomCardSerializer.select_fields(request.query_params)
+        rooms = RoomCardSerializer.setup_eager_loading(Rooms.objects.filter(status='available').order_by('id'), fields=fields)
 
         page = request.query_params.get('page', 1)
         page_size = request.query_params.get('page_size', 6)
@@ -22,7 +25,7 @@ def fetch_rooms(request):
         except EmptyPage:
             paginated_rooms = paginator.page(paginator.num_pages)
 
-        serializer = RoomSerializer(paginated_rooms, many=True)
+        serializer = RoomCardSerializer(paginated_rooms, many=True, fields=fields)
         return Response({
             "data": serializer.data,
             "pagination": {
@@ -36,9 +39,10 @@ def fetch_rooms(request):
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['GET'])
+@conditional(lambda request, id: [f"room:{id}", 'amenities'])
 def fetch_room_detail(request, id):
     try:
-        room = Rooms.objects.get(id=id)
+        room = RoomSerializer.setup_eager_loading(Rooms.objects.all()).get(id=id)
         serializer = RoomSerializer(room, context={'request': request})
         return Response({
             "data": serializer.data
@@ -47,6 +51,7 @@ def fetch_room_detail(request, id):
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['GET'])
+@conditional(lambda request: ['amenities'])
 def fetch_amenities(request):
     try:
         amenities = Amenities.objects.all()
@@ -58,9 +63,11 @@ def fetch_amenities(request):
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['GET'])
+@conditional(lambda request: ['areas'])
 def fetch_areas(request):
     try:
-        areas = Areas.objects.filter(status='available').order_by('id')
+        fields = AreaCardSerializer.select_fields(request.query_params)
+        areas = AreaCardSerializer.setup_eager_loading(Areas.objects.filter(status='available').order_by('id'), fields=fields)
 
         page = request.query_params.get('page', 1)
         page_size = request.query_params.get('page_size', 6)
@@ -73,7 +80,7 @@ def fetch_areas(request):
         except EmptyPage:
             paginated_areas = paginator.page(paginator.num_pages)
 
-        serializer = AreaSerializer(paginated_areas, many=True)
+        serializer = AreaCardSerializer(paginated_areas, many=True, fields=fields)
         return Response({
             "data": serializer.data,
             "pagination": {
@@ -87,9 +94,10 @@ def fetch_areas(request):
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['GET'])
+@conditional(lambda request, id: [f"area:{id}"])
 def fetch_area_detail(request, id):
     try:
-        area = Areas.objects.get(id=id)
+        area = AreaSerializer.setup_eager_loading(Areas.objects.all()).get(id=id)
         serializer = AreaSerializer(area, context={'request': request})
         return Response({
             "data": serializer.data
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.2 on 2026-10-16 23:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('booking', '0005_keyset_indexes'),
+        ('user_roles', '0003_customusers_name_last_updated'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customusers',
+            index=models.Index(fields=['role', 'is_archived', 'date_joined', 'id'], name='users_role_joined_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='notifications_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'is_read'], name='notifications_user_read_idx'),
+        ),
+    ]
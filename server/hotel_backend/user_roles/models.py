@@ -37,6 +37,7 @@ class CustomUsers(AbstractUser):
     )
     is_archived = models.BooleanField(default=False)
     profile_image = CloudinaryField('profile_image', null=True, blank=True)
+    profile_image_variants = models.JSONField(default=dict, blank=True)
     last_booking_date = models.DateField(null=True, blank=True)
     name_last_updated = models.DateField(null=True, blank=True)
     valid_id_type = models.CharField(max_length=60, null=True, blank=True, choices=VALID_ID_CHOICES)
@@ -48,6 +49,30 @@ class CustomUsers(AbstractUser):
 
     class Meta: 
         db_table = 'users'
+        indexes = [
+            models.Index(fields=['role', 'is_archived', 'date_joined', 'id'], name='users_role_joined_idx'),
+        ]
+
+    # Fields that reviews render next to a rating (signals.touch_user refreshes those rooms/areas)
+    REVIEW_FIELDS = ('first_name', 'last_name', 'profile_image')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._review_state = instance._get_review_state()
+        return instance
+
+    def _get_review_state(self):
+        return tuple(str(getattr(self, name, None) or '') for name in self.REVIEW_FIELDS)
+
+    def save(self, *args, **kwargs):
+        from property.service.image_variants import PROFILE_VARIANTS, sync_variants
+
+        super().save(*args, **kwargs)
+        sync_variants(
+            self, 'profile_image', 'profile_image_variants', PROFILE_VARIANTS,
+            update_fields=kwargs.get('update_fields'),
+        )
 
 class Notification(models.Model):
     TYPE_CHOICES = [
@@ -69,6 +94,10 @@ class Notification(models.Model):
     
     class Meta:
         db_table = 'notifications'
+        indexes = [
+            models.Index(fields=['user', 'created_at', 'id'], name='notifications_user_created_idx'),
+            models.Index(fields=['user', 'is_read'], name='notifications_user_read_idx'),
+        ]
 
 class DeviceToken(models.Model):
     """Stores device FCM tokens optionally linked to a user. Useful for sending pushes to guests/devices."""
@@ -1,8 +1,10 @@
 from .models import CustomUsers, Notification
 from rest_framework import serializers
+from property.service.image_variants import PROFILE_VARIANTS, variants_of
 
 class CustomUserSerializer(serializers.ModelSerializer):
     profile_image = serializers.SerializerMethodField()
+    profile_image_variants = serializers.SerializerMethodField()
     valid_id_type_display = serializers.SerializerMethodField()
     valid_id_front = serializers.SerializerMethodField()
     valid_id_back = serializers.SerializerMethodField()
@@ -16,6 +18,7 @@ class CustomUserSerializer(serializers.ModelSerializer):
             'first_name',
             'last_name',
             'profile_image',
+            'profile_image_variants',
             'valid_id_type',
             'valid_id_type_display',
             'valid_id_front',
@@ -33,6 +36,9 @@ class CustomUserSerializer(serializers.ModelSerializer):
             return obj.profile_image.url
         return None
     
+    def get_profile_image_variants(self, obj):
+        return variants_of(obj, 'profile_image', 'profile_image_variants', PROFILE_VARIANTS)
+    
     def get_valid_id_front(self, obj):
         if obj.valid_id_front and hasattr(obj.valid_id_front, 'url'):
             return obj.valid_id_front.url
@@ -60,7 +66,7 @@ class NotificationSerializer(serializers.ModelSerializer):
     booking_id = serializers.SerializerMethodField()
     
     def get_booking_id(self, obj):
-        return str(obj.booking.id) if obj.booking else None
+        return str(obj.booking_id) if obj.booking_id else None
     
     class Meta:
         model = Notification
@@ -1,33 +1,29 @@
 from firebase_admin import credentials, auth, db, messaging, get_app, initialize_app
 import logging
-from datetime import datetime, date
+from datetime import datetime
 from pathlib import Path
 from ..models import DeviceToken
 from typing import List, Any
-from decimal import Decimal
+import ujson
+from hotel_backend.renderers import dumps, encode_default
 
 logger = logging.getLogger(__name__)
 
 
+def _sanitize_default(obj: Any) -> Any:
+    try:
+        return encode_default(obj)
+    except (TypeError, ValueError):
+        # For other types, convert to string
+        return str(obj)
+
+
 def sanitize_for_json(data: Any) -> Any:
     """Convert non-JSON-serializable types (Decimal, datetime, date, etc.) to JSON-compatible formats"""
     if data is None:
         return None
-    elif isinstance(data, Decimal):
-        return float(data)
-    elif isinstance(data, datetime):
-        return data.isoformat()
-    elif isinstance(data, date):
-        return data.isoformat()
-    elif isinstance(data, dict):
-        return {k: sanitize_for_json(v) for k, v in data.items()}
-    elif isinstance(data, (list, tuple)):
-        return [sanitize_for_json(item) for item in data]
-    elif isinstance(data, (int, float, str, bool)):
-        return data
-    else:
-        # For other types, convert to string
-        return str(data)
+    # Same encoder as the API renderer, so Firebase and the email tasks see what the app sees
+    return ujson.loads(dumps(data, default=_sanitize_default))
 
 class FirebaseService:
     _instance = None
@@ -2,7 +2,8 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
-from .models import Notification
+from booking.service.conditional import touch
+from .models import CustomUsers, Notification
 from .serializers import NotificationSerializer
 
 @receiver(post_save, sender=Notification)
@@ -20,4 +21,22 @@ def send_notification(sender, instance, created, **args):
                 "notification": notification_data,
                 "unread_count": unread_count,
             }
-        )
\ No newline at end of file
+        )
+
+@receiver(post_save, sender=CustomUsers)
+def touch_user(sender, instance, created, update_fields=None, **kwargs):
+    """Refresh ETags of the bookings and reviewed rooms/areas that show this guest's name and photo"""
+    state = instance._get_review_state()
+    if created or (update_fields and set(update_fields) <= {'last_login'}):
+        instance._review_state = state
+        return
+    touch(f"user:{instance.pk}")
+    if update_fields and not set(update_fields) & set(CustomUsers.REVIEW_FIELDS):
+        return
+    if state == getattr(instance, '_review_state', None):
+        return
+    instance._review_state = state
+    from booking.models import Reviews
+
+    reviewed = Reviews.objects.filter(user_id=instance.pk).values_list('room_id', 'area_id').distinct()
+    touch(*(f"room:{room_id}" if room_id else f"area:{area_id}" for room_id, area_id in reviewed))
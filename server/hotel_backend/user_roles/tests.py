@@ -1,3 +1,83 @@
-from django.test import TestCase
+from datetime import date, datetime, time, timezone as dt_timezone
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import SimpleTestCase, TestCase
+
+from booking.models import Reviews
+from booking.service.conditional import stamps
+from hotel_backend.testing import EndpointBudgetMixin
+from user_roles.models import CustomUsers
+from user_roles.service.firebase import sanitize_for_json
+
+
+class UserEndpointBudgetTests(EndpointBudgetMixin, TestCase):
+    """Query/latency budgets for the guest-facing /api/** GET routes."""
+
+    def test_user_auth(self):
+        self.assertWithinBudget('/api/auth/user', 0, user=self.guest)
+
+    def test_user_details(self):
+        self.assertWithinBudget(f"/api/guest/{self.guest.id}", 1, user=self.guest)
+
+    def test_guest_bookings(self):
+        self.assertWithinBudget('/api/guest/bookings?page_size=20', 9, user=self.guest)
+
+    def test_notifications(self):
+        self.assertWithinBudget('/api/guest/notifications?limit=20', 3, user=self.guest)
+
+
+class UserScopeTests(EndpointBudgetMixin, TestCase):
+    """Saving a guest refreshes the rooms/areas they reviewed only when their name or photo changed."""
+
+    def setUp(self):
+        review = Reviews.objects.filter(user=self.guest).first()
+        self.scopes = [f"user:{self.guest.pk}", f"room:{review.room_id}" if review.room_id else f"area:{review.area_id}"]
+
+    def _save(self, user, **kwargs):
+        """Save `user` and report which of its [user, reviewed property] stamps moved."""
+        before = stamps(self.scopes)
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save(**kwargs)
+        return [old != new for old, new in zip(before, stamps(self.scopes))]
+
+    def test_only_displayed_fields_refresh_reviews(self):
+        guest = CustomUsers.objects.get(pk=self.guest.pk)
+        guest.is_senior_or_pwd = not guest.is_senior_or_pwd
+        # Just the UPDATE: no reviews lookup
+        with self.assertNumQueries(1):
+            self.assertEqual(self._save(guest), [True, False])
+
+        guest.first_name = 'Renamed'
+        self.assertEqual(self._save(guest), [True, True])
+        # Already announced: saving the same name again leaves the reviews alone
+        self.assertEqual(self._save(guest), [True, False])
+
+        guest.last_name = 'Changed'
+        self.assertEqual(self._save(guest, update_fields=['is_verified']), [True, False])
+        self.assertEqual(self._save(guest, update_fields=['last_name']), [True, True])
+
+
+class SanitizeForJsonTests(SimpleTestCase):
+    def test_sanitize_for_json(self):
+        payload = {
+            "total": Decimal("3500.50"),
+            "day": date(2025, 3, 1),
+            "at": datetime(2025, 3, 1, 6, 30, tzinfo=dt_timezone.utc),
+            "check_in": time(14, 0),
+            "note": "Room 2/B \u2028 ₱",
+            "ids": (1, 2),
+            "other": Decimal,
+        }
+        self.assertEqual(
+            sanitize_for_json(payload),
+            {
+                "total": 3500.5,
+                "day": "2025-03-01",
+                "at": "2025-03-01T06:30:00Z",
+                "check_in": "14:00:00",
+                "note": payload["note"],
+                "ids": [1, 2],
+                "other": "<class 'decimal.Decimal'>",
+            },
+        )
+        self.assertIsNone(sanitize_for_json(None))
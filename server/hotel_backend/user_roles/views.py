@@ -13,6 +13,7 @@ from .validation.validation import RegistrationForm
 from datetime import timedelta
 from booking.models import Bookings
 from booking.serializers import BookingSerializer
+from booking.service import pagination as pagination_service
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
 from property.serializers import AreaSerializer
 from .google.oauth import google_auth as google_oauth_util
@@ -1152,7 +1153,8 @@ def change_profile_picture(request):
         
         return Response({
             'message': 'Profile picture updated successfully',
-            'profile_image': user.profile_image.url
+            'profile_image': user.profile_image.url,
+            'profile_image_variants': user.profile_image_variants,
         }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1204,7 +1206,9 @@ def update_user_details(request, id):
 def get_guest_bookings(request):
     try:
         user = request.user
-        bookings = Bookings.objects.filter(user=user).order_by('-created_at')
+        bookings = BookingSerializer.setup_eager_loading(
+            Bookings.objects.filter(user=user), full_property=True
+        ).order_by('-created_at')
 
         status_filter = request.query_params.get('status', '')
         
@@ -1214,14 +1218,24 @@ def get_guest_bookings(request):
         page = request.query_params.get('page', 1)
         page_size = request.query_params.get('page_size', 5)
         
-        paginator = Paginator(bookings, page_size)
-        
-        try:
-            paginated_bookings = paginator.page(page)
-        except PageNotAnInteger:
-            paginated_bookings = paginator.page(1)
-        except EmptyPage:
-            paginated_bookings = paginator.page(paginator.num_pages)
+        if pagination_service.is_cursor_request(request.query_params):
+            paginated_bookings, pagination = pagination_service.cursor_page(bookings, request.query_params, page_size)
+        else:
+            paginator = Paginator(bookings, page_size)
+            
+            try:
+                paginated_bookings = paginator.page(page)
+            except PageNotAnInteger:
+                paginated_bookings = paginator.page(1)
+            except EmptyPage:
+                paginated_bookings = paginator.page(paginator.num_pages)
+            
+            pagination = {
+                "total_pages": paginator.num_pages,
+                "current_page": int(page),
+                "total_items": paginator.count,
+                "page_size": int(page_size)
+            }
             
         booking_data = []
         for booking in paginated_bookings:
@@ -1240,12 +1254,7 @@ def get_guest_bookings(request):
         
         return Response({
             "data": booking_data,
-            "pagination": {
-                "total_pages": paginator.num_pages,
-                "current_page": int(page),
-                "total_items": paginator.count,
-                "page_size": int(page_size)
-            }
+            "pagination": pagination
         }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1298,13 +1307,26 @@ def get_notifications(request):
         offset = int(request.query_params.get('offset', 0))
         
         all_notifications = Notification.objects.filter(user=request.user).order_by('-created_at')
-        notifications = all_notifications[offset:offset + limit]
+        unread_count = all_notifications.filter(is_read=False).count()
+        
+        if pagination_service.is_cursor_request(request.query_params):
+            notifications, pagination = pagination_service.cursor_page(all_notifications, request.query_params, limit)
+            serializer = NotificationSerializer(notifications, many=True)
+            return Response({
+                'notifications': serializer.data,
+                'unread_count': unread_count,
+                'has_more': pagination['has_more'],
+                'next_cursor': pagination['next_cursor']
+            }, status=status.HTTP_200_OK)
+        
+        # One extra row tells whether there is another page without counting them all
+        notifications = list(all_notifications[offset:offset + limit + 1])
         
-        serializer = NotificationSerializer(notifications, many=True)
+        serializer = NotificationSerializer(notifications[:limit], many=True)
         return Response({
             'notifications': serializer.data,
-            'unread_count': all_notifications.filter(is_read=False).count(),
-            'has_more': all_notifications.count() > (offset + limit)
+            'unread_count': unread_count,
+            'has_more': len(notifications) > limit
         }, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({